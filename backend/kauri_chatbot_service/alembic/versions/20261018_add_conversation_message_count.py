@@ -0,0 +1,39 @@
+"""add message_count to conversations
+
+Revision ID: 20261018_002
+Revises: 20261018_001
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261018_002'
+down_revision = '20261018_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add the maintained message counter and backfill it"""
+    op.add_column(
+        'conversations',
+        sa.Column('message_count', sa.Integer(), nullable=False, server_default='0')
+    )
+
+    op.execute("""
+        UPDATE conversations SET message_count = counts.messages
+        FROM (
+            SELECT conversation_id, COUNT(*) AS messages
+            FROM messages
+            WHERE deleted_at IS NULL
+            GROUP BY conversation_id
+        ) AS counts
+        WHERE conversations.id = counts.conversation_id
+    """)
+
+
+def downgrade():
+    """Remove the message counter"""
+    op.drop_column('conversations', 'message_count')
@@ -0,0 +1,57 @@
+"""add token_count to messages and total_tokens to conversations
+
+Revision ID: 20261018_001
+Revises: 20250106_001
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261018_001'
+down_revision = '20250106_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add stored token counts and backfill them with the character estimate"""
+    op.add_column('messages', sa.Column('token_count', sa.Integer(), nullable=True))
+    op.add_column(
+        'conversations',
+        sa.Column('total_tokens', sa.Integer(), nullable=False, server_default='0')
+    )
+
+    # Same estimate as TokenCounter (3 characters per token, whitespace
+    # collapsed): role + content + source titles + 10 tokens of overhead
+    op.execute("""
+        UPDATE messages SET token_count =
+            GREATEST(1, length(role) / 3)
+            + GREATEST(1, length(regexp_replace(btrim(content), '\\s+', ' ', 'g')) / 3)
+            + COALESCE((
+                SELECT SUM(GREATEST(1, length(regexp_replace(btrim(source->>'title'), '\\s+', ' ', 'g')) / 3))
+                FROM jsonb_array_elements(
+                    CASE WHEN jsonb_typeof(sources) = 'array' THEN sources ELSE '[]'::jsonb END
+                ) AS source
+                WHERE COALESCE(source->>'title', '') <> ''
+            ), 0)
+            + 10
+    """)
+
+    op.execute("""
+        UPDATE conversations SET total_tokens = totals.tokens
+        FROM (
+            SELECT conversation_id, SUM(token_count) AS tokens
+            FROM messages
+            WHERE deleted_at IS NULL
+            GROUP BY conversation_id
+        ) AS totals
+        WHERE conversations.id = totals.conversation_id
+    """)
+
+
+def downgrade():
+    """Remove stored token counts"""
+    op.drop_column('conversations', 'total_tokens')
+    op.drop_column('messages', 'token_count')
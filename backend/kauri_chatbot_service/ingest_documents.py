@@ -19,6 +19,7 @@ from src.ingestion.document_processor import document_processor
 from src.rag.embedder.bge_embedder import get_embedder
 from src.rag.vector_store.chroma_store import get_chroma_store
 from src.rag.retriever.bm25_retriever import get_bm25_retriever
+from src.rag.retriever.bm25_snapshot import snapshot_lock
 
 logger = structlog.get_logger()
 
@@ -67,15 +68,17 @@ async def ingest_file(
     file_path: Path,
     embedder,
     chroma_store,
+    bm25_retriever,
     processed_hashes: set
 ) -> str:
     """
-    Ingest a single file into ChromaDB
+    Ingest a single file into ChromaDB and the BM25 index
 
     Args:
         file_path: Path to document
         embedder: Embedder instance
         chroma_store: ChromaDB store
+        bm25_retriever: BM25 retriever (updated incrementally)
         processed_hashes: Set of already processed content hashes
 
     Returns:
@@ -140,6 +143,12 @@ async def ingest_file(
             metadatas=chunk_metadatas
         )
 
+        # Index the new chunks for lexical search
+        bm25_retriever.add_documents([
+            {"id": chunk_id, "content": chunk, "metadata": metadata}
+            for chunk_id, chunk, metadata in zip(chunk_ids, chunk_documents, chunk_metadatas)
+        ])
+
         # Mark as processed
         processed_hashes.add(result['hash'])
 
@@ -179,23 +188,21 @@ def load_existing_hashes(chroma_store) -> set:
     try:
         logger.info("loading_existing_hashes_from_chromadb")
 
-        # Get all documents with their metadata
-        collection = chroma_store.collection
-        all_data = collection.get()
+        # Page through chunk metadata only (no document text)
+        existing_hashes = set()
+        total_chunks = 0
+        for chunk in chroma_store.iter_documents(include=["metadatas"]):
+            total_chunks += 1
+            if 'content_hash' in chunk['metadata']:
+                existing_hashes.add(chunk['metadata']['content_hash'])
 
-        if not all_data or not all_data['metadatas']:
+        if not total_chunks:
             logger.info("no_existing_documents_in_chromadb")
             return set()
 
-        # Extract content_hash from metadata
-        existing_hashes = set()
-        for metadata in all_data['metadatas']:
-            if metadata and 'content_hash' in metadata:
-                existing_hashes.add(metadata['content_hash'])
-
         logger.info("existing_hashes_loaded",
                    count=len(existing_hashes),
-                   total_chunks=len(all_data['metadatas']))
+                   total_chunks=total_chunks)
 
         return existing_hashes
 
@@ -205,44 +212,32 @@ def load_existing_hashes(chroma_store) -> set:
         return set()
 
 
-def build_bm25_index(chroma_store, bm25_retriever):
+def save_bm25_snapshot(chroma_store, bm25_retriever):
     """
-    Build BM25 index from all documents in ChromaDB
+    Publish the incrementally updated BM25 index for the API workers
+
+    Writes a snapshot stamped with the current collection version (bumped
+    beforehand) so workers load it instead of rebuilding.
 
     Args:
         chroma_store: ChromaDB store instance
         bm25_retriever: BM25 retriever instance
     """
-    logger.info("building_bm25_index")
+    if not settings.bm25_snapshot_enabled:
+        return
 
-    try:
-        # Get all documents from ChromaDB
-        collection = chroma_store.collection
-        all_data = collection.get()
-
-        if not all_data or not all_data['documents']:
-            logger.warning("no_documents_found_for_bm25")
-            return
-
-        # Build documents list for BM25
-        documents = []
-        for doc_id, content, metadata in zip(
-            all_data['ids'],
-            all_data['documents'],
-            all_data['metadatas']
-        ):
-            documents.append({
-                "id": doc_id,
-                "content": content,
-                "metadata": metadata
-            })
+    logger.info("saving_bm25_snapshot")
 
-        # Build index
-        bm25_retriever.build_index(documents)
-        logger.info("bm25_index_built", num_documents=len(documents))
+    try:
+        with snapshot_lock(settings.bm25_snapshot_dir):
+            bm25_retriever.save_snapshot(
+                settings.bm25_snapshot_dir,
+                chroma_store.get_version_stamp()
+            )
+        logger.info("bm25_snapshot_published", num_documents=bm25_retriever.document_count)
 
     except Exception as e:
-        logger.error("bm25_build_failed", error=str(e), exc_info=True)
+        logger.error("bm25_snapshot_save_failed", error=str(e), exc_info=True)
 
 
 async def main_async():
@@ -254,6 +249,9 @@ async def main_async():
     chroma_store = get_chroma_store()
     bm25_retriever = get_bm25_retriever()
 
+    # Start from the current BM25 index (snapshot, or rebuilt if stale)
+    bm25_retriever.load_or_build(chroma_store)
+
     # Find documents
     base_path = Path("/app/base_connaissances")
     if not base_path.exists():
@@ -284,11 +282,14 @@ async def main_async():
     stats = {"created": 0, "skipped": 0, "failed": 0}
 
     for file_path in files:
-        result = await ingest_file(file_path, embedder, chroma_store, processed_hashes)
+        result = await ingest_file(file_path, embedder, chroma_store, bm25_retriever, processed_hashes)
         stats[result] += 1
 
-    # Build BM25 index from all chunks in ChromaDB
-    build_bm25_index(chroma_store, bm25_retriever)
+    # New corpus epoch (invalidates retrieval caches), then publish the BM25
+    # index (both already up to date if nothing was created)
+    if stats['created'] > 0:
+        chroma_store.bump_corpus_version()
+        save_bm25_snapshot(chroma_store, bm25_retriever)
 
     logger.info("ingestion_complete", **stats)
 
@@ -137,7 +137,7 @@ async def detailed_health_check():
     try:
         bm25_retriever = get_bm25_retriever()
 
-        if bm25_retriever.bm25 is None:
+        if not bm25_retriever.is_built:
             health_status["components"]["bm25"] = {
                 "status": "unhealthy",
                 "error": "BM25 index not built"
@@ -148,7 +148,7 @@ async def detailed_health_check():
             test_results = bm25_retriever.search("test", top_k=1)
             health_status["components"]["bm25"] = {
                 "status": "healthy",
-                "document_count": len(bm25_retriever.documents),
+                "document_count": bm25_retriever.document_count,
                 "search_test": "passed" if test_results else "no_results"
             }
     except Exception as e:
@@ -209,7 +209,10 @@ async def detailed_health_check():
             "primary_provider": settings.llm_provider,
             "primary_model": settings.llm_model,
             "fallback_provider": settings.llm_fallback_provider,
-            "fallback_model": settings.llm_fallback_model
+            "fallback_model": settings.llm_fallback_model,
+            "breakers": {
+                name: breaker.state for name, breaker in llm_client.breakers.items()
+            }
         }
     except Exception as e:
         health_status["components"]["llm"] = {
@@ -273,40 +276,43 @@ async def startup_event():
     except Exception as e:
         logger.warning("ml_model_warmup_error", error=str(e))
 
-    # Rebuild BM25 index from ChromaDB at startup
+    # LLM tokenizer for stored message token counts (may download: keep it off the loop)
+    if settings.llm_tokenizer:
+        from ..utils.executors import run_blocking
+        from ..utils.token_counter import TokenCounter
+        await run_blocking(TokenCounter.load_tokenizer)
+
+    # Load BM25 index (memory-mapped snapshot, rebuilt from ChromaDB only if stale)
+    from ..rag.retriever.bm25_retriever import get_bm25_retriever
+    bm25_retriever = get_bm25_retriever()
     try:
-        logger.info("rebuilding_bm25_index_from_chromadb")
         from ..rag.vector_store.chroma_store import get_chroma_store
-        from ..rag.retriever.bm25_retriever import get_bm25_retriever
 
         chroma_store = get_chroma_store()
-        bm25_retriever = get_bm25_retriever()
-
-        # Get all documents from ChromaDB
-        collection = chroma_store.collection
-        all_data = collection.get()
-
-        if all_data and all_data['documents']:
-            # Build documents list for BM25
-            documents = []
-            for doc_id, content, metadata in zip(
-                all_data['ids'],
-                all_data['documents'],
-                all_data['metadatas']
-            ):
-                documents.append({
-                    "id": doc_id,
-                    "content": content,
-                    "metadata": metadata
-                })
-
-            # Build BM25 index
-            bm25_retriever.build_index(documents)
-            logger.info("bm25_index_rebuilt_at_startup", num_documents=len(documents))
+        source = bm25_retriever.load_or_build(chroma_store)
+        if bm25_retriever.is_built:
+            logger.info("bm25_index_ready", source=source, num_documents=bm25_retriever.document_count)
         else:
-            logger.warning("no_documents_in_chromadb_skipping_bm25_build")
+            logger.warning("no_documents_in_chromadb_bm25_empty")
     except Exception as e:
-        logger.error("bm25_index_rebuild_error", error=str(e))
+        logger.error("bm25_index_load_error", error=str(e))
+        # ChromaDB unreachable: serve from the last snapshot if there is one
+        if settings.bm25_snapshot_enabled:
+            bm25_retriever.load_snapshot(settings.bm25_snapshot_dir)
+
+    # Pre-fill the intent classification cache with the most frequent queries
+    if settings.intent_cache_enabled and settings.intent_cache_warm_file:
+        from ..rag.agents.intent_classifier import get_intent_classifier
+        asyncio.create_task(get_intent_classifier().warm_cache(settings.intent_cache_warm_file))
+
+    # Shared pooled clients for inter-service calls
+    from ..utils.http_clients import open_http_clients
+    open_http_clients()
+
+    # Sync the JWT revocation list in the background (local token validation)
+    if settings.jwt_local_validation:
+        from ..auth.revocation_list import get_revocation_list
+        get_revocation_list().start()
 
     # Trigger async warm-up query to keep retrieval stack hot
     if settings.warmup_enabled:
@@ -326,6 +332,20 @@ async def shutdown_event():
         service=settings.service_name,
     )
 
+    from ..rag.embedder.bge_embedder import get_embedder
+    from ..rag.reranker.cross_encoder_reranker import get_reranker
+    from ..utils.executors import shutdown_executors
+    from ..models.database import close_async_db
+    from ..auth.revocation_list import get_revocation_list
+    from ..utils.http_clients import close_http_clients
+
+    await get_embedder().scheduler.close()
+    await get_reranker().scheduler.close()
+    shutdown_executors()
+    await close_async_db()
+    await get_revocation_list().stop()
+    await close_http_clients()
+
 
 # ====================
 # Exception Handlers
@@ -360,57 +380,57 @@ async def _run_warmup_sequence():
 
     await asyncio.sleep(max(settings.warmup_delay_seconds, 0))
 
-    login_url = f"{settings.user_service_url.rstrip('/')}/api/v1/auth/login"
-    user_health_url = f"{settings.user_service_url.rstrip('/')}/api/v1/health"
-    chatbot_health_url = f"http://127.0.0.1:{settings.service_port}/api/v1/health"
-    chat_query_url = f"http://127.0.0.1:{settings.service_port}/api/v1/chat/query"
+    from ..utils.http_clients import get_http_client
+
+    user_service = get_http_client("user_service")
+    chatbot = get_http_client("chatbot")
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            await _wait_for_endpoint(client, user_health_url)
-            await _wait_for_endpoint(client, chatbot_health_url)
-
-            login_resp = await client.post(
-                login_url,
-                json={
-                    "email": settings.warmup_email,
-                    "password": settings.warmup_password
-                },
-            )
-            login_resp.raise_for_status()
-            token = login_resp.json().get("access_token")
-            if not token:
-                raise RuntimeError("warmup login succeeded but no access token returned")
-
-            headers = {
-                "Authorization": f"Bearer {token}"
-            }
-            chat_resp = await client.post(
-                chat_query_url,
-                json={"query": settings.warmup_query},
-                headers=headers,
-                timeout=120.0
-            )
-            chat_resp.raise_for_status()
-            logger.info(
-                "warmup_chat_query_completed",
-                status_code=chat_resp.status_code
-            )
+        await _wait_for_endpoint(user_service, "/api/v1/health")
+        await _wait_for_endpoint(chatbot, "/api/v1/health")
+
+        login_resp = await user_service.post(
+            "/api/v1/auth/login",
+            json={
+                "email": settings.warmup_email,
+                "password": settings.warmup_password
+            },
+            timeout=30.0
+        )
+        login_resp.raise_for_status()
+        token = login_resp.json().get("access_token")
+        if not token:
+            raise RuntimeError("warmup login succeeded but no access token returned")
+
+        headers = {
+            "Authorization": f"Bearer {token}"
+        }
+        chat_resp = await chatbot.post(
+            "/api/v1/chat/query",
+            json={"query": settings.warmup_query},
+            headers=headers,
+            timeout=120.0
+        )
+        chat_resp.raise_for_status()
+        logger.info(
+            "warmup_chat_query_completed",
+            status_code=chat_resp.status_code
+        )
     except Exception as exc:
         logger.warning("warmup_chat_query_failed", error=str(exc))
 
 
-async def _wait_for_endpoint(client: httpx.AsyncClient, url: str, retries: int = 20, delay: float = 2.0):
+async def _wait_for_endpoint(client: httpx.AsyncClient, path: str, retries: int = 20, delay: float = 2.0):
     """Poll an HTTP endpoint until it responds successfully or timeout."""
     for attempt in range(retries):
         try:
-            resp = await client.get(url)
+            resp = await client.get(path, timeout=30.0)
             if resp.status_code < 500:
                 return
         except Exception:
             pass
         await asyncio.sleep(delay)
-    raise RuntimeError(f"warmup endpoint not reachable: {url}")
+    raise RuntimeError(f"warmup endpoint not reachable: {client.base_url}{path}")
 
 
 if __name__ == "__main__":
@@ -189,3 +189,65 @@ async def get_database_stats(
         )
     finally:
         db.close()
+
+
+@router.get("/stats/performance")
+async def get_performance_stats(
+    current_user: Dict = Depends(verify_admin_user)
+):
+    """
+    Get in-process performance metrics of this worker
+
+    Requires admin authentication.
+
+    Returns:
+        Inference batching metrics (queue depth, batch size, wait time),
+        speculative retrieval waste, intent fast-path hit/agreement rates
+        cache hit rates, SSE streaming (events/sec, bytes/event) and LLM
+        provider circuit breakers / hedging, context packing savings, async
+        database pool usage (connections in use, checkout hold times), local
+        JWT validation (principal cache, revocation list sync), inter-service
+        HTTP clients (requests, latency, pooled connections)
+    """
+    from src.rag.embedder.bge_embedder import get_embedder
+    from src.rag.reranker.cross_encoder_reranker import get_reranker
+    from src.rag.retriever.result_cache import get_result_cache
+    from src.rag.pipeline.semantic_cache import get_semantic_cache
+    from src.rag.agents.speculative_retrieval import get_speculation_stats
+    from src.rag.agents.intent_classifier import get_intent_classifier
+    from src.utils.sse import get_sse_stats
+    from src.llm.llm_client import get_llm_client
+    from src.rag.pipeline.context_packer import get_context_packer
+    from src.services.conversation_cache import get_conversation_cache
+    from src.models.database import pool_stats
+    from src.auth.jwt_validator import jwt_validator
+    from src.utils.http_clients import get_http_client_stats
+
+    embedder = get_embedder()
+    result_cache = get_result_cache()
+    semantic_cache = get_semantic_cache()
+    intent_classifier = get_intent_classifier()
+    fast_classifier = intent_classifier.fast_classifier
+    conversation_cache = get_conversation_cache()
+
+    return {
+        "inference_batching": {
+            "embedder": embedder.scheduler.get_stats(),
+            "reranker": get_reranker().scheduler.get_stats()
+        },
+        "speculative_retrieval": get_speculation_stats().get_stats(),
+        "intent_fast_path": fast_classifier.get_stats() if fast_classifier else None,
+        "sse": get_sse_stats().get_stats(),
+        "llm": get_llm_client().get_stats(),
+        "context_packing": get_context_packer().get_stats(),
+        "database_pool": pool_stats.get_stats(),
+        "auth": jwt_validator.get_stats(),
+        "http_clients": get_http_client_stats(),
+        "caches": {
+            "query_embeddings": embedder.cache.get_stats() if embedder.cache else None,
+            "retrieval_results": result_cache.get_stats() if result_cache else None,
+            "semantic_answers": semantic_cache.get_stats() if semantic_cache else None,
+            "intent_classifications": intent_classifier.cache.get_stats() if intent_classifier.cache else None,
+            "conversation_windows": conversation_cache.get_stats() if conversation_cache else None
+        }
+    }
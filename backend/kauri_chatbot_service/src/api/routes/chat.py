@@ -5,14 +5,16 @@ from typing import Dict, Any
 import uuid
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
 import json
 
 from src.schemas.chat import ChatRequest, ChatResponse, StreamChunk
 from src.auth.jwt_validator import get_current_user
-from src.models.database import get_db
+from src.models.database import get_async_db, AsyncSessionLocal
 from src.rag.pipeline.conversation_aware_rag import get_conversation_aware_rag
+from src.utils.sse import SSEStreamMetrics, coalesce_tokens
+from src.config import settings
 
 logger = structlog.get_logger()
 
@@ -22,7 +24,7 @@ router = APIRouter(prefix="/api/v1/chat", tags=["chat"])
 @router.post("/query", response_model=ChatResponse)
 async def chat_query(
     request: ChatRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
@@ -92,7 +94,6 @@ async def chat_query(
 @router.post("/stream")
 async def chat_stream(
     request: ChatRequest,
-    db: Session = Depends(get_db),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
@@ -101,9 +102,11 @@ async def chat_stream(
     Protected with JWT authentication from User Service
     Saves user query and assistant response to database
 
+    The database session is opened by the event generator itself, so it
+    lives exactly as long as the stream.
+
     Args:
         request: Chat request with query and options
-        db: Database session
         current_user: Authenticated user from JWT token
 
     Returns:
@@ -111,7 +114,7 @@ async def chat_stream(
 
     Event types:
         - sources: Retrieved documents sent first
-        - token: Each generated token
+        - token: Generated text (tokens coalesced per SSE_COALESCE_WINDOW_MS)
         - done: Completion metadata
         - error: Error information
     """
@@ -126,6 +129,8 @@ async def chat_stream(
 
     async def event_generator():
         """Generator for SSE events"""
+        metrics = SSEStreamMetrics()
+        db = AsyncSessionLocal()
         try:
             # Get Conversation-Aware RAG pipeline
             conv_rag = get_conversation_aware_rag()
@@ -139,14 +144,19 @@ async def chat_stream(
                     logger.warning("invalid_conversation_id", conversation_id=request.conversation_id)
 
             # Stream results with persistence
-            async for chunk in conv_rag.query_stream(
+            chunks = conv_rag.query_stream(
                 db=db,
                 user_id=user_id,
                 query=request.query,
                 conversation_id=conv_id,
                 use_reranking=True,
                 use_fallback=False
-            ):
+            )
+            if settings.sse_coalescing_enabled:
+                # One SSE event per time window instead of one per token
+                chunks = coalesce_tokens(chunks, metrics=metrics)
+
+            async for chunk in chunks:
                 # Convert chunk to StreamChunk schema
                 if chunk["type"] == "sources":
                     stream_chunk = StreamChunk(
@@ -194,7 +204,7 @@ async def chat_stream(
 
                 # Send SSE event
                 # Format: data: {json}\n\n
-                yield f"data: {stream_chunk.model_dump_json()}\n\n"
+                yield metrics.frame(f"data: {stream_chunk.model_dump_json()}\n\n")
 
         except Exception as e:
             logger.error("chat_stream_error",
@@ -207,7 +217,11 @@ async def chat_stream(
                 type="error",
                 content=f"Erreur lors du traitement: {str(e)}"
             )
-            yield f"data: {error_chunk.model_dump_json()}\n\n"
+            yield metrics.frame(f"data: {error_chunk.model_dump_json()}\n\n")
+
+        finally:
+            await db.close()
+            metrics.finish(user_id=str(user_id))
 
     return StreamingResponse(
         event_generator(),
@@ -2,11 +2,11 @@
 API Routes for Conversation Management
 """
 import uuid
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models.database import get_db
+from src.models.database import get_async_db
 from src.services.conversation_service import ConversationService
 from src.services.context_manager import context_manager
 from src.schemas.conversation import (
@@ -31,7 +31,7 @@ router = APIRouter(prefix="/api/v1/conversations", tags=["Conversations"])
 @router.post("", response_model=ConversationResponse, status_code=status.HTTP_201_CREATED)
 async def create_conversation(
     data: ConversationCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -47,7 +47,7 @@ async def create_conversation(
     """
     user_id = uuid.UUID(current_user["user_id"])
 
-    conversation = ConversationService.create_conversation(
+    conversation = await ConversationService.create_conversation(
         db=db,
         user_id=user_id,
         title=data.title,
@@ -71,7 +71,8 @@ async def list_conversations(
     include_archived: bool = Query(False, description="Include archived conversations"),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of results"),
     offset: int = Query(0, ge=0, description="Pagination offset"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Keyset cursor (next_cursor of the previous page)"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -80,7 +81,8 @@ async def list_conversations(
     Args:
         include_archived: Include archived conversations
         limit: Maximum results
-        offset: Pagination offset
+        offset: Pagination offset (ignored when a cursor is given)
+        cursor: Keyset cursor from the previous page
         db: Database session
         current_user: Authenticated user from JWT
 
@@ -89,17 +91,25 @@ async def list_conversations(
     """
     user_id = uuid.UUID(current_user["user_id"])
 
-    conversations = ConversationService.list_user_conversations(
-        db=db,
-        user_id=user_id,
-        include_archived=include_archived,
-        limit=limit,
-        offset=offset
-    )
+    try:
+        result = await ConversationService.list_user_conversations(
+            db=db,
+            user_id=user_id,
+            include_archived=include_archived,
+            limit=limit,
+            offset=offset,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
     # Convert to response schema
     conversation_responses = []
-    for conv in conversations:
+    for conv in result["conversations"]:
+        last_message = result["last_messages"].get(conv.id) or {}
         conversation_responses.append(ConversationResponse(
             id=conv.id,
             user_id=conv.user_id,
@@ -108,20 +118,23 @@ async def list_conversations(
             updated_at=conv.updated_at,
             is_archived=conv.is_archived,
             metadata=conv.extra_data or {},
-            message_count=len(conv.messages) if conv.messages else 0
+            message_count=conv.message_count,
+            last_message_preview=last_message.get("preview"),
+            last_message_at=last_message.get("created_at")
         ))
 
     return ConversationListResponse(
         conversations=conversation_responses,
-        total=len(conversation_responses),
+        total=result["total"],
         limit=limit,
-        offset=offset
+        offset=offset,
+        next_cursor=result["next_cursor"]
     )
 
 
 @router.get("/stats", response_model=ConversationStats)
 async def get_conversation_stats(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -135,7 +148,7 @@ async def get_conversation_stats(
         Conversation statistics
     """
     user_id = uuid.UUID(current_user["user_id"])
-    stats = ConversationService.get_conversation_stats(db=db, user_id=user_id)
+    stats = await ConversationService.get_conversation_stats(db=db, user_id=user_id)
     return ConversationStats(**stats)
 
 
@@ -143,7 +156,7 @@ async def get_conversation_stats(
 async def get_conversation(
     conversation_id: uuid.UUID,
     include_deleted: bool = Query(False, description="Include deleted messages"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -160,10 +173,11 @@ async def get_conversation(
     """
     user_id = uuid.UUID(current_user["user_id"])
 
-    conversation = ConversationService.get_conversation(
+    conversation = await ConversationService.get_conversation(
         db=db,
         conversation_id=conversation_id,
-        user_id=user_id
+        user_id=user_id,
+        with_tags=True
     )
 
     if not conversation:
@@ -173,7 +187,7 @@ async def get_conversation(
         )
 
     # Get messages
-    messages = ConversationService.get_conversation_messages(
+    messages = await ConversationService.get_conversation_messages(
         db=db,
         conversation_id=conversation_id,
         user_id=user_id,
@@ -216,7 +230,7 @@ async def get_conversation(
 async def update_conversation(
     conversation_id: uuid.UUID,
     data: ConversationUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -233,7 +247,7 @@ async def update_conversation(
     """
     user_id = uuid.UUID(current_user["user_id"])
 
-    conversation = ConversationService.update_conversation(
+    conversation = await ConversationService.update_conversation(
         db=db,
         conversation_id=conversation_id,
         user_id=user_id,
@@ -256,14 +270,14 @@ async def update_conversation(
         updated_at=conversation.updated_at,
         is_archived=conversation.is_archived,
         metadata=conversation.extra_data or {},
-        message_count=len(conversation.messages) if conversation.messages else 0
+        message_count=conversation.message_count
     )
 
 
 @router.delete("/{conversation_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_conversation(
     conversation_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -279,7 +293,7 @@ async def delete_conversation(
     """
     user_id = uuid.UUID(current_user["user_id"])
 
-    deleted = ConversationService.delete_conversation(
+    deleted = await ConversationService.delete_conversation(
         db=db,
         conversation_id=conversation_id,
         user_id=user_id
@@ -297,7 +311,7 @@ async def get_conversation_messages(
     conversation_id: uuid.UUID,
     limit: int = Query(None, ge=1, le=500, description="Limit number of messages (most recent)"),
     include_deleted: bool = Query(False, description="Include deleted messages"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -315,7 +329,7 @@ async def get_conversation_messages(
     """
     user_id = uuid.UUID(current_user["user_id"])
 
-    messages = ConversationService.get_conversation_messages(
+    messages = await ConversationService.get_conversation_messages(
         db=db,
         conversation_id=conversation_id,
         user_id=user_id,
@@ -342,7 +356,7 @@ async def get_conversation_messages(
 async def delete_message(
     conversation_id: uuid.UUID,
     message_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -359,7 +373,7 @@ async def delete_message(
     """
     user_id = uuid.UUID(current_user["user_id"])
 
-    deleted = ConversationService.soft_delete_message(
+    deleted = await ConversationService.soft_delete_message(
         db=db,
         message_id=message_id,
         user_id=user_id
@@ -376,7 +390,7 @@ async def delete_message(
 async def add_tags(
     conversation_id: uuid.UUID,
     data: TagCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -393,7 +407,7 @@ async def add_tags(
     """
     user_id = uuid.UUID(current_user["user_id"])
 
-    tags = ConversationService.add_tags(
+    tags = await ConversationService.add_tags(
         db=db,
         conversation_id=conversation_id,
         user_id=user_id,
@@ -414,7 +428,7 @@ async def add_tags(
 async def remove_tag(
     conversation_id: uuid.UUID,
     tag: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -431,7 +445,7 @@ async def remove_tag(
     """
     user_id = uuid.UUID(current_user["user_id"])
 
-    removed = ConversationService.remove_tag(
+    removed = await ConversationService.remove_tag(
         db=db,
         conversation_id=conversation_id,
         user_id=user_id,
@@ -448,7 +462,7 @@ async def remove_tag(
 @router.post("/{conversation_id}/generate-title", response_model=ConversationResponse)
 async def auto_generate_title(
     conversation_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -464,7 +478,7 @@ async def auto_generate_title(
     """
     user_id = uuid.UUID(current_user["user_id"])
 
-    title = ConversationService.auto_generate_title(
+    title = await ConversationService.auto_generate_title(
         db=db,
         conversation_id=conversation_id,
         user_id=user_id
@@ -476,7 +490,7 @@ async def auto_generate_title(
             detail="Conversation not found or no messages available"
         )
 
-    conversation = ConversationService.get_conversation(
+    conversation = await ConversationService.get_conversation(
         db=db,
         conversation_id=conversation_id,
         user_id=user_id
@@ -490,7 +504,7 @@ async def auto_generate_title(
         updated_at=conversation.updated_at,
         is_archived=conversation.is_archived,
         metadata=conversation.extra_data or {},
-        message_count=len(conversation.messages) if conversation.messages else 0
+        message_count=conversation.message_count
     )
 
 
@@ -498,7 +512,7 @@ async def auto_generate_title(
 async def add_message_feedback(
     message_id: uuid.UUID,
     feedback: MessageFeedback,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -515,7 +529,7 @@ async def add_message_feedback(
     """
     user_id = uuid.UUID(current_user["user_id"])
 
-    success = ConversationService.add_message_feedback(
+    success = await ConversationService.add_message_feedback(
         db=db,
         message_id=message_id,
         user_id=user_id,
@@ -537,7 +551,7 @@ async def get_conversation_context_info(
     conversation_id: uuid.UUID,
     include_current_query: bool = Query(False, description="Include hypothetical current query"),
     current_query: str = Query(None, description="Hypothetical current query"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -556,7 +570,7 @@ async def get_conversation_context_info(
     user_id = uuid.UUID(current_user["user_id"])
 
     # Verify user owns the conversation
-    conversation = ConversationService.get_conversation(db, conversation_id, user_id)
+    conversation = await ConversationService.get_conversation(db, conversation_id, user_id)
     if not conversation:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -564,11 +578,10 @@ async def get_conversation_context_info(
         )
 
     # Get context info
-    _, context_info = context_manager.get_conversation_context(
+    context_info = await context_manager.get_context_info(
         db=db,
         conversation_id=conversation_id,
-        include_current_query=include_current_query,
-        current_query=current_query
+        current_query=current_query if include_current_query else None
     )
 
     return ConversationContextInfo(**context_info.to_dict())
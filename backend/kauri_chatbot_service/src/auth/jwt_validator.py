@@ -1,14 +1,22 @@
 """
 JWT Token Validator for Chatbot Service
 Validates tokens from User Service
+- local (default): signature checked here, revocation against the synced
+  revocation list, validated principals cached for a short TTL
+- remote: /api/v1/auth/me call per request (JWT_LOCAL_VALIDATION=false, or
+  while the revocation list is not synced)
 """
 from typing import Optional, Dict, Any
+from collections import OrderedDict
+import time
 import httpx
 import jwt as pyjwt
 import structlog
 from fastapi import Header, HTTPException, status
 
 from ..config import settings
+from .revocation_list import get_revocation_list
+from ..utils.http_clients import get_http_client
 
 logger = structlog.get_logger()
 
@@ -22,6 +30,16 @@ class JWTValidator:
         self.user_service_url = settings.user_service_url
         self.timeout = settings.user_service_timeout
 
+        # token -> (cache expiry, principal)
+        self._principals: "OrderedDict[str, tuple]" = OrderedDict()
+        self.principal_cache_ttl = settings.jwt_principal_cache_ttl
+        self.principal_cache_max_size = settings.jwt_principal_cache_max_size
+
+        self.local_validations = 0
+        self.remote_validations = 0
+        self.principal_cache_hits = 0
+        self.revoked_rejections = 0
+
     async def validate_token_with_user_service(self, token: str) -> Dict[str, Any]:
         """
         Validate token by calling User Service /me endpoint
@@ -36,30 +54,30 @@ class JWTValidator:
             HTTPException: If token is invalid or user service is unreachable
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.user_service_url}/api/v1/auth/me",
-                    headers={"Authorization": f"Bearer {token}"}
+            response = await get_http_client("user_service").get(
+                "/api/v1/auth/me",
+                headers={"Authorization": f"Bearer {token}"},
+                timeout=self.timeout
+            )
+
+            if response.status_code == 200:
+                user_data = response.json()
+                logger.info("token_validated_via_user_service", user_id=user_data.get("user_id"))
+                return user_data
+            elif response.status_code == 401:
+                logger.warning("token_validation_failed_unauthorized")
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Token invalide ou expiré",
+                    headers={"WWW-Authenticate": "Bearer"},
                 )
-                
-                if response.status_code == 200:
-                    user_data = response.json()
-                    logger.info("token_validated_via_user_service", user_id=user_data.get("user_id"))
-                    return user_data
-                elif response.status_code == 401:
-                    logger.warning("token_validation_failed_unauthorized")
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="Token invalide ou expiré",
-                        headers={"WWW-Authenticate": "Bearer"},
-                    )
-                else:
-                    logger.error("token_validation_failed_unexpected", status_code=response.status_code)
-                    raise HTTPException(
-                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                        detail="Service d'authentification indisponible"
-                    )
-                    
+            else:
+                logger.error("token_validation_failed_unexpected", status_code=response.status_code)
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Service d'authentification indisponible"
+                )
+
         except httpx.TimeoutException:
             logger.error("user_service_timeout")
             raise HTTPException(
@@ -109,6 +127,90 @@ class JWTValidator:
             )
 
 
+    async def validate_token(self, token: str) -> Dict[str, Any]:
+        """
+        Validate a token locally, falling back to the User Service
+
+        Args:
+            token: JWT token string
+
+        Returns:
+            User information dict (user_id, email)
+
+        Raises:
+            HTTPException: If token is invalid, expired or revoked
+        """
+        revocation_list = get_revocation_list()
+        if not settings.jwt_local_validation or not revocation_list.is_fresh:
+            self.remote_validations += 1
+            return await self.validate_token_with_user_service(token)
+
+        now = time.monotonic()
+        cached = self._principals.get(token)
+        if cached is not None and cached[0] > now:
+            principal = cached[1]
+            self.principal_cache_hits += 1
+        else:
+            payload = self.decode_token_local(token)
+            if payload.get("type") != "access" or not payload.get("sub"):
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Token invalide",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            principal = {
+                "user_id": payload["sub"],
+                "email": payload.get("email"),
+                "jti": payload.get("jti"),
+                "iat": payload.get("iat")
+            }
+            # Never cache a principal beyond the token's own expiry
+            ttl = min(self.principal_cache_ttl, payload["exp"] - time.time()) if payload.get("exp") else self.principal_cache_ttl
+            self._principals[token] = (now + ttl, principal)
+            self._principals.move_to_end(token)
+            while len(self._principals) > self.principal_cache_max_size:
+                self._principals.popitem(last=False)
+            self.local_validations += 1
+
+        # Checked on every request, cached principal or not
+        if revocation_list.is_revoked(principal["jti"]):
+            self._principals.pop(token, None)
+            self.revoked_rejections += 1
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token révoqué",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        # Same checks as the User Service /me endpoint
+        reason = revocation_list.user_revocation_reason(principal["user_id"], principal["iat"])
+        if reason is not None:
+            self._principals.pop(token, None)
+            self.revoked_rejections += 1
+            if reason == "deleted":
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Utilisateur introuvable"
+                )
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Compte désactivé"
+            )
+
+        return dict(principal)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "mode": "local" if settings.jwt_local_validation else "remote",
+            "local_validations": self.local_validations,
+            "principal_cache_hits": self.principal_cache_hits,
+            "remote_validations": self.remote_validations,
+            "revoked_rejections": self.revoked_rejections,
+            "cached_principals": len(self._principals),
+            "revocation_list": get_revocation_list().get_stats()
+        }
+
+
 # Global instance
 jwt_validator = JWTValidator()
 
@@ -137,8 +239,8 @@ async def get_current_user(
 
     token = authorization.split(" ")[1]
     
-    # Validate with User Service (checks revocation)
-    user_data = await jwt_validator.validate_token_with_user_service(token)
+    # Local signature check + synced revocation list (User Service fallback)
+    user_data = await jwt_validator.validate_token(token)
     
     return user_data
 
@@ -0,0 +1,162 @@
+"""
+Local copy of the User Service revocation list
+The set of revoked token ids (jti) and of deactivated/deleted users is pulled
+from /api/v1/auth/revocations and refreshed incrementally in the background
+(only revocations newer than the last version cursor), so token validation
+never waits on the network.
+"""
+from typing import Any, Dict, Optional, Tuple
+from datetime import datetime, timezone
+import asyncio
+import time
+import httpx
+import structlog
+
+from ..config import settings
+from ..utils.http_clients import get_http_client
+
+logger = structlog.get_logger()
+
+
+class RevocationList:
+    """Revoked jti -> token expiry and revoked users, synced from the User Service feed"""
+
+    def __init__(
+        self,
+        refresh_interval: Optional[int] = None,
+        max_staleness: Optional[int] = None
+    ):
+        """
+        Args:
+            refresh_interval: Seconds between two feed pulls
+            max_staleness: Seconds after the last successful sync beyond which
+                the list is no longer trusted (callers fall back to the User Service)
+        """
+        self.refresh_interval = refresh_interval or settings.jwt_revocation_refresh_interval
+        self.max_staleness = max_staleness or settings.jwt_revocation_max_staleness
+
+        self._revoked: Dict[str, datetime] = {}
+        # user_id -> (not_before, reason, expires_at): tokens issued before not_before are rejected
+        self._revoked_users: Dict[str, Tuple[datetime, str, datetime]] = {}
+        self._version: Optional[str] = None
+        self._synced_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    @property
+    def is_fresh(self) -> bool:
+        """True once synced and the last successful sync is recent enough"""
+        return self._synced_at is not None and time.monotonic() - self._synced_at <= self.max_staleness
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        return jti is not None and jti in self._revoked
+
+    def user_revocation_reason(self, user_id: str, issued_at: Optional[int]) -> Optional[str]:
+        """
+        Reason a user's token must be rejected, if any
+
+        Args:
+            user_id: Token subject
+            issued_at: Token iat (epoch seconds)
+
+        Returns:
+            'deactivated' or 'deleted' if the token was issued before the
+            user's revocation, None otherwise
+        """
+        revoked_user = self._revoked_users.get(user_id)
+        if revoked_user is None:
+            return None
+        not_before, reason, _ = revoked_user
+        # iat is truncated to the second: a token issued in the revocation second is rejected too
+        if issued_at is None or issued_at <= not_before.replace(tzinfo=timezone.utc).timestamp():
+            return reason
+        return None
+
+    async def refresh(self):
+        """Pull revocations newer than the current version and drop expired ones"""
+        params = {"since": self._version} if self._version else None
+        try:
+            response = await get_http_client("user_service").get(
+                "/api/v1/auth/revocations",
+                params=params,
+                headers={"X-Service-Token": settings.internal_service_token}
+            )
+            response.raise_for_status()
+            feed = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            self.refresh_failures += 1
+            logger.warning("revocation_feed_refresh_failed", error=str(e))
+            return
+
+        for entry in feed.get("revoked", []):
+            self._revoked[entry["jti"]] = datetime.fromisoformat(entry["expires_at"])
+        for entry in feed.get("users", []):
+            self._revoked_users[entry["user_id"]] = (
+                datetime.fromisoformat(entry["not_before"]),
+                entry["reason"],
+                datetime.fromisoformat(entry["expires_at"])
+            )
+        if feed.get("version"):
+            self._version = feed["version"]
+
+        now = datetime.utcnow()
+        for jti in [jti for jti, expires_at in self._revoked.items() if expires_at <= now]:
+            del self._revoked[jti]
+        for user_id in [user_id for user_id, entry in self._revoked_users.items() if entry[2] <= now]:
+            del self._revoked_users[user_id]
+
+        self._synced_at = time.monotonic()
+        self.refreshes += 1
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                # Malformed feed entry: keep the loop alive (the cursor is not
+                # advanced, the same page is pulled again next time)
+                self.refresh_failures += 1
+                logger.error("revocation_feed_refresh_error", error=str(e))
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self):
+        """Start the background refresh loop (idempotent)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "revoked_tokens": len(self._revoked),
+            "revoked_users": len(self._revoked_users),
+            "version": self._version,
+            "fresh": self.is_fresh,
+            "seconds_since_sync": (
+                round(time.monotonic() - self._synced_at, 1) if self._synced_at is not None else None
+            ),
+            "refresh_interval": self.refresh_interval,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures
+        }
+
+
+# Singleton instance
+_revocation_list_instance: Optional[RevocationList] = None
+
+
+def get_revocation_list() -> RevocationList:
+    """Get singleton revocation list"""
+    global _revocation_list_instance
+    if _revocation_list_instance is None:
+        _revocation_list_instance = RevocationList()
+    return _revocation_list_instance
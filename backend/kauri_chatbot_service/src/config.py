@@ -22,6 +22,9 @@ class Settings(BaseSettings):
 
     # Database (PostgreSQL for conversations and messages)
     database_url: str = Field(alias="CHATBOT_DATABASE_URL")
+    db_pool_size: int = Field(default=10, alias="DB_POOL_SIZE")  # Async (asyncpg) pool used by the request handlers
+    db_max_overflow: int = Field(default=20, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(default=30, alias="DB_POOL_TIMEOUT")  # Seconds to wait for a free connection
 
     # Redis
     redis_host: str = Field(default="redis", alias="REDIS_HOST")
@@ -30,11 +33,13 @@ class Settings(BaseSettings):
     redis_prefix: str = Field(default="chatbot_service", alias="REDIS_PREFIX")
     cache_ttl: int = Field(default=3600, alias="CACHE_TTL")
     embedding_cache_ttl: int = Field(default=86400, alias="EMBEDDING_CACHE_TTL")
+    cache_backend: str = Field(default="memory", alias="CACHE_BACKEND")  # Result caches: "memory" (per worker) or "redis" (shared)
 
     # Vector Database
     vector_db_type: str = Field(default="chromadb", alias="VECTOR_DB_TYPE")
     vector_db_host: str = Field(default="chromadb", alias="VECTOR_DB_HOST")
     vector_db_port: int = Field(default=8000, alias="VECTOR_DB_PORT")
+    vector_db_page_size: int = Field(default=1000, alias="VECTOR_DB_PAGE_SIZE")  # Page size for full-collection scans
 
     # API Keys
     openai_api_key: str = Field(alias="OPENAI_API_KEY")
@@ -49,6 +54,9 @@ class Settings(BaseSettings):
     embedding_dimension: int = Field(default=1024, alias="EMBEDDING_DIMENSION")
     embedding_device: str = Field(default="cpu", alias="EMBEDDING_DEVICE")
     embedding_batch_size: int = Field(default=8, alias="EMBEDDING_BATCH_SIZE")
+    embedding_cache_enabled: bool = Field(default=True, alias="EMBEDDING_CACHE_ENABLED")  # Cache query embeddings
+    embedding_cache_max_mb: int = Field(default=64, alias="EMBEDDING_CACHE_MAX_MB")  # In-process budget (~16k BGE-M3 vectors)
+    embedding_cache_shared_dir: str = Field(default="", alias="EMBEDDING_CACHE_SHARED_DIR")  # Optional cross-worker tier, e.g. /dev/shm/kauri_embeddings (TTL: EMBEDDING_CACHE_TTL)
 
     # LLM
     llm_provider: str = Field(default="deepseek", alias="LLM_PROVIDER")
@@ -57,29 +65,78 @@ class Settings(BaseSettings):
     llm_fallback_model: str = Field(default="gpt-4o-mini", alias="LLM_FALLBACK_MODEL")
     llm_temperature: float = Field(default=0.1, alias="LLM_TEMPERATURE")  # Déterministe pour réponses cohérentes
     llm_max_tokens: int = Field(default=2500, alias="LLM_MAX_TOKENS")  # Réponses complètes et structurées
+    llm_tokenizer: str = Field(default="", alias="LLM_TOKENIZER")  # Hugging Face tokenizer of LLM_MODEL for stored message token counts (e.g. deepseek-ai/DeepSeek-V3), empty = character estimate
+    llm_breaker_window: int = Field(default=50, alias="LLM_BREAKER_WINDOW")  # Recent calls per provider used by the circuit breaker
+    llm_breaker_min_requests: int = Field(default=10, alias="LLM_BREAKER_MIN_REQUESTS")  # Calls needed before the breaker can open
+    llm_breaker_error_rate: float = Field(default=0.5, alias="LLM_BREAKER_ERROR_RATE")  # Error rate that opens the breaker
+    llm_breaker_latency_p95_ms: float = Field(default=30000, alias="LLM_BREAKER_LATENCY_P95_MS")  # p95 latency (TTFT when streaming) that opens the breaker, 0 = off
+    llm_breaker_cooldown_s: float = Field(default=30, alias="LLM_BREAKER_COOLDOWN_S")  # Time open before a half-open probe
+    llm_hedge_enabled: bool = Field(default=True, alias="LLM_HEDGE_ENABLED")  # Race the fallback when the primary is slow
+    llm_hedge_after_ms: float = Field(default=3000, alias="LLM_HEDGE_AFTER_MS")  # TTFT deadline before hedging a stream
+    llm_hedge_generate_after_ms: float = Field(default=0, alias="LLM_HEDGE_GENERATE_AFTER_MS")  # Deadline for non-streaming calls (full response), 0 = no hedge
 
     # Intent Classification
     intent_classifier_temperature: float = Field(default=0.0, alias="INTENT_CLASSIFIER_TEMPERATURE")  # Déterministe pour classification
     intent_classifier_max_tokens: int = Field(default=500, alias="INTENT_CLASSIFIER_MAX_TOKENS")  # Classification + réponse directe si nécessaire
+    intent_fast_path_enabled: bool = Field(default=True, alias="INTENT_FAST_PATH_ENABLED")  # Classification locale (parser + kNN) avant le LLM
+    intent_fast_path_min_similarity: float = Field(default=0.86, alias="INTENT_FAST_PATH_MIN_SIMILARITY")  # Similarité minimale avec l'exemple le plus proche
+    intent_fast_path_min_vote: float = Field(default=0.8, alias="INTENT_FAST_PATH_MIN_VOTE")  # Part minimale des k voisins d'accord
+    intent_fast_path_k: int = Field(default=5, alias="INTENT_FAST_PATH_K")
+    intent_fast_path_shadow_rate: float = Field(default=0.05, alias="INTENT_FAST_PATH_SHADOW_RATE")  # Part des décisions locales vérifiées par le LLM (taux d'accord)
+    intent_cache_enabled: bool = Field(default=True, alias="INTENT_CACHE_ENABLED")  # Cache des classifications LLM (requête normalisée + version du prompt)
+    intent_cache_ttl: int = Field(default=86400, alias="INTENT_CACHE_TTL")
+    intent_cache_max_entries: int = Field(default=5000, alias="INTENT_CACHE_MAX_ENTRIES")  # Taille LRU (backend mémoire)
+    intent_cache_warm_file: str = Field(default="", alias="INTENT_CACHE_WARM_FILE")  # JSON des requêtes fréquentes chargé au démarrage
 
     # RAG Configuration
     rag_top_k: int = Field(default=10, alias="RAG_TOP_K")
     rag_rerank_top_k: int = Field(default=5, alias="RAG_RERANK_TOP_K")  # Still used as fallback
     reranker_model: str = Field(default="BAAI/bge-reranker-base", alias="RERANKER_MODEL")
+    inference_batching_enabled: bool = Field(default=True, alias="INFERENCE_BATCHING_ENABLED")  # Micro-batch concurrent embedder/reranker calls
+    inference_batch_window_ms: float = Field(default=8.0, alias="INFERENCE_BATCH_WINDOW_MS")  # Max wait to collect a batch
+    inference_max_batch_size: int = Field(default=32, alias="INFERENCE_MAX_BATCH_SIZE")  # Max items (texts or query-document pairs) per batch
+    rag_enable_reranking: bool = Field(default=True, alias="RAG_ENABLE_RERANKING")  # Default when callers don't specify use_reranking
+    rag_executor_workers: int = Field(default=4, alias="RAG_EXECUTOR_WORKERS")  # Threads for blocking retrieval stages (embedding, ChromaDB, BM25, reranking)
+    speculative_retrieval_enabled: bool = Field(default=True, alias="SPECULATIVE_RETRIEVAL_ENABLED")  # Start hybrid retrieval during intent classification (streaming)
+
+    # Retrieval result cache (ranked chunk ids + scores, tagged with the corpus epoch)
+    retrieval_cache_enabled: bool = Field(default=True, alias="RETRIEVAL_CACHE_ENABLED")
+    retrieval_cache_ttl: int = Field(default=3600, alias="RETRIEVAL_CACHE_TTL")
+    retrieval_cache_max_entries: int = Field(default=2000, alias="RETRIEVAL_CACHE_MAX_ENTRIES")  # LRU size (memory backend)
+    corpus_epoch_refresh_seconds: int = Field(default=30, alias="CORPUS_EPOCH_REFRESH_SECONDS")  # How often workers re-read the corpus version
+
+    # Semantic answer cache (first turns only, invalidated by corpus epoch and prompt version)
+    semantic_cache_enabled: bool = Field(default=True, alias="SEMANTIC_CACHE_ENABLED")
+    semantic_cache_threshold: float = Field(default=0.95, alias="SEMANTIC_CACHE_THRESHOLD")  # Min cosine similarity between query embeddings
+    semantic_cache_max_entries: int = Field(default=5000, alias="SEMANTIC_CACHE_MAX_ENTRIES")  # LRU size (per worker)
+    semantic_cache_ttl: int = Field(default=86400, alias="SEMANTIC_CACHE_TTL")
+    prompt_version: str = Field(default="1", alias="PROMPT_VERSION")  # Bump when system/user prompts change to drop cached answers
 
     # Dynamic source filtering based on quality
     rag_min_score_threshold: float = Field(default=0.35, alias="RAG_MIN_SCORE_THRESHOLD")  # Minimum score to include a document
     rag_min_documents: int = Field(default=3, alias="RAG_MIN_DOCUMENTS")  # Minimum documents to keep (even if below threshold)
     rag_max_documents: int = Field(default=8, alias="RAG_MAX_DOCUMENTS")  # Maximum documents to avoid context overload
+    rag_context_max_tokens: int = Field(default=6000, alias="RAG_CONTEXT_MAX_TOKENS")  # Token budget of the retrieved context (filled by rerank score)
+    rag_context_min_segment_tokens: int = Field(default=150, alias="RAG_CONTEXT_MIN_SEGMENT_TOKENS")  # Smallest trimmed segment worth keeping
 
     # Conversation Context Management
     conversation_max_context_tokens: int = Field(default=8000, alias="CONVERSATION_MAX_CONTEXT_TOKENS")  # Maximum tokens for conversation context
     conversation_context_warning_threshold: float = Field(default=0.80, alias="CONVERSATION_CONTEXT_WARNING_THRESHOLD")  # Warning at 80%
     conversation_history_max_messages: int = Field(default=10, alias="CONVERSATION_HISTORY_MAX_MESSAGES")  # Max messages to include in context
+    conversation_cache_enabled: bool = Field(default=True, alias="CONVERSATION_CACHE_ENABLED")  # Write-through cache of recent message windows (backend: CACHE_BACKEND)
+    conversation_cache_max_conversations: int = Field(default=2000, alias="CONVERSATION_CACHE_MAX_CONVERSATIONS")  # LRU size of the memory backend
+    conversation_cache_ttl: int = Field(default=1800, alias="CONVERSATION_CACHE_TTL")  # Idle conversations are evicted after this delay (seconds)
 
     # BM25 Configuration
     bm25_k1: float = Field(default=1.5, alias="BM25_K1")  # BM25 term frequency saturation parameter
     bm25_b: float = Field(default=0.75, alias="BM25_B")  # BM25 length normalization parameter
+    bm25_snapshot_enabled: bool = Field(default=True, alias="BM25_SNAPSHOT_ENABLED")  # Persist/load memory-mapped BM25 snapshot
+    bm25_snapshot_dir: str = Field(default="/app/data/bm25", alias="BM25_SNAPSHOT_DIR")  # Persistent volume shared by workers and ingestion
+
+    # Streaming (SSE)
+    sse_coalescing_enabled: bool = Field(default=True, alias="SSE_COALESCING_ENABLED")  # Merge tokens into time-windowed frames
+    sse_coalesce_window_ms: float = Field(default=40.0, alias="SSE_COALESCE_WINDOW_MS")  # Max time a token waits in the buffer
+    sse_coalesce_max_bytes: int = Field(default=2048, alias="SSE_COALESCE_MAX_BYTES")  # Flush earlier once the buffer reaches this size
 
     # CORS
     cors_origins: str = Field(default="*", alias="CORS_ORIGINS")
@@ -97,6 +154,18 @@ class Settings(BaseSettings):
     # User Service Integration
     user_service_url: str = Field(default="http://kauri_user_service:3201", alias="USER_SERVICE_URL")
     user_service_timeout: int = Field(default=5, alias="USER_SERVICE_TIMEOUT")
+    http_client_max_connections: int = Field(default=100, alias="HTTP_CLIENT_MAX_CONNECTIONS")  # Per downstream service
+    http_client_max_keepalive: int = Field(default=20, alias="HTTP_CLIENT_MAX_KEEPALIVE")
+    http_client_keepalive_expiry: float = Field(default=30.0, alias="HTTP_CLIENT_KEEPALIVE_EXPIRY")  # Seconds
+    http_client_http2: bool = Field(default=False, alias="HTTP_CLIENT_HTTP2")  # Requires the h2 package
+
+    # JWT local validation (signature checked here, revocations synced from the User Service)
+    jwt_local_validation: bool = Field(default=True, alias="JWT_LOCAL_VALIDATION")
+    jwt_revocation_refresh_interval: int = Field(default=10, alias="JWT_REVOCATION_REFRESH_INTERVAL")  # Seconds between feed pulls
+    jwt_revocation_max_staleness: int = Field(default=60, alias="JWT_REVOCATION_MAX_STALENESS")  # Fall back to /me beyond this
+    jwt_principal_cache_ttl: int = Field(default=60, alias="JWT_PRINCIPAL_CACHE_TTL")  # Seconds
+    jwt_principal_cache_max_size: int = Field(default=10000, alias="JWT_PRINCIPAL_CACHE_MAX_SIZE")
+    internal_service_token: str = Field(default="", alias="INTERNAL_SERVICE_TOKEN")  # Sent as X-Service-Token to the revocation feed
 
     # Logging
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
@@ -0,0 +1,192 @@
+"""
+Per-provider circuit breaker
+Tracks error rate and latency percentiles over a rolling window of calls;
+an open breaker sends traffic straight to the other provider until a
+half-open probe succeeds.
+"""
+from typing import Any, Deque, Dict, Optional, Tuple
+from collections import deque
+import time
+import structlog
+
+from ..config import settings
+
+logger = structlog.get_logger()
+
+
+class CircuitBreaker:
+    """
+    Closed -> open (error rate or p95 latency over threshold) -> half-open
+    (one probe after the cooldown) -> closed on success / open on failure
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        window: Optional[int] = None,
+        min_requests: Optional[int] = None,
+        error_rate_threshold: Optional[float] = None,
+        latency_p95_threshold_ms: Optional[float] = None,
+        cooldown_s: Optional[float] = None
+    ):
+        """
+        Args:
+            name: Provider name (for logs and stats)
+            window: Number of recent calls considered
+            min_requests: Calls needed in the window before the breaker can trip
+            error_rate_threshold: Error rate that opens the breaker
+            latency_p95_threshold_ms: p95 latency that opens the breaker (0 = disabled)
+            cooldown_s: Time spent open before a half-open probe
+        """
+        self.name = name
+        self.min_requests = min_requests or settings.llm_breaker_min_requests
+        self.error_rate_threshold = error_rate_threshold or settings.llm_breaker_error_rate
+        self.latency_p95_threshold = (
+            latency_p95_threshold_ms if latency_p95_threshold_ms is not None
+            else settings.llm_breaker_latency_p95_ms
+        ) / 1000
+        self.cooldown = cooldown_s or settings.llm_breaker_cooldown_s
+
+        # (latency seconds, failed) of recent calls
+        self.calls: Deque[Tuple[float, bool]] = deque(maxlen=window or settings.llm_breaker_window)
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+
+        self.trips = 0
+        self.short_circuited = 0
+        self.last_trip_reason: Optional[str] = None
+
+    def allow_request(self) -> bool:
+        """
+        Whether a call may be sent to this provider now
+
+        Returns:
+            False while open; True for the single half-open probe
+        """
+        if self.state == self.CLOSED:
+            return True
+
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+            self.state = self.HALF_OPEN
+            self.probe_in_flight = False
+            logger.info("llm_breaker_half_open", provider=self.name)
+
+        if self.state == self.HALF_OPEN and not self.probe_in_flight:
+            self.probe_in_flight = True
+            return True
+
+        self.short_circuited += 1
+        return False
+
+    def record(self, latency: float, failed: bool = False):
+        """
+        Record the outcome of a call
+
+        Args:
+            latency: Latency in seconds (time to first token when streaming)
+            failed: Whether the call raised
+        """
+        if self.state == self.HALF_OPEN:
+            self.probe_in_flight = False
+            if failed:
+                self._trip("probe_failed")
+            else:
+                self.state = self.CLOSED
+                self.calls.clear()
+                logger.info("llm_breaker_closed", provider=self.name)
+                self.calls.append((latency, failed))
+            return
+
+        self.calls.append((latency, failed))
+        self._evaluate()
+
+    def record_cancelled(self):
+        """
+        Record a call cancelled before it answered (lost a hedge, or the
+        caller went away): no sample, but a half-open probe that never got
+        a token does not close the breaker - it stays open for another cooldown
+        """
+        if self.state == self.HALF_OPEN and self.probe_in_flight:
+            self.probe_in_flight = False
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            logger.info("llm_breaker_probe_cancelled", provider=self.name)
+
+    def record_hedge_lost(self, latency: float):
+        """
+        Record a call beaten by the hedge on the other provider
+
+        It was cancelled long before its real latency was known, so it
+        counts as at least as slow as the latency threshold
+
+        Args:
+            latency: Time from launch to cancellation in seconds
+        """
+        self.calls.append((max(latency, self.latency_p95_threshold), False))
+        self._evaluate()
+
+    def mark_failed(self, latency: float):
+        """
+        Turn the success sample of a call into a failure (stream broken
+        after its first token was recorded), keeping one sample per call
+
+        Args:
+            latency: Latency recorded for the call's first token
+        """
+        try:
+            index = self.calls.index((latency, False))
+        except ValueError:
+            return  # Sample already out of the window
+        self.calls[index] = (latency, True)
+        self._evaluate()
+
+    def _evaluate(self):
+        """Trip on the window's error rate or p95 latency"""
+        if self.state != self.CLOSED or len(self.calls) < self.min_requests:
+            return
+
+        if self.error_rate() >= self.error_rate_threshold:
+            self._trip("error_rate")
+        elif self.latency_p95_threshold and self.percentile(0.95) >= self.latency_p95_threshold:
+            self._trip("latency")
+
+    def _trip(self, reason: str):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.trips += 1
+        self.last_trip_reason = reason
+        logger.warning("llm_breaker_open",
+                      provider=self.name,
+                      reason=reason,
+                      error_rate=round(self.error_rate(), 4),
+                      p95_ms=int(self.percentile(0.95) * 1000))
+
+    def error_rate(self) -> float:
+        if not self.calls:
+            return 0.0
+        return sum(1 for _, failed in self.calls if failed) / len(self.calls)
+
+    def percentile(self, q: float) -> float:
+        """Latency percentile (seconds) of the calls in the window"""
+        if not self.calls:
+            return 0.0
+        latencies = sorted(latency for latency, _ in self.calls)
+        return latencies[min(int(q * len(latencies)), len(latencies) - 1)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "calls_in_window": len(self.calls),
+            "error_rate": round(self.error_rate(), 4),
+            "p50_ms": int(self.percentile(0.50) * 1000),
+            "p95_ms": int(self.percentile(0.95) * 1000),
+            "p99_ms": int(self.percentile(0.99) * 1000),
+            "trips": self.trips,
+            "last_trip_reason": self.last_trip_reason,
+            "short_circuited": self.short_circuited
+        }
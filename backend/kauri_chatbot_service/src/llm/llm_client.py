@@ -1,15 +1,23 @@
 """
 LLM Client with DeepSeek primary and OpenAI fallback
+- Per-provider circuit breaker: an open primary routes straight to the fallback
+- Hedged requests: the fallback races a primary that misses the TTFT deadline
 """
-from typing import Dict, Any, Optional, AsyncGenerator
+from typing import Dict, Any, Optional, AsyncGenerator, Awaitable, Callable, List, Tuple
+import asyncio
+import time
 import structlog
 from openai import AsyncOpenAI
-from tenacity import retry, stop_after_attempt, wait_exponential
 
 from ..config import settings
+from .circuit_breaker import CircuitBreaker
+from .usage import extract_usage, get_prompt_cache_stats
 
 logger = structlog.get_logger()
 
+# Sent to the other provider when a stream breaks midway
+CONTINUE_PROMPT = "Continue ta réponse exactement là où elle s'est arrêtée, sans répéter ce qui précède."
+
 
 class LLMClient:
     """
@@ -23,79 +31,194 @@ class LLMClient:
         self.primary_model = settings.llm_model
         self.fallback_provider = settings.llm_fallback_provider
         self.fallback_model = settings.llm_fallback_model
-        
+
         # Initialize clients
         self.deepseek_client = AsyncOpenAI(
             api_key=settings.deepseek_api_key,
             base_url="https://api.deepseek.com"
         )
-        
+
         self.openai_client = AsyncOpenAI(
             api_key=settings.openai_api_key
         )
-        
+
+        self.breakers = {
+            provider: CircuitBreaker(provider)
+            for provider in (self.primary_provider, self.fallback_provider)
+        }
+        self.hedges_launched = 0
+        self.hedges_won = 0
+        self.fallbacks = 0
+        self.stream_continuations = 0
+
         logger.info(
             "llm_client_initialized",
             primary=f"{self.primary_provider}/{self.primary_model}",
             fallback=f"{self.fallback_provider}/{self.fallback_model}"
         )
 
-    @retry(stop=stop_after_attempt(2), wait=wait_exponential(multiplier=1, min=2, max=10))
+    def _build_messages(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        history: Optional[List[Dict[str, str]]]
+    ) -> list:
+        """System prompt, then prior turns, then the user prompt (static -> dynamic, for prefix caching)"""
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        if history:
+            messages.extend(history)
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    def _get_client(self, provider: str) -> AsyncOpenAI:
+        if provider == "deepseek":
+            return self.deepseek_client
+        elif provider == "openai":
+            return self.openai_client
+        raise ValueError(f"Unknown provider: {provider}")
+
+    def _route(self, use_fallback: bool) -> List[Tuple[str, str]]:
+        """
+        Providers to try, in order
+
+        Args:
+            use_fallback: Force use of fallback provider
+
+        Returns:
+            List of (provider, model); the fallback comes first while the
+            primary breaker is open (the primary stays as a last resort)
+        """
+        primary = (self.primary_provider, self.primary_model)
+        fallback = (self.fallback_provider, self.fallback_model)
+
+        if use_fallback:
+            return [fallback]
+        if not self.breakers[self.primary_provider].allow_request():
+            logger.info("llm_primary_breaker_open_routing_to_fallback", provider=self.primary_provider)
+            return [fallback, primary]
+        return [primary, fallback]
+
+    async def _race(
+        self,
+        route: List[Tuple[str, str]],
+        call: Callable[[str, str], Awaitable[Any]],
+        hedge_after_ms: float,
+        discard: Optional[Callable[[Any], Awaitable[None]]] = None
+    ) -> Tuple[Any, Tuple[str, str]]:
+        """
+        Run call() on the first provider, hedging with the next one after
+        hedge_after_ms and falling back to it on failure
+
+        Args:
+            route: Providers to try, in order
+            call: Coroutine function (provider, model) -> result
+            hedge_after_ms: Hedge deadline (0 = no hedge)
+            discard: Cleanup for a losing result that completed anyway
+
+        Returns:
+            Tuple (result, (provider, model)) of the first call to succeed
+        """
+        remaining = list(route)
+        pending: Dict[asyncio.Future, Tuple[str, str]] = {}
+
+        def launch():
+            target = remaining.pop(0)
+            pending[asyncio.ensure_future(call(*target))] = target
+
+        launch()
+        started = time.perf_counter()
+        last_error: Optional[BaseException] = None
+        hedged = False
+        winner: Optional[Tuple[str, str]] = None
+
+        try:
+            if remaining and settings.llm_hedge_enabled and hedge_after_ms > 0:
+                done, _ = await asyncio.wait(set(pending), timeout=hedge_after_ms / 1000)
+                if not done and self.breakers[remaining[0][0]].allow_request():
+                    logger.info("llm_hedge_launched",
+                               slow_provider=route[0][0],
+                               hedge_provider=remaining[0][0],
+                               after_ms=hedge_after_ms)
+                    self.hedges_launched += 1
+                    hedged = True
+                    launch()
+
+            while pending:
+                done, _ = await asyncio.wait(set(pending), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    target = pending.pop(task)
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        continue
+
+                    if target != route[0]:
+                        if hedged:
+                            self.hedges_won += 1
+                        else:
+                            self.fallbacks += 1
+                    winner = target
+                    return task.result(), target
+
+                if not pending and remaining:
+                    logger.warning("llm_provider_failed_switching_to_fallback",
+                                  fallback=remaining[0][0],
+                                  error=str(last_error))
+                    launch()
+
+            raise last_error
+
+        finally:
+            # Cancel the loser (or everything if we are being cancelled)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(set(pending))
+                for task, target in pending.items():
+                    if not task.cancelled():
+                        if discard is not None and task.exception() is None:
+                            await discard(task.result())
+                    elif hedged and winner is not None and target == route[0]:
+                        # Beaten by the hedge: slow, even though it never finished
+                        self.breakers[target[0]].record_hedge_lost(time.perf_counter() - started)
+
     async def generate(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
-        use_fallback: bool = False
+        use_fallback: bool = False,
+        history: Optional[List[Dict[str, str]]] = None
     ) -> Dict[str, Any]:
         """
         Generate completion from LLM
-        
+
         Args:
             prompt: User prompt
             system_prompt: System prompt
             temperature: Temperature override
             max_tokens: Max tokens override
             use_fallback: Force use of fallback provider
-            
+            history: Prior turns as chat messages (sent between system and user prompt)
+
         Returns:
-            Dict with 'content', 'model', 'tokens_used'
+            Dict with 'content', 'model', 'tokens_used', 'prompt_tokens', 'cached_tokens'
         """
         temp = temperature if temperature is not None else settings.llm_temperature
         max_tok = max_tokens if max_tokens is not None else settings.llm_max_tokens
-        
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-        
-        # Try primary provider first
-        if not use_fallback:
-            try:
-                return await self._generate_with_provider(
-                    self.primary_provider,
-                    self.primary_model,
-                    messages,
-                    temp,
-                    max_tok
-                )
-            except Exception as e:
-                logger.warning(
-                    "primary_llm_failed_switching_to_fallback",
-                    provider=self.primary_provider,
-                    error=str(e)
-                )
-                # Fall through to fallback
-        
-        # Use fallback
-        return await self._generate_with_provider(
-            self.fallback_provider,
-            self.fallback_model,
-            messages,
-            temp,
-            max_tok
+
+        messages = self._build_messages(prompt, system_prompt, history)
+
+        response, _ = await self._race(
+            self._route(use_fallback),
+            lambda provider, model: self._generate_with_provider(
+                provider, model, messages, temp, max_tok
+            ),
+            hedge_after_ms=settings.llm_hedge_generate_after_ms
         )
+        return response
 
     async def _generate_with_provider(
         self,
@@ -106,14 +229,11 @@ class LLMClient:
         max_tokens: int
     ) -> Dict[str, Any]:
         """Generate with specific provider"""
-        
-        if provider == "deepseek":
-            client = self.deepseek_client
-        elif provider == "openai":
-            client = self.openai_client
-        else:
-            raise ValueError(f"Unknown provider: {provider}")
-        
+
+        client = self._get_client(provider)
+        breaker = self.breakers[provider]
+        start = time.perf_counter()
+
         try:
             response = await client.chat.completions.create(
                 model=model,
@@ -121,24 +241,35 @@ class LLMClient:
                 temperature=temperature,
                 max_tokens=max_tokens
             )
-            
+
             content = response.choices[0].message.content
-            tokens_used = response.usage.total_tokens if response.usage else None
-            
+            usage = extract_usage(response.usage)
+            breaker.record(time.perf_counter() - start)
+            get_prompt_cache_stats().record(provider, usage)
+
             logger.info(
                 "llm_generation_success",
                 provider=provider,
                 model=model,
-                tokens=tokens_used
+                tokens=usage.get("total_tokens"),
+                cached_tokens=usage.get("cached_tokens")
             )
-            
+
             return {
                 "content": content,
                 "model": f"{provider}/{model}",
-                "tokens_used": tokens_used
+                "tokens_used": usage.get("total_tokens"),
+                "prompt_tokens": usage.get("prompt_tokens"),
+                "cached_tokens": usage.get("cached_tokens")
             }
-            
+
+        except asyncio.CancelledError:
+            # Lost a hedge (recorded by _race) or caller gone: not an outcome
+            breaker.record_cancelled()
+            raise
+
         except Exception as e:
+            breaker.record(time.perf_counter() - start, failed=True)
             logger.error(
                 "llm_generation_failed",
                 provider=provider,
@@ -153,73 +284,161 @@ class LLMClient:
         system_prompt: Optional[str] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
-        use_fallback: bool = False
+        use_fallback: bool = False,
+        history: Optional[List[Dict[str, str]]] = None,
+        usage: Optional[Dict[str, Any]] = None
     ) -> AsyncGenerator[str, None]:
         """
         Generate streaming completion
-        
+
+        The first token is raced like generate() (TTFT deadline); if the
+        stream breaks after text was sent, the other provider continues the
+        answer instead of restarting it.
+
         Args:
             prompt: User prompt
             system_prompt: System prompt
             temperature: Temperature override
             max_tokens: Max tokens override
             use_fallback: Force use of fallback provider
-            
+            history: Prior turns as chat messages (sent between system and user prompt)
+            usage: Optional dict filled with the reported usage (model,
+                total/prompt/cached tokens) once the stream completes
+
         Yields:
             Text chunks
         """
         temp = temperature if temperature is not None else settings.llm_temperature
         max_tok = max_tokens if max_tokens is not None else settings.llm_max_tokens
-        
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-        
-        # Select provider
-        if use_fallback:
-            provider = self.fallback_provider
-            model = self.fallback_model
-        else:
-            provider = self.primary_provider
-            model = self.primary_model
-        
-        # Select client
-        if provider == "deepseek":
-            client = self.deepseek_client
-        elif provider == "openai":
-            client = self.openai_client
-        else:
-            raise ValueError(f"Unknown provider: {provider}")
-        
+
+        messages = self._build_messages(prompt, system_prompt, history)
+
+        async def open_stream(provider: str, model: str):
+            stream = self._stream_with_provider(provider, model, messages, temp, max_tok, usage)
+            try:
+                first = await stream.__anext__()
+            except StopAsyncIteration:
+                first = None
+            return stream, first
+
+        async def close_stream(opened):
+            await opened[0].aclose()
+
+        route = self._route(use_fallback)
+        (stream, first), target = await self._race(
+            route,
+            open_stream,
+            hedge_after_ms=settings.llm_hedge_after_ms,
+            discard=close_stream
+        )
+
+        emitted = []
+        try:
+            if first is not None:
+                emitted.append(first)
+                yield first
+            async for chunk in stream:
+                emitted.append(chunk)
+                yield chunk
+            return
+        except Exception as e:
+            other = next((candidate for candidate in route if candidate != target), None)
+            if other is None:
+                raise
+            logger.warning("llm_stream_broken_continuing_on_fallback",
+                          provider=target[0],
+                          fallback=other[0],
+                          chars_sent=sum(len(chunk) for chunk in emitted),
+                          error=str(e))
+        finally:
+            await stream.aclose()
+
+        # Continue the partial answer on the other provider
+        self.stream_continuations += 1
+        continuation = messages + [
+            {"role": "assistant", "content": "".join(emitted)},
+            {"role": "user", "content": CONTINUE_PROMPT}
+        ]
+        async for chunk in self._stream_with_provider(other[0], other[1], continuation, temp, max_tok, usage):
+            yield chunk
+
+    async def _stream_with_provider(
+        self,
+        provider: str,
+        model: str,
+        messages: list,
+        temperature: float,
+        max_tokens: int,
+        usage: Optional[Dict[str, Any]] = None
+    ) -> AsyncGenerator[str, None]:
+        """Stream with specific provider (breaker latency = time to first token)"""
+        client = self._get_client(provider)
+        breaker = self.breakers[provider]
+        start = time.perf_counter()
+        first_token = True
+        ttft = 0.0
+
         try:
             stream = await client.chat.completions.create(
                 model=model,
                 messages=messages,
-                temperature=temp,
-                max_tokens=max_tok,
-                stream=True
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                stream_options={"include_usage": True}
             )
-            
+
+            reported = {}
             async for chunk in stream:
-                if chunk.choices[0].delta.content:
+                if chunk.usage:
+                    # Final chunk (no choices) carries the usage
+                    reported = extract_usage(chunk.usage)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    if first_token:
+                        ttft = time.perf_counter() - start
+                        breaker.record(ttft)
+                        first_token = False
                     yield chunk.choices[0].delta.content
-                    
+
+            if first_token:
+                breaker.record(time.perf_counter() - start)
+
+            get_prompt_cache_stats().record(provider, reported)
+            if usage is not None and reported:
+                # A continuation after a broken stream adds to the first provider's usage
+                for key, value in reported.items():
+                    usage[key] = usage.get(key, 0) + value
+                usage["model"] = f"{provider}/{model}"
+
+        except asyncio.CancelledError:
+            if first_token:
+                breaker.record_cancelled()  # Lost a hedge (recorded by _race) or caller gone
+            raise
+
         except Exception as e:
+            if first_token:
+                breaker.record(time.perf_counter() - start, failed=True)
+            else:
+                # Broken after its first token was recorded as a success
+                breaker.mark_failed(ttft)
             logger.error(
                 "llm_stream_failed",
                 provider=provider,
                 model=model,
                 error=str(e)
             )
-            # Try fallback if not already using it
-            if not use_fallback:
-                async for chunk in self.generate_stream(
-                    prompt, system_prompt, temperature, max_tokens, use_fallback=True
-                ):
-                    yield chunk
-            else:
-                raise
+            raise
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Breaker state and hedging counters"""
+        return {
+            "providers": {name: breaker.get_stats() for name, breaker in self.breakers.items()},
+            "hedges_launched": self.hedges_launched,
+            "hedges_won": self.hedges_won,
+            "fallbacks": self.fallbacks,
+            "stream_continuations": self.stream_continuations,
+            "prompt_cache": get_prompt_cache_stats().get_stats()
+        }
 
 
 # Global instance
@@ -0,0 +1,75 @@
+"""
+Token usage reported by the providers, including prompt-cache hits
+- DeepSeek: usage.prompt_cache_hit_tokens
+- OpenAI: usage.prompt_tokens_details.cached_tokens
+"""
+from typing import Any, Dict
+
+
+def extract_usage(usage: Any) -> Dict[str, int]:
+    """
+    Normalize an API usage object
+
+    Args:
+        usage: `usage` of a chat completion (or final stream chunk), may be None
+
+    Returns:
+        Dict with prompt_tokens, completion_tokens, total_tokens, cached_tokens
+        (empty if the provider reported no usage)
+    """
+    if usage is None:
+        return {}
+
+    cached = getattr(usage, "prompt_cache_hit_tokens", None)
+    if cached is None:
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None) if details else None
+
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", None) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", None) or 0,
+        "total_tokens": getattr(usage, "total_tokens", None) or 0,
+        "cached_tokens": cached or 0
+    }
+
+
+class PromptCacheStats:
+    """Prompt tokens served from the provider prefix cache, per provider"""
+
+    def __init__(self):
+        self.providers: Dict[str, Dict[str, int]] = {}
+
+    def record(self, provider: str, usage: Dict[str, int]):
+        """
+        Add the usage of one call
+
+        Args:
+            provider: Provider name
+            usage: Output of extract_usage()
+        """
+        if not usage:
+            return
+        stats = self.providers.setdefault(provider, {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0})
+        stats["calls"] += 1
+        stats["prompt_tokens"] += usage["prompt_tokens"]
+        stats["cached_tokens"] += usage["cached_tokens"]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            provider: {
+                **stats,
+                "cache_hit_rate": round(stats["cached_tokens"] / stats["prompt_tokens"], 4) if stats["prompt_tokens"] else 0.0
+            }
+            for provider, stats in self.providers.items()
+        }
+
+
+# Global stats
+_prompt_cache_stats = None
+
+def get_prompt_cache_stats() -> PromptCacheStats:
+    """Get global prompt cache counters"""
+    global _prompt_cache_stats
+    if _prompt_cache_stats is None:
+        _prompt_cache_stats = PromptCacheStats()
+    return _prompt_cache_stats
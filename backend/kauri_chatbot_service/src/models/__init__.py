@@ -1,7 +1,7 @@
 """
 Models package - SQLAlchemy models for database persistence
 """
-from src.models.database import Base, engine, get_db, SessionLocal
+from src.models.database import Base, engine, get_db, SessionLocal, async_engine, get_async_db, AsyncSessionLocal
 from src.models.conversation import Conversation
 from src.models.message import Message
 from src.models.conversation_tag import ConversationTag
@@ -11,6 +11,9 @@ __all__ = [
     "engine",
     "get_db",
     "SessionLocal",
+    "async_engine",
+    "get_async_db",
+    "AsyncSessionLocal",
     "Conversation",
     "Message",
     "ConversationTag"
@@ -3,7 +3,7 @@ Conversation model for storing user conversation threads
 """
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Boolean, Index
+from sqlalchemy import Column, String, Integer, DateTime, Boolean, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from src.models.database import Base
@@ -26,23 +26,27 @@ class Conversation(Base):
     # Advanced features
     is_archived = Column(Boolean, default=False, nullable=False)
     extra_data = Column("metadata", JSONB, default=dict, nullable=True)  # Renamed to avoid SQLAlchemy conflict
+    total_tokens = Column(Integer, default=0, server_default="0", nullable=False)  # Running sum of token_count of non-deleted messages
+    message_count = Column(Integer, default=0, server_default="0", nullable=False)  # Non-deleted messages, maintained on save/delete
 
     # Relationships
     messages = relationship(
         "Message",
         back_populates="conversation",
         cascade="all, delete-orphan",
+        passive_deletes=True,  # ON DELETE CASCADE in the database
         order_by="Message.created_at"
     )
     tags = relationship(
         "ConversationTag",
         back_populates="conversation",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
 
     # Indexes for performance
     __table_args__ = (
-        Index('idx_conversation_user_updated', 'user_id', 'updated_at'),
+        Index('idx_conversation_user_updated', 'user_id', 'updated_at'),  # Listing / keyset pagination
         Index('idx_conversation_user_archived', 'user_id', 'is_archived'),
     )
 
@@ -59,5 +63,6 @@ class Conversation(Base):
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
             "is_archived": self.is_archived,
             "metadata": self.extra_data,
-            "message_count": len(self.messages) if self.messages else 0
+            "total_tokens": self.total_tokens,
+            "message_count": self.message_count
         }
@@ -1,7 +1,13 @@
 """
 Database configuration and session management
+- Async engine (asyncpg) for request handlers: conversations and messages
+- Sync engine (psycopg2) for maintenance tasks and admin reports
 """
-from sqlalchemy import create_engine
+from typing import Any, AsyncGenerator, Dict
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from src.config import settings
@@ -18,6 +24,24 @@ engine = create_engine(
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Create async engine (same database, asyncpg driver)
+async_engine = create_async_engine(
+    make_url(settings.database_url).set(drivername="postgresql+asyncpg"),
+    pool_pre_ping=True,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    echo=settings.debug
+)
+
+# Create async session factory
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False
+)
+
 # Base class for models
 Base = declarative_base()
 
@@ -32,3 +56,66 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for FastAPI to get an async database session
+    Yields a session and ensures it's closed after use
+    """
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+async def close_async_db():
+    """
+    Close async database connections
+    """
+    await async_engine.dispose()
+
+
+class PoolStats:
+    """Checkout counts and connection hold times of the async pool"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.total_hold_time = 0.0
+        self.max_hold_time = 0.0
+
+    def checked_out(self, connection_record):
+        self.checkouts += 1
+        connection_record.info["checked_out_at"] = time.monotonic()
+
+    def checked_in(self, connection_record):
+        started = connection_record.info.pop("checked_out_at", None)
+        if started is None:
+            return
+        held = time.monotonic() - started
+        self.total_hold_time += held
+        self.max_hold_time = max(self.max_hold_time, held)
+
+    def get_stats(self) -> Dict[str, Any]:
+        pool = async_engine.pool
+        return {
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "max_overflow": settings.db_max_overflow,
+            "checkouts": self.checkouts,
+            "avg_hold_ms": round(self.total_hold_time / self.checkouts * 1000, 1) if self.checkouts else 0.0,
+            "max_hold_ms": round(self.max_hold_time * 1000, 1)
+        }
+
+
+pool_stats = PoolStats()
+
+
+@event.listens_for(async_engine.sync_engine, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    pool_stats.checked_out(connection_record)
+
+
+@event.listens_for(async_engine.sync_engine, "checkin")
+def _on_checkin(dbapi_connection, connection_record):
+    pool_stats.checked_in(connection_record)
@@ -3,7 +3,7 @@ Message model for storing individual messages in conversations
 """
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, CheckConstraint, Index
+from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from src.models.database import Base
@@ -29,6 +29,7 @@ class Message(Base):
     # RAG-specific fields
     sources = Column(JSONB, default=list, nullable=True)  # List of source documents
     extra_data = Column("metadata", JSONB, default=dict, nullable=True)  # model_used, tokens, latency, intent_type, etc.
+    token_count = Column(Integer, nullable=True)  # Context tokens (role + content + source titles), computed once at save time
 
     # User feedback (only for assistant messages)
     user_feedback = Column(JSONB, default=dict, nullable=True)  # {"rating": "positive"|"negative", "comment": str, "feedback_at": timestamp}
@@ -63,6 +64,7 @@ class Message(Base):
             "sources": self.sources,
             "metadata": self.extra_data,
             "user_feedback": self.user_feedback,
+            "token_count": self.token_count,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "deleted_at": self.deleted_at.isoformat() if self.deleted_at else None
         }
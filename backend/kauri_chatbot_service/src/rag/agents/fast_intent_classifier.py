@@ -0,0 +1,300 @@
+"""
+Fast Intent Classifier - Classification locale sans appel LLM
+Premier étage devant IntentClassifierAgent :
+1. Références juridiques précises (LegalReferenceParser) -> legal_reference_search
+2. kNN sur des requêtes exemples étiquetées (embeddings BGE-M3 déjà chargés)
+Les requêtes ambiguës sont laissées au LLM.
+"""
+from typing import Dict, Any, List, Optional
+from dataclasses import dataclass
+import asyncio
+import random
+import re
+import numpy as np
+import structlog
+
+from src.config import settings
+from src.utils.executors import run_blocking
+from .intent_classifier import IntentClassification, LegalMetadata
+
+logger = structlog.get_logger()
+
+FAST_PATH_MODEL = "local/intent_fast_path"
+
+# (intent_type, direct_answer, exemplar queries)
+# document_sourcing exemplars are never routed locally (keywords must be
+# extracted by the LLM); they keep sourcing-like queries away from rag_query.
+INTENT_EXEMPLARS = [
+    ("general_conversation",
+     "Bonjour ! Je suis KAURI, ton assistant spécialisé en comptabilité OHADA. "
+     "Pose-moi tes questions sur le SYSCOHADA, les Actes Uniformes, les écritures comptables ou les états financiers.",
+     ["Bonjour", "Bonsoir", "Salut", "Hello", "Coucou", "Bonjour KAURI", "Salut, ça va ?", "Bonjour, comment vas-tu ?"]),
+    ("general_conversation",
+     "Avec plaisir ! N'hésite pas si tu as d'autres questions sur la comptabilité OHADA.",
+     ["Merci", "Merci beaucoup", "Merci pour ta réponse", "Super, merci !", "Parfait, merci", "Je te remercie", "Merci, c'est clair"]),
+    ("general_conversation",
+     "Je suis KAURI, un assistant spécialisé en comptabilité OHADA. Je peux t'expliquer le SYSCOHADA, "
+     "les Actes Uniformes, les traitements comptables et la préparation des états financiers, en citant ma documentation.",
+     ["Qui es-tu ?", "Que peux-tu faire ?", "Quel est ton rôle ?", "Tu sers à quoi ?", "Présente-toi",
+      "Comment peux-tu m'aider ?", "Qu'est-ce que KAURI ?"]),
+    ("clarification",
+     "Ma spécialité est la comptabilité OHADA. Pour t'aider efficacement, pose-moi une question sur le SYSCOHADA, "
+     "les Actes Uniformes ou les traitements comptables.",
+     ["Parle-moi du football", "Quel temps fait-il aujourd'hui ?", "Qui va gagner les élections ?",
+      "Donne-moi une recette de cuisine", "Raconte-moi une blague", "Quel film regarder ce soir ?"]),
+    ("clarification",
+     None,
+     ["Qu'est-ce que c'est ?", "Peux-tu m'expliquer ?", "Et ça ?", "Je ne comprends pas", "C'est quoi ?", "Explique"]),
+    ("rag_query",
+     None,
+     ["C'est quoi un amortissement ?", "Comment comptabiliser une créance douteuse ?",
+      "Comment calculer la dotation aux amortissements ?", "Qu'est-ce qu'une provision pour risques ?",
+      "Comment enregistrer une facture d'achat de marchandises ?", "Quelle est la différence entre charge et immobilisation ?",
+      "Comment comptabiliser les stocks en fin d'exercice ?", "Qu'est-ce que le bilan en SYSCOHADA ?",
+      "Comment traiter les écarts de conversion ?", "Comment comptabiliser un crédit-bail ?",
+      "Quels sont les états financiers annuels obligatoires ?", "Comment enregistrer la TVA collectée ?"]),
+    ("document_sourcing",
+     None,
+     ["Dans quels documents parle-t-on des amortissements ?", "Quels documents traitent des stocks ?",
+      "Où puis-je trouver des infos sur les provisions ?", "Liste-moi les actes uniformes sur le droit commercial",
+      "Existe-t-il une jurisprudence sur la comptabilité des stocks ?", "Quelles sources parlent du crédit-bail ?"]),
+    ("case_law_research",
+     None,
+     ["Jurisprudence de la CCJA sur les amortissements", "Décisions de justice concernant les stocks",
+      "Arrêts sur la comptabilisation des provisions", "Jurisprudence sur les créances douteuses",
+      "Que disent les tribunaux sur le crédit-bail ?", "Décisions de la CCJA en matière de comptabilité"]),
+]
+
+# Intents the kNN stage may decide alone (the others need LLM-extracted fields)
+KNN_INTENTS = ("general_conversation", "clarification", "rag_query", "case_law_research")
+
+# Parser stage: precise references in a short query, without sourcing wording
+PRECISE_REFERENCE_TYPES = ("article", "compte", "classe", "jurisprudence")
+SOURCING_CUES = re.compile(
+    r"(quel(?:le)?s?\s+(?:documents?|sources?|textes?)|où\s+(?:puis-je\s+)?trouver|existe-t-il|liste|dans\s+quels?)",
+    re.IGNORECASE
+)
+MAX_REFERENCE_QUERY_WORDS = 10
+
+
+@dataclass
+class LocalPrediction:
+    """Prédiction locale (acceptée ou simple estimation pour les métriques)"""
+    intent_type: str
+    confidence: float
+    stage: str  # "reference_parser" | "knn"
+    accepted: bool
+    similarity: float = 0.0
+    direct_answer: Optional[str] = None
+    legal_metadata: Optional[LegalMetadata] = None
+
+    def to_classification(self) -> IntentClassification:
+        return IntentClassification(
+            intent_type=self.intent_type,
+            confidence=self.confidence,
+            reasoning=f"Local fast path ({self.stage}, similarity={self.similarity:.2f})",
+            direct_answer=self.direct_answer,
+            legal_metadata=self.legal_metadata
+        )
+
+
+class FastIntentClassifier:
+    """
+    Classifieur d'intention local (aucun appel réseau)
+
+    Seuils : INTENT_FAST_PATH_MIN_SIMILARITY (similarité du plus proche
+    exemple) et INTENT_FAST_PATH_MIN_VOTE (part des k voisins d'accord).
+    """
+
+    def __init__(self, reference_parser):
+        """
+        Args:
+            reference_parser: LegalReferenceParser partagé avec le classifieur LLM
+        """
+        self.reference_parser = reference_parser
+        self.k = settings.intent_fast_path_k
+        self.min_similarity = settings.intent_fast_path_min_similarity
+        self.min_vote = settings.intent_fast_path_min_vote
+        self.shadow_rate = settings.intent_fast_path_shadow_rate
+
+        self._labels: List[str] = []
+        self._answers: List[Optional[str]] = []
+        self._texts: List[str] = []
+        for intent_type, direct_answer, queries in INTENT_EXEMPLARS:
+            for query in queries:
+                self._labels.append(intent_type)
+                self._answers.append(direct_answer)
+                self._texts.append(query)
+        self._vectors: Optional[np.ndarray] = None
+        self._init_lock = asyncio.Lock()
+
+        # Metrics
+        self.lookups = 0
+        self.hits_by_stage = {"reference_parser": 0, "knn": 0}
+        self.hits_by_intent: Dict[str, int] = {}
+        self.shadow_checks = 0
+        self.shadow_agreements = 0
+        self.fallthrough_checks = 0
+        self.fallthrough_agreements = 0
+
+    async def predict(self, query: str) -> Optional[LocalPrediction]:
+        """
+        Classify locally
+
+        Args:
+            query: User question
+
+        Returns:
+            Prediction (accepted=True when the LLM can be skipped), or None
+            if no estimate is available
+        """
+        self.lookups += 1
+
+        prediction = self._predict_from_references(query)
+        if prediction is None:
+            prediction = await self._predict_from_exemplars(query)
+
+        if prediction is not None and prediction.accepted:
+            self.hits_by_stage[prediction.stage] += 1
+            self.hits_by_intent[prediction.intent_type] = self.hits_by_intent.get(prediction.intent_type, 0) + 1
+            logger.info("intent_fast_path_hit",
+                       query=query[:100],
+                       intent_type=prediction.intent_type,
+                       stage=prediction.stage,
+                       similarity=round(prediction.similarity, 3),
+                       confidence=round(prediction.confidence, 3))
+
+        return prediction
+
+    def _predict_from_references(self, query: str) -> Optional[LocalPrediction]:
+        if len(query.split()) > MAX_REFERENCE_QUERY_WORDS or SOURCING_CUES.search(query):
+            return None
+
+        references = [
+            ref for ref in self.reference_parser.parse(query)
+            if ref.reference_type in PRECISE_REFERENCE_TYPES
+        ]
+        if not references:
+            return None
+
+        return LocalPrediction(
+            intent_type="legal_reference_search",
+            confidence=0.9,
+            stage="reference_parser",
+            accepted=True,
+            similarity=1.0,
+            legal_metadata=LegalMetadata(
+                document_type=self.reference_parser.extract_document_type(query),
+                legal_references=[ref.normalized for ref in references],
+                jurisdiction=self.reference_parser.extract_jurisdiction(query),
+                search_scope="exact"
+            )
+        )
+
+    async def _predict_from_exemplars(self, query: str) -> Optional[LocalPrediction]:
+        from src.rag.embedder.bge_embedder import get_embedder
+
+        try:
+            await self._ensure_exemplars()
+            vector = np.asarray(await get_embedder().aembed_text(query), dtype=np.float32)
+        except Exception as e:
+            logger.warning("intent_fast_path_embedding_failed", error=str(e))
+            return None
+
+        scores = self._vectors @ vector
+        neighbours = np.argsort(-scores)[:self.k]
+        best = int(neighbours[0])
+        intent_type = self._labels[best]
+
+        # Similarity-weighted vote of the k nearest exemplars
+        total = float(scores[neighbours].clip(min=0).sum())
+        agreeing = float(sum(max(scores[i], 0.0) for i in neighbours if self._labels[i] == intent_type))
+        vote = agreeing / total if total > 0 else 0.0
+
+        similarity = float(scores[best])
+        accepted = (
+            intent_type in KNN_INTENTS
+            and similarity >= self.min_similarity
+            and vote >= self.min_vote
+        )
+
+        legal_metadata = None
+        if intent_type == "case_law_research":
+            legal_metadata = LegalMetadata(
+                document_type="jurisprudence",
+                jurisdiction=self.reference_parser.extract_jurisdiction(query),
+                search_scope="broad"
+            )
+
+        return LocalPrediction(
+            intent_type=intent_type,
+            confidence=round(vote * similarity, 3),
+            stage="knn",
+            accepted=accepted,
+            similarity=similarity,
+            direct_answer=self._answers[best],
+            legal_metadata=legal_metadata
+        )
+
+    async def _ensure_exemplars(self):
+        """Embed the exemplar queries once (off the event loop)"""
+        if self._vectors is not None:
+            return
+        async with self._init_lock:
+            if self._vectors is None:
+                from src.rag.embedder.bge_embedder import get_embedder
+                vectors = await run_blocking(get_embedder().embed_batch, self._texts)
+                self._vectors = np.asarray(vectors, dtype=np.float32)
+                logger.info("intent_fast_path_exemplars_embedded", count=len(self._texts))
+
+    def should_shadow(self) -> bool:
+        """Whether to also ask the LLM for an accepted prediction (agreement sampling)"""
+        return self.shadow_rate > 0 and random.random() < self.shadow_rate
+
+    def record_agreement(self, query: str, prediction: LocalPrediction, llm_intent_type: str, shadow: bool):
+        """
+        Compare a local prediction with the LLM classification
+
+        Args:
+            query: User question
+            prediction: Local prediction
+            llm_intent_type: Intent returned by the LLM
+            shadow: True for sampled accepted predictions, False for
+                fall-through estimates (below thresholds)
+        """
+        agreed = prediction.intent_type == llm_intent_type
+        if shadow:
+            self.shadow_checks += 1
+            self.shadow_agreements += agreed
+        else:
+            self.fallthrough_checks += 1
+            self.fallthrough_agreements += agreed
+
+        if not agreed:
+            logger.info("intent_fast_path_disagreement",
+                       query=query[:100],
+                       local_intent=prediction.intent_type,
+                       llm_intent=llm_intent_type,
+                       stage=prediction.stage,
+                       similarity=round(prediction.similarity, 3),
+                       accepted=prediction.accepted)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Fast-path hit rate and agreement with the LLM"""
+        hits = sum(self.hits_by_stage.values())
+        return {
+            "lookups": self.lookups,
+            "hits": hits,
+            "hit_rate": round(hits / self.lookups, 4) if self.lookups else 0.0,
+            "hits_by_stage": dict(self.hits_by_stage),
+            "hits_by_intent": dict(self.hits_by_intent),
+            "shadow_checks": self.shadow_checks,
+            "agreement_rate": round(self.shadow_agreements / self.shadow_checks, 4) if self.shadow_checks else None,
+            "fallthrough_checks": self.fallthrough_checks,
+            "fallthrough_agreement_rate": (
+                round(self.fallthrough_agreements / self.fallthrough_checks, 4) if self.fallthrough_checks else None
+            ),
+            "min_similarity": self.min_similarity,
+            "min_vote": self.min_vote,
+            "exemplars": len(self._texts)
+        }
@@ -0,0 +1,159 @@
+"""
+Intent Classification Cache - Résultats du classifieur LLM réutilisés
+Clé : texte normalisé de la requête + version du prompt du classifieur.
+La valeur contient toute la classification (legal_metadata, et pour
+document_sourcing le JSON des mots-clés dans direct_answer).
+"""
+from typing import Any, Awaitable, Callable, Dict, Optional
+from pathlib import Path
+import asyncio
+import hashlib
+import json
+import re
+import unicodedata
+import structlog
+
+from src.config import settings
+from src.utils.cache_backends import create_cache_backend
+from .intent_classifier import IntentClassification
+
+logger = structlog.get_logger()
+
+
+class IntentClassificationCache:
+    """
+    Cache des classifications LLM (backend mémoire ou Redis, TTL + LRU)
+
+    Les réponses de repli (échec LLM / JSON invalide) ne sont jamais
+    mises en cache.
+    """
+
+    WARM_CONCURRENCY = 4  # Classifications LLM simultanées pendant le warm-start
+
+    def __init__(self, prompt_version: str):
+        """
+        Args:
+            prompt_version: Version du prompt du classifieur (partie de la clé)
+        """
+        self.prompt_version = prompt_version
+        self.backend = create_cache_backend(
+            namespace="intent",
+            max_entries=settings.intent_cache_max_entries,
+            ttl=settings.intent_cache_ttl
+        )
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.warm_loaded = 0
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Minuscules, NFC, apostrophes unifiées, espaces et ponctuation finale supprimés"""
+        text = unicodedata.normalize("NFC", query).lower().replace("’", "'")
+        text = re.sub(r"\s+", " ", text).strip()
+        return re.sub(r"[\s!?.,;:…]+$", "", text)
+
+    def key(self, query: str) -> str:
+        raw = f"{self.prompt_version}\x00{self.normalize(query)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def get(self, query: str) -> Optional[tuple[IntentClassification, dict]]:
+        """
+        Look up a cached classification
+
+        Args:
+            query: User question
+
+        Returns:
+            Tuple (IntentClassification, llm_metadata) or None
+        """
+        value = await self.backend.get(self.key(query))
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        logger.info("intent_cache_hit",
+                   query=query[:100],
+                   intent_type=value["classification"]["intent_type"])
+        return IntentClassification(**value["classification"]), {
+            "model_used": value["model_used"],
+            "tokens_used": 0,
+            "cached": True
+        }
+
+    async def set(self, query: str, classification: IntentClassification, llm_metadata: dict):
+        """
+        Store an LLM classification
+
+        Args:
+            query: User question
+            classification: LLM classification
+            llm_metadata: model_used / tokens_used of the LLM call
+        """
+        await self.backend.set(self.key(query), {
+            "classification": classification.model_dump(mode="json"),
+            "model_used": llm_metadata.get("model_used")
+        })
+        self.stores += 1
+
+    async def warm_start(
+        self,
+        path: str,
+        classify: Callable[[str], Awaitable[tuple[IntentClassification, dict]]]
+    ):
+        """
+        Pre-fill the cache from a file of frequent queries
+
+        File format (JSON list): plain query strings, classified with the
+        LLM, or {"query": ..., "classification": {...}} objects loaded as is.
+
+        Args:
+            path: JSON file path
+            classify: LLM classification coroutine
+        """
+        try:
+            entries = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning("intent_cache_warm_file_unreadable", path=path, error=str(e))
+            return
+
+        semaphore = asyncio.Semaphore(self.WARM_CONCURRENCY)
+
+        async def warm(entry: Any):
+            query = entry if isinstance(entry, str) else entry.get("query")
+            if not query or await self.backend.get(self.key(query)) is not None:
+                return
+            try:
+                if isinstance(entry, dict) and entry.get("classification"):
+                    await self.set(
+                        query,
+                        IntentClassification(**entry["classification"]),
+                        {"model_used": entry.get("model_used", "warm_start")}
+                    )
+                else:
+                    async with semaphore:
+                        classification, llm_metadata = await classify(query)
+                    if llm_metadata.get("model_used") == "unknown":
+                        return  # Fallback result, not cached
+                    await self.set(query, classification, llm_metadata)
+                self.warm_loaded += 1
+            except Exception as e:
+                logger.warning("intent_cache_warm_entry_failed", query=str(query)[:100], error=str(e))
+
+        await asyncio.gather(*(warm(entry) for entry in entries))
+        logger.info("intent_cache_warmed", path=path, entries=len(entries), loaded=self.warm_loaded)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "stores": self.stores,
+            "warm_loaded": self.warm_loaded,
+            "prompt_version": self.prompt_version,
+            **self.backend.get_stats()
+        }
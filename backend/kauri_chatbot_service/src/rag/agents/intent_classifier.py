@@ -4,6 +4,8 @@ Utilise un LLM pour classifier l'intention et router vers le bon workflow
 Version enrichie avec classification juridique avancée
 """
 from typing import Literal, TypedDict, Optional
+import asyncio
+import hashlib
 import json
 from pydantic import BaseModel, Field
 import structlog
@@ -77,6 +79,13 @@ class IntentClassifierAgent:
         from .reference_parser import get_reference_parser
         self.reference_parser = get_reference_parser()
 
+        # Local first stage (reference parser + exemplar kNN), no network call
+        self.fast_classifier = None
+        if settings.intent_fast_path_enabled:
+            from .fast_intent_classifier import FastIntentClassifier
+            self.fast_classifier = FastIntentClassifier(self.reference_parser)
+        self._shadow_tasks: set = set()
+
         # System prompt for classification (enriched with legal intents)
         self.system_prompt = """Tu es un agent de classification d'intention pour KAURI, un assistant spécialisé en comptabilité OHADA.
 
@@ -176,7 +185,68 @@ Réponds UNIQUEMENT avec un objet JSON au format suivant (sans markdown, sans ba
   } (OPTIONNEL, uniquement si legal_reference_search ou case_law_research)
 }"""
 
+        # Cache of LLM classifications (key includes the classifier prompt version)
+        self.prompt_version = "{}:{}".format(
+            settings.prompt_version,
+            hashlib.sha256(f"{settings.llm_model}\x00{self.system_prompt}".encode("utf-8")).hexdigest()[:12]
+        )
+        self.cache = None
+        if settings.intent_cache_enabled:
+            from .intent_cache import IntentClassificationCache
+            self.cache = IntentClassificationCache(self.prompt_version)
+
     async def classify_intent(self, query: str) -> tuple[IntentClassification, dict]:
+        """
+        Classify user intent: local fast path for obvious queries, LLM otherwise
+
+        Args:
+            query: User question to classify
+
+        Returns:
+            Tuple of (IntentClassification, llm_metadata dict with model_used and tokens_used)
+        """
+        prediction = await self.fast_classifier.predict(query) if self.fast_classifier else None
+
+        if prediction is not None and prediction.accepted:
+            if self.fast_classifier.should_shadow():
+                # Sampled LLM check of the local decision (agreement rate), off the request path
+                task = asyncio.ensure_future(self._shadow_check(query, prediction))
+                self._shadow_tasks.add(task)
+                task.add_done_callback(self._shadow_tasks.discard)
+
+            from .fast_intent_classifier import FAST_PATH_MODEL
+            return prediction.to_classification(), {"model_used": FAST_PATH_MODEL, "tokens_used": 0}
+
+        if self.cache is not None:
+            cached = await self.cache.get(query)
+            if cached is not None:
+                return cached
+
+        result, llm_metadata = await self._classify_with_llm(query)
+        if llm_metadata.get("model_used") != "unknown":  # Not a fallback result
+            if prediction is not None:
+                self.fast_classifier.record_agreement(query, prediction, result.intent_type, shadow=False)
+            if self.cache is not None:
+                await self.cache.set(query, result, llm_metadata)
+        return result, llm_metadata
+
+    async def warm_cache(self, path: str):
+        """
+        Pre-fill the classification cache from a file of frequent queries
+
+        Args:
+            path: JSON file (see IntentClassificationCache.warm_start)
+        """
+        if self.cache is not None:
+            await self.cache.warm_start(path, self._classify_with_llm)
+
+    async def _shadow_check(self, query: str, prediction):
+        """Classify with the LLM and compare with an accepted local prediction"""
+        result, llm_metadata = await self._classify_with_llm(query)
+        if llm_metadata.get("model_used") != "unknown":
+            self.fast_classifier.record_agreement(query, prediction, result.intent_type, shadow=True)
+
+    async def _classify_with_llm(self, query: str) -> tuple[IntentClassification, dict]:
         """
         Classify user intent using LLM with enhanced legal reference parsing
 
@@ -2,7 +2,7 @@
 Legal Report Generator - Génère des rapports structurés professionnels
 Pour juristes et comptables dans l'espace OHADA
 """
-from typing import List, Dict, Any, Optional, Literal
+from typing import List, Dict, Any, Optional, Literal, AsyncGenerator
 from datetime import datetime
 import structlog
 from pydantic import BaseModel
@@ -81,7 +81,125 @@ class LegalReportGenerator:
                 metadata={"jurisdiction": jurisdiction}
             )
 
-        # Prepare context for LLM
+        system_prompt, user_prompt = self._jurisprudence_prompts(query, documents, jurisdiction)
+
+        llm_response = await self.llm_client.generate(
+            prompt=user_prompt,
+            system_prompt=system_prompt,
+            temperature=0.2,  # Factuel et précis
+            max_tokens=3000
+        )
+
+        report_content = llm_response["content"]
+
+        # Parse sections (simplified for now)
+        sections = self._parse_report_sections(report_content)
+
+        report = LegalReport(
+            report_type="jurisprudence",
+            title=f"Rapport Jurisprudentiel : {query[:80]}",
+            summary=self._extract_summary(report_content),
+            sections=sections,
+            total_sources=len(documents),
+            generated_at=datetime.now().isoformat(),
+            metadata={
+                "jurisdiction": jurisdiction,
+                "query": query,
+                "model_used": llm_response["model"],
+                "tokens_used": llm_response["tokens_used"]
+            }
+        )
+
+        logger.info("jurisprudence_report_generated",
+                   num_sections=len(sections),
+                   total_sources=len(documents))
+
+        return report
+
+    async def stream_jurisprudence_report(
+        self,
+        query: str,
+        documents: List[Dict[str, Any]],
+        jurisdiction: Optional[str] = None,
+        usage: Optional[Dict[str, Any]] = None
+    ) -> AsyncGenerator[str, None]:
+        """
+        Génère le rapport jurisprudentiel en streaming
+
+        Même prompt que generate_jurisprudence_report() ; le texte suit la
+        mise en forme de format_report_as_text() mais chaque section est
+        envoyée au fil de la génération (la section "Résumé Exécutif" tient
+        lieu de résumé, qui n'est connu qu'en fin de génération).
+
+        Args:
+            query: Question de l'utilisateur
+            documents: Jurisprudences trouvées (non vide)
+            jurisdiction: Juridiction filtrée (optionnel)
+            usage: Dict optionnel rempli avec l'usage rapporté par le LLM
+
+        Yields:
+            Fragments de texte du rapport
+        """
+        logger.info("streaming_jurisprudence_report",
+                   query=query[:100],
+                   num_documents=len(documents),
+                   jurisdiction=jurisdiction)
+
+        system_prompt, user_prompt = self._jurisprudence_prompts(query, documents, jurisdiction)
+
+        yield self._format_report_header(
+            title=f"Rapport Jurisprudentiel : {query[:80]}",
+            report_type="jurisprudence",
+            total_sources=len(documents),
+            generated_at=datetime.now().isoformat()
+        ) + "\n"  # Blank line before the body
+
+        held = ""            # Start of the current line, held while it may be a "## " heading
+        passthrough = False  # Current line is body text, sent as it arrives
+
+        async for chunk in self.llm_client.generate_stream(
+            prompt=user_prompt,
+            system_prompt=system_prompt,
+            temperature=0.2,
+            max_tokens=3000,
+            usage=usage
+        ):
+            out = []
+            for char in chunk:
+                if passthrough:
+                    out.append(char)
+                    passthrough = char != "\n"
+                    continue
+                held += char
+                if char == "\n":
+                    out.append(self._format_stream_line(held))
+                    held = ""
+                elif not held.startswith("## ") and not "## ".startswith(held):
+                    out.append(held)
+                    held = ""
+                    passthrough = True
+            if out:
+                yield "".join(out)
+
+        if held:
+            yield self._format_stream_line(held)
+
+        yield "\n" + self._format_report_footer()
+
+    def _format_stream_line(self, line: str) -> str:
+        """Section heading ("## ...") as in format_report_as_text, other lines unchanged"""
+        if line.startswith("## "):
+            title = line[3:].strip()
+            return f"\n{title.upper()}\n{'-' * 80}\n"
+        return line
+
+    def _jurisprudence_prompts(
+        self,
+        query: str,
+        documents: List[Dict[str, Any]],
+        jurisdiction: Optional[str] = None
+    ) -> tuple[str, str]:
+        """Prompts (système, utilisateur) du rapport jurisprudentiel"""
         context = self._format_documents_for_report(documents)
 
         # Generate structured analysis
@@ -131,38 +249,7 @@ CONTEXTE :
 
 Génère un rapport jurisprudentiel structuré selon le format demandé."""
 
-        llm_response = await self.llm_client.generate(
-            prompt=user_prompt,
-            system_prompt=system_prompt,
-            temperature=0.2,  # Factuel et précis
-            max_tokens=3000
-        )
-
-        report_content = llm_response["content"]
-
-        # Parse sections (simplified for now)
-        sections = self._parse_report_sections(report_content)
-
-        report = LegalReport(
-            report_type="jurisprudence",
-            title=f"Rapport Jurisprudentiel : {query[:80]}",
-            summary=self._extract_summary(report_content),
-            sections=sections,
-            total_sources=len(documents),
-            generated_at=datetime.now().isoformat(),
-            metadata={
-                "jurisdiction": jurisdiction,
-                "query": query,
-                "model_used": llm_response["model"],
-                "tokens_used": llm_response["tokens_used"]
-            }
-        )
-
-        logger.info("jurisprudence_report_generated",
-                   num_sections=len(sections),
-                   total_sources=len(documents))
-
-        return report
+        return system_prompt, user_prompt
 
     async def generate_reference_report(
         self,
@@ -481,13 +568,12 @@ Génère un rapport comparatif structuré."""
         output = []
 
         # Header
-        output.append("=" * 80)
-        output.append(report.title.upper())
-        output.append("=" * 80)
-        output.append(f"Généré le : {report.generated_at}")
-        output.append(f"Type : {report.report_type.title()}")
-        output.append(f"Sources : {report.total_sources}")
-        output.append("")
+        output.append(self._format_report_header(
+            title=report.title,
+            report_type=report.report_type,
+            total_sources=report.total_sources,
+            generated_at=report.generated_at
+        ))
 
         # Summary
         output.append("RÉSUMÉ")
@@ -503,12 +589,32 @@ Génère un rapport comparatif structuré."""
             output.append(section.content)
 
         output.append("")
-        output.append("=" * 80)
-        output.append("Fin du rapport")
-        output.append("=" * 80)
+        output.append(self._format_report_footer())
 
         return "\n".join(output)
 
+    def _format_report_header(
+        self,
+        title: str,
+        report_type: str,
+        total_sources: int,
+        generated_at: str
+    ) -> str:
+        """Report header block (title, date, type, number of sources)"""
+        return "\n".join([
+            "=" * 80,
+            title.upper(),
+            "=" * 80,
+            f"Généré le : {generated_at}",
+            f"Type : {report_type.title()}",
+            f"Sources : {total_sources}",
+            ""
+        ])
+
+    def _format_report_footer(self) -> str:
+        """Report footer block"""
+        return "\n".join(["=" * 80, "Fin du rapport", "=" * 80])
+
 
 # Singleton instance
 _report_generator_instance: Optional[LegalReportGenerator] = None
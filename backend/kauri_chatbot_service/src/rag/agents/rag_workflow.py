@@ -4,9 +4,11 @@ RAG Workflow with LangGraph - Orchestrates intent-based routing with conversatio
 from typing import TypedDict, Annotated, Literal, AsyncGenerator, Dict, Any, Optional
 from langgraph.graph import StateGraph, END
 from langgraph.graph.message import add_messages
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
 from src.rag.agents.intent_classifier import get_intent_classifier, IntentClassification
+from src.rag.agents.speculative_retrieval import SpeculativeRetrieval, get_speculation_stats
+from src.rag.pipeline.prompt_builder import CASE_LAW_INSTRUCTIONS
 from src.services.context_manager import context_manager
 from src.schemas.chat import SourceDocument
 from src.config import settings
@@ -18,7 +20,7 @@ class WorkflowState(TypedDict):
     """État du workflow RAG"""
     query: str
     conversation_id: str
-    db_session: Optional[Session]  # For context retrieval
+    db_session: Optional[AsyncSession]  # For context retrieval
     intent: IntentClassification | None
     conversation_context: list[Dict[str, Any]] | None  # Previous messages
     context_info: Dict[str, Any] | None  # Context limits info
@@ -28,6 +30,8 @@ class WorkflowState(TypedDict):
     metadata: Dict[str, Any]
     error: str | None
     requested_source_count: Optional[int]  # Explicitly requested number of sources
+    speculation: Optional[SpeculativeRetrieval]  # Retrieval started before classification (stream)
+    context_query: Optional[str]  # Query resolved with the conversation history (classification, retrieval)
 
 
 class RAGWorkflow:
@@ -120,7 +124,7 @@ class RAGWorkflow:
             if db and state["conversation_id"]:
                 # Load context
                 conv_id = uuid.UUID(state["conversation_id"]) if isinstance(state["conversation_id"], str) else state["conversation_id"]
-                conversation_context, context_info = context_manager.get_conversation_context(
+                conversation_context, context_info = await context_manager.get_conversation_context(
                     db=db,
                     conversation_id=conv_id,
                     include_current_query=True,
@@ -159,7 +163,9 @@ class RAGWorkflow:
         logger.info("workflow_node_classify_intent", query=state["query"][:100])
 
         try:
-            intent, llm_metadata = await self.intent_classifier.classify_intent(state["query"])
+            intent, llm_metadata = await self.intent_classifier.classify_intent(
+                state.get("context_query") or state["query"]
+            )
             state["intent"] = intent
             state["metadata"]["intent_type"] = intent.intent_type
             state["metadata"]["intent_confidence"] = intent.confidence
@@ -262,7 +268,7 @@ class RAGWorkflow:
             db = state.get("db_session")
             if db:
                 try:
-                    recent_source_dicts = context_manager.get_recent_sources(
+                    recent_source_dicts = await context_manager.get_recent_sources(
                         db=db,
                         conversation_id=conversation.id,
                         limit=settings.rag_max_documents
@@ -277,10 +283,9 @@ class RAGWorkflow:
             # Always perform retrieval for RAG intents
             logger.info("workflow_performing_new_retrieval")
             requested_count = state.get("requested_source_count")
-            documents = await self.rag_pipeline.hybrid_retriever.retrieve(
-                query=state["query"],
-                top_k=settings.rag_rerank_top_k,
-                use_reranking=True,
+            documents = await self._retrieve(
+                speculation=state.get("speculation"),
+                query=self._retrieval_query(state),
                 requested_count=requested_count
             )
 
@@ -289,7 +294,7 @@ class RAGWorkflow:
             state["metadata"]["retrieval_performed"] = True
 
             # Format document context
-            doc_context = self.rag_pipeline._format_context(documents)
+            doc_context = self.rag_pipeline._format_context(documents, report=state["metadata"])
             sources = self.rag_pipeline._convert_to_source_documents_enriched(documents)
 
             # Guarantee minimum sources by reusing recent ones if needed
@@ -303,26 +308,15 @@ class RAGWorkflow:
                     state["metadata"]["sources_padded_from_history"] = True
                 sources = merged_sources
 
-            # Prepare conversation context for LLM
-            conv_context_str = ""
-            if conversation_context:
-                conv_context_str = context_manager.format_context_for_llm(
-                    conversation_history=conversation_context,
-                    include_sources=True
-                )
-
-            # Generate response with context
-            system_prompt = self.rag_pipeline._prepare_system_prompt()
-
-            # Build enhanced prompt with conversation context
-            if conv_context_str:
-                user_prompt = f"{conv_context_str}\n{self.rag_pipeline._build_user_prompt(state['query'], doc_context)}"
-            else:
-                user_prompt = self.rag_pipeline._build_user_prompt(state["query"], doc_context)
+            # Generate response (conversation history sent as chat messages)
+            prompt = self.rag_pipeline._assemble_prompt(
+                state["query"],
+                doc_context,
+                conversation_history=conversation_context
+            )
 
             llm_response = await self.rag_pipeline.llm_client.generate(
-                prompt=user_prompt,
-                system_prompt=system_prompt,
+                **prompt,
                 temperature=0.3,
                 max_tokens=2000
             )
@@ -331,6 +325,8 @@ class RAGWorkflow:
             state["sources"] = sources
             state["metadata"]["model_used"] = llm_response["model"]
             state["metadata"]["tokens_used"] = llm_response["tokens_used"]
+            state["metadata"]["prompt_tokens"] = llm_response.get("prompt_tokens")
+            state["metadata"]["cached_tokens"] = llm_response.get("cached_tokens")
             state["metadata"]["conversation_context_used"] = len(conversation_context) > 0
 
         except Exception as e:
@@ -341,6 +337,41 @@ class RAGWorkflow:
 
         return state
 
+    @staticmethod
+    def _retrieval_query(state: WorkflowState) -> str:
+        """Search text: the context-resolved query when given, else the question"""
+        return state.get("context_query") or state["query"]
+
+    async def _retrieve(
+        self,
+        speculation: Optional[SpeculativeRetrieval],
+        query: str,
+        requested_count: Optional[int] = None
+    ) -> list[Dict[str, Any]]:
+        """
+        Hybrid retrieval for RAG handlers, served by the speculative
+        retrieval when it was started with the same parameters
+
+        Args:
+            speculation: In-flight speculative retrieval, if any
+            query: Search query
+            requested_count: Explicitly requested number of sources
+
+        Returns:
+            Retrieved documents
+        """
+        params = {
+            "query": query,
+            "top_k": settings.rag_rerank_top_k,
+            "use_reranking": True,
+            "requested_count": requested_count
+        }
+        if speculation is not None:
+            documents = await speculation.take(**params)
+            if documents is not None:
+                return documents
+        return await self.rag_pipeline.hybrid_retriever.retrieve(**params)
+
     def _merge_sources_with_history(
         self,
         primary_sources: list[SourceDocument],
@@ -444,21 +475,31 @@ Je suis spécialisé en comptabilité OHADA et je peux vous aider sur :
                     logger.warning("workflow_sourcing_json_parse_failed",
                                  direct_answer=str(intent.direct_answer)[:100],
                                  error=str(e))
-                    keywords = [state["query"]]
+                    keywords = [self._retrieval_query(state)]
             else:
-                keywords = [state["query"]]
+                keywords = [self._retrieval_query(state)]
 
             logger.info("workflow_sourcing_keywords_extracted", keywords=keywords, category_filter=category_filter)
 
-            # Retrieve documents for all keywords (more results for sourcing)
+            # Retrieve documents for all keywords (BM25 scores them in one batch);
+            # the speculative retrieval only matches when the query itself is the keyword
+            import time
+            retrieval_start = time.time()
             all_documents = []
-            for keyword in keywords:
-                documents = await self.rag_pipeline.hybrid_retriever.retrieve(
-                    query=keyword,
+            speculation = state.get("speculation")
+            if speculation is not None and keywords == [self._retrieval_query(state)]:
+                keyword_results = [await self._retrieve(speculation, keywords[0])]
+            else:
+                if speculation is not None:
+                    speculation.discard("sourcing_keywords")
+                keyword_results = await self.rag_pipeline.hybrid_retriever.retrieve_many(
+                    queries=keywords,
                     top_k=settings.rag_rerank_top_k,  # Use same limit as regular RAG
                     use_reranking=True
                 )
+            for documents in keyword_results:
                 all_documents.extend(documents)
+            state["metadata"]["retrieval_time_ms"] = int((time.time() - retrieval_start) * 1000)
 
             # Filter by category if specified
             if category_filter:
@@ -557,31 +598,17 @@ Je suis spécialisé en comptabilité OHADA et je peux vous aider sur :
         logger.info("workflow_node_legal_reference_search", query=state["query"][:100])
 
         try:
-            intent = state.get("intent")
-            legal_metadata = intent.legal_metadata if intent else None
-
-            if not legal_metadata or not legal_metadata.legal_references:
-                # Fallback to standard RAG if no references found
-                logger.warning("legal_reference_search_no_references_fallback_to_rag")
-                return await self._retrieve_and_generate_node(state)
-
-            # Extract first legal reference
-            ref_text = legal_metadata.legal_references[0]
-            logger.info("legal_reference_search_targeting", reference=ref_text)
-
-            # Parse reference
-            from src.rag.agents.reference_parser import get_reference_parser
-            parser = get_reference_parser()
-            parsed_refs = parser.parse(ref_text)
-
-            if not parsed_refs:
-                # Fallback if parsing fails
-                logger.warning("legal_reference_search_parse_failed_fallback")
+            target = self._parse_target_reference(state.get("intent"))
+            if target is None:
+                # Fallback to standard RAG if no usable reference
                 return await self._retrieve_and_generate_node(state)
+            ref_text, parsed_ref = target
 
-            # Retrieve by reference
+            # Retrieve by reference (the speculative hybrid retrieval is not used)
+            if state.get("speculation") is not None:
+                state["speculation"].discard("legal_reference_search")
             documents = await self.legal_retriever.retrieve_by_reference(
-                reference=parsed_refs[0],
+                reference=parsed_ref,
                 top_k=settings.rag_rerank_top_k
             )
 
@@ -592,16 +619,12 @@ Je suis spécialisé en comptabilité OHADA et je peux vous aider sur :
             state["metadata"]["target_reference"] = ref_text
 
             # Format document context
-            doc_context = self.rag_pipeline._format_context(documents)
+            doc_context = self.rag_pipeline._format_context(documents, report=state["metadata"])
             sources = self.rag_pipeline._convert_to_source_documents_enriched(documents)
 
             # Generate response
-            system_prompt = self.rag_pipeline._prepare_system_prompt()
-            user_prompt = self.rag_pipeline._build_user_prompt(state["query"], doc_context)
-
             llm_response = await self.rag_pipeline.llm_client.generate(
-                prompt=user_prompt,
-                system_prompt=system_prompt,
+                **self.rag_pipeline._assemble_prompt(state["query"], doc_context),
                 temperature=0.3,
                 max_tokens=2000
             )
@@ -610,6 +633,8 @@ Je suis spécialisé en comptabilité OHADA et je peux vous aider sur :
             state["sources"] = sources
             state["metadata"]["model_used"] = llm_response["model"]
             state["metadata"]["tokens_used"] = llm_response["tokens_used"]
+            state["metadata"]["prompt_tokens"] = llm_response.get("prompt_tokens")
+            state["metadata"]["cached_tokens"] = llm_response.get("cached_tokens")
 
             logger.info("workflow_legal_reference_search_complete",
                        num_documents=len(documents))
@@ -622,6 +647,37 @@ Je suis spécialisé en comptabilité OHADA et je peux vous aider sur :
 
         return state
 
+    def _parse_target_reference(self, intent: IntentClassification | None) -> Optional[tuple[str, Any]]:
+        """
+        First legal reference of the intent, parsed for LegalRetriever
+
+        Args:
+            intent: Intent classification
+
+        Returns:
+            Tuple (reference text, parsed reference), or None when the
+            request must fall back to standard RAG
+        """
+        legal_metadata = intent.legal_metadata if intent else None
+        if not legal_metadata or not legal_metadata.legal_references:
+            logger.warning("legal_reference_search_no_references_fallback_to_rag")
+            return None
+
+        # Extract first legal reference
+        ref_text = legal_metadata.legal_references[0]
+        logger.info("legal_reference_search_targeting", reference=ref_text)
+
+        from src.rag.agents.reference_parser import get_reference_parser
+        parsed_refs = get_reference_parser().parse(ref_text)
+        if not parsed_refs:
+            logger.warning("legal_reference_search_parse_failed_fallback")
+            return None
+
+        return ref_text, parsed_refs[0]
+
+    def _case_law_not_found_message(self, jurisdiction: Optional[str]) -> str:
+        return f"Je n'ai pas trouvé de jurisprudence{' de la ' + jurisdiction if jurisdiction else ''} sur ce sujet dans ma base de données."
+
     async def _case_law_research_node(self, state: WorkflowState) -> WorkflowState:
         """
         Node: Recherche jurisprudentielle approfondie
@@ -640,7 +696,7 @@ Je suis spécialisé en comptabilité OHADA et je peux vous aider sur :
 
             # Retrieve case law
             documents = await self.legal_retriever.retrieve_case_law(
-                topic=state["query"],
+                topic=self._retrieval_query(state),
                 jurisdiction=jurisdiction,
                 top_k=settings.rag_rerank_top_k
             )
@@ -652,34 +708,15 @@ Je suis spécialisé en comptabilité OHADA et je peux vous aider sur :
             state["metadata"]["jurisdiction_filter"] = jurisdiction
 
             if not documents:
-                state["answer"] = f"Je n'ai pas trouvé de jurisprudence{' de la ' + jurisdiction if jurisdiction else ''} sur ce sujet dans ma base de données."
+                state["answer"] = self._case_law_not_found_message(jurisdiction)
                 state["sources"] = []
                 state["metadata"]["no_results"] = True
                 return state
 
             # Format document context
-            doc_context = self.rag_pipeline._format_context(documents)
+            doc_context = self.rag_pipeline._format_context(documents, report=state["metadata"])
             sources = self.rag_pipeline._convert_to_source_documents_enriched(documents)
 
-            # Generate response with case law focus
-            system_prompt = self.rag_pipeline._prepare_system_prompt()
-            user_prompt = f"""{doc_context}
-
-QUESTION DE L'UTILISATEUR:
-{state["query"]}
-
-INSTRUCTIONS SPÉCIALES POUR RECHERCHE JURISPRUDENTIELLE:
-Tu réponds à une demande de recherche jurisprudentielle. Structure ta réponse ainsi :
-
-1. **Résumé** : Nombre et types de jurisprudences trouvées
-2. **Analyse par décision** : Pour chaque jurisprudence importante, indique :
-   - Le titre exact (juridiction, date, référence)
-   - Le principe juridique dégagé
-   - L'extrait pertinent
-3. **Synthèse** : Tendance jurisprudentielle générale sur le sujet
-
-Utilise UNIQUEMENT les titres exacts des sources (pas de [Document X]).
-"""
 
             # Check if legal report generation is enabled (Phase 2)
             if settings.enable_legal_reports and len(documents) >= settings.report_auto_generate_threshold:
@@ -702,10 +739,11 @@ Utilise UNIQUEMENT les titres exacts des sources (pas de [Document X]).
                 state["metadata"]["model_used"] = report.metadata.get("model_used")
                 state["metadata"]["tokens_used"] = report.metadata.get("tokens_used")
             else:
-                # Standard generation (existing logic)
+                # Standard generation with case law focus
                 llm_response = await self.rag_pipeline.llm_client.generate(
-                    prompt=user_prompt,
-                    system_prompt=system_prompt,
+                    **self.rag_pipeline._assemble_prompt(
+                        state["query"], doc_context, instructions=CASE_LAW_INSTRUCTIONS
+                    ),
                     temperature=0.3,
                     max_tokens=2500
                 )
@@ -713,6 +751,8 @@ Utilise UNIQUEMENT les titres exacts des sources (pas de [Document X]).
                 state["answer"] = llm_response["content"]
                 state["metadata"]["model_used"] = llm_response["model"]
                 state["metadata"]["tokens_used"] = llm_response["tokens_used"]
+                state["metadata"]["prompt_tokens"] = llm_response.get("prompt_tokens")
+                state["metadata"]["cached_tokens"] = llm_response.get("cached_tokens")
                 state["metadata"]["report_generated"] = False
 
             state["sources"] = sources
@@ -733,8 +773,9 @@ Utilise UNIQUEMENT les titres exacts des sources (pas de [Document X]).
         self,
         query: str,
         conversation_id: str,
-        db_session: Optional[Session] = None,
-        metadata: Dict[str, Any] | None = None
+        db_session: Optional[AsyncSession] = None,
+        metadata: Dict[str, Any] | None = None,
+        context_query: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Execute workflow and return final response
@@ -744,6 +785,8 @@ Utilise UNIQUEMENT les titres exacts des sources (pas de [Document X]).
             conversation_id: Conversation ID
             db_session: Optional database session for context retrieval
             metadata: Optional initial metadata
+            context_query: Context-resolved text (with conversation history) used for intent
+                classification and retrieval; the prompt keeps the bare query
 
         Returns:
             Dict with answer, sources, and metadata
@@ -762,7 +805,8 @@ Utilise UNIQUEMENT les titres exacts des sources (pas de [Document X]).
             "answer": None,
             "sources": None,
             "metadata": metadata or {},
-            "error": None
+            "error": None,
+            "context_query": context_query
         }
 
         # Run workflow
@@ -785,8 +829,9 @@ Utilise UNIQUEMENT les titres exacts des sources (pas de [Document X]).
         self,
         query: str,
         conversation_id: str,
-        db_session: Optional[Session] = None,
-        metadata: Dict[str, Any] | None = None
+        db_session: Optional[AsyncSession] = None,
+        metadata: Dict[str, Any] | None = None,
+        context_query: Optional[str] = None
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Execute workflow with streaming response generation
@@ -799,6 +844,8 @@ Utilise UNIQUEMENT les titres exacts des sources (pas de [Document X]).
             conversation_id: Conversation ID
             db_session: Optional database session for context retrieval
             metadata: Optional initial metadata
+            context_query: Context-resolved text (with conversation history) used for intent
+                classification and retrieval; the prompt keeps the bare query
 
         Yields:
             Dict with type, content, sources, metadata
@@ -816,7 +863,7 @@ Utilise UNIQUEMENT les titres exacts des sources (pas de [Document X]).
             try:
                 import uuid
                 conv_id = uuid.UUID(conversation_id) if isinstance(conversation_id, str) else conversation_id
-                conversation_context, context_info = context_manager.get_conversation_context(
+                conversation_context, context_info = await context_manager.get_conversation_context(
                     db=db_session,
                     conversation_id=conv_id,
                     include_current_query=True,
@@ -830,17 +877,45 @@ Utilise UNIQUEMENT les titres exacts des sources (pas de [Document X]).
                 conversation_context = []
                 context_info = None
 
-        # Step 1: Classify intent (same as regular workflow)
-        intent, intent_metadata = await self.intent_classifier.classify_intent(query)
+        # Step 1: Classify intent (same as regular workflow), with the hybrid
+        # retrieval of the context-resolved query started speculatively in parallel
+        retrieval_query = context_query or query
+        speculation = None
+        if settings.speculative_retrieval_enabled:
+            speculation = SpeculativeRetrieval(
+                self.rag_pipeline.hybrid_retriever,
+                get_speculation_stats(),
+                query=retrieval_query,
+                top_k=settings.rag_rerank_top_k,
+                use_reranking=True,
+                requested_count=(metadata or {}).get("requested_source_count")
+            )
+
+        try:
+            intent, intent_metadata = await self.intent_classifier.classify_intent(context_query or query)
+        except BaseException:
+            if speculation is not None:
+                speculation.discard("classification_failed")
+            raise
 
         logger.info("workflow_intent_classified_stream",
                    intent_type=intent.intent_type,
                    confidence=intent.confidence)
 
-        # Step 2: Route based on intent
-        if intent.intent_type == "general_conversation":
+        # Step 2: Route based on intent (a reference search without a usable
+        # reference is answered by the standard RAG stream)
+        route = intent.intent_type
+        target = None
+        if route == "legal_reference_search":
+            target = self._parse_target_reference(intent)
+            if target is None:
+                route = "rag_query"
+
+        if route == "general_conversation":
             # Direct response without retrieval
             logger.info("workflow_direct_response_stream")
+            if speculation is not None:
+                speculation.discard("general_conversation")
 
             # Send empty sources first
             yield {
@@ -857,11 +932,11 @@ Utilise UNIQUEMENT les titres exacts des sources (pas de [Document X]).
             if intent.direct_answer:
                 # Stream the direct answer from classifier
                 answer = intent.direct_answer
-                for char in answer:
-                    yield {
-                        "type": "token",
-                        "content": char
-                    }
+                # Precomputed text: one chunk (the SSE layer frames it)
+                yield {
+                    "type": "token",
+                    "content": answer
+                }
 
                 total_time = time.time() - start_time
                 yield {
@@ -911,7 +986,7 @@ Utilise UNIQUEMENT les titres exacts des sources (pas de [Document X]).
                     }
                 }
 
-        elif intent.intent_type == "rag_query":
+        elif route == "rag_query":
             # RAG pipeline with smart retrieval
             logger.info("workflow_rag_query_stream")
 
@@ -923,17 +998,13 @@ Utilise UNIQUEMENT les titres exacts des sources (pas de [Document X]).
             )
 
             retrieval_time = 0
+            context_report = {}
             if should_retrieve:
                 # Perform new retrieval
                 logger.info("workflow_stream_performing_new_retrieval")
                 retrieval_start = time.time()
-                requested_count = metadata.get("requested_source_count")
-                documents = await self.rag_pipeline.hybrid_retriever.retrieve(
-                    query=query,
-                    top_k=settings.rag_rerank_top_k,
-                    use_reranking=True,
-                    requested_count=requested_count
-                )
+                requested_count = (metadata or {}).get("requested_source_count")
+                documents = await self._retrieve(speculation, retrieval_query, requested_count)
                 retrieval_time = time.time() - retrieval_start
 
                 # Send sources first
@@ -949,10 +1020,12 @@ Utilise UNIQUEMENT les titres exacts des sources (pas de [Document X]).
                 }
 
                 # Prepare document context
-                doc_context = self.rag_pipeline._format_context(documents)
+                doc_context = self.rag_pipeline._format_context(documents, report=context_report)
             else:
                 # Use existing context without new retrieval
                 logger.info("workflow_stream_using_existing_context")
+                if speculation is not None:
+                    speculation.discard("follow_up_question_with_context")
                 yield {
                     "type": "sources",
                     "sources": [],
@@ -965,32 +1038,23 @@ Utilise UNIQUEMENT les titres exacts des sources (pas de [Document X]).
                 }
                 doc_context = ""
 
-            # Prepare conversation context for LLM
-            conv_context_str = ""
-            if conversation_context:
-                conv_context_str = context_manager.format_context_for_llm(
-                    conversation_history=conversation_context,
-                    include_sources=True
-                )
-
-            # Prepare prompts with conversation context
-            system_prompt = self.rag_pipeline._prepare_system_prompt()
-
-            # Build enhanced prompt with conversation context
-            if conv_context_str:
-                user_prompt = f"{conv_context_str}\n{self.rag_pipeline._build_user_prompt(query, doc_context)}"
-            else:
-                user_prompt = self.rag_pipeline._build_user_prompt(query, doc_context)
+            # Prepare prompts (conversation history sent as chat messages)
+            prompt = self.rag_pipeline._assemble_prompt(
+                query,
+                doc_context,
+                conversation_history=conversation_context
+            )
 
             # Stream generation
             generation_start = time.time()
             token_count = 0
+            usage = {}
 
             async for chunk in self.rag_pipeline.llm_client.generate_stream(
-                prompt=user_prompt,
-                system_prompt=system_prompt,
+                **prompt,
                 temperature=0.3,
-                max_tokens=2000
+                max_tokens=2000,
+                usage=usage
             ):
                 token_count += 1
                 yield {
@@ -1005,21 +1069,26 @@ Utilise UNIQUEMENT les titres exacts des sources (pas de [Document X]).
                 "type": "done",
                 "metadata": {
                     "conversation_id": conversation_id,
-                    "model_used": f"{settings.llm_provider}/{settings.llm_model}",
-                    "tokens_used": token_count,
+                    "model_used": usage.get("model", f"{settings.llm_provider}/{settings.llm_model}"),
+                    "tokens_used": usage.get("total_tokens", token_count),
+                    "prompt_tokens": usage.get("prompt_tokens"),
+                    "cached_tokens": usage.get("cached_tokens"),
                     "latency_ms": int(total_time * 1000),
                     "retrieval_time_ms": int(retrieval_time * 1000),
                     "generation_time_ms": int(generation_time * 1000),
                     "intent_type": "rag_query",
+                    **context_report,
                     "use_reranking": True,
                     "retrieval_performed": should_retrieve,
                     "conversation_context_used": len(conversation_context) > 0
                 }
             }
 
-        elif intent.intent_type == "clarification":
+        elif route == "clarification":
             # Ask for clarification
             logger.info("workflow_clarification_stream")
+            if speculation is not None:
+                speculation.discard("clarification")
 
             # Send empty sources
             yield {
@@ -1035,11 +1104,11 @@ Utilise UNIQUEMENT les titres exacts des sources (pas de [Document X]).
             # Use direct answer from classifier if available
             if intent.direct_answer:
                 answer = intent.direct_answer
-                for char in answer:
-                    yield {
-                        "type": "token",
-                        "content": char
-                    }
+                # Precomputed text: one chunk (the SSE layer frames it)
+                yield {
+                    "type": "token",
+                    "content": answer
+                }
 
                 total_time = time.time() - start_time
                 yield {
@@ -1068,11 +1137,11 @@ Je suis spécialisé en comptabilité OHADA et je peux vous aider sur :
 - Les traitements comptables
 - Les états financiers"""
 
-                for char in fallback_message:
-                    yield {
-                        "type": "token",
-                        "content": char
-                    }
+                # Precomputed text: one chunk (the SSE layer frames it)
+                yield {
+                    "type": "token",
+                    "content": fallback_message
+                }
 
                 total_time = time.time() - start_time
                 yield {
@@ -1084,7 +1153,7 @@ Je suis spécialisé en comptabilité OHADA et je peux vous aider sur :
                     }
                 }
 
-        elif intent.intent_type == "document_sourcing":
+        elif route == "document_sourcing":
             # Document sourcing mode
             logger.info("workflow_document_sourcing_stream")
 
@@ -1100,7 +1169,9 @@ Je suis spécialisé en comptabilité OHADA et je peux vous aider sur :
                 "answer": None,
                 "sources": None,
                 "metadata": metadata or {},
-                "error": None
+                "error": None,
+                "speculation": speculation,
+                "context_query": context_query
             }
 
             sourcing_state = await self._document_sourcing_node(initial_state)
@@ -1110,7 +1181,7 @@ Je suis spécialisé en comptabilité OHADA et je peux vous aider sur :
                 "type": "sources",
                 "sources": sourcing_state.get("sources", []),
                 "metadata": {
-                    "retrieval_time_ms": 0,
+                    "retrieval_time_ms": sourcing_state.get("metadata", {}).get("retrieval_time_ms", 0),
                     "num_sources": len(sourcing_state.get("sources", [])),
                     "sourcing_mode": True,
                     "categories_found": sourcing_state.get("metadata", {}).get("categories_found", [])
@@ -1119,11 +1190,11 @@ Je suis spécialisé en comptabilité OHADA et je peux vous aider sur :
 
             # Stream the formatted answer
             answer = sourcing_state.get("answer", "Aucun document trouvé.")
-            for char in answer:
-                yield {
-                    "type": "token",
-                    "content": char
-                }
+            # Precomputed text: one chunk (the SSE layer frames it)
+            yield {
+                "type": "token",
+                "content": answer
+            }
 
             total_time = time.time() - start_time
             yield {
@@ -1139,115 +1210,175 @@ Je suis spécialisé en comptabilité OHADA et je peux vous aider sur :
                 }
             }
 
-        elif intent.intent_type == "legal_reference_search":
+        elif route == "legal_reference_search":
             logger.info("workflow_legal_reference_stream")
+            ref_text, parsed_ref = target
+            if speculation is not None:
+                speculation.discard("legal_reference_search")
 
-            initial_state = {
-                "query": query,
-                "conversation_id": conversation_id,
-                "db_session": db_session,
-                "intent": intent,
-                "conversation_context": conversation_context,
-                "context_info": context_info.to_dict() if context_info else None,
-                "documents": None,
-                "answer": None,
-                "sources": None,
-                "metadata": metadata or {},
-                "error": None
-            }
-
-            reference_state = await self._legal_reference_search_node(initial_state)
-
-            sources = reference_state.get("sources", [])
-            meta = reference_state.get("metadata", {})
+            # Retrieve by reference, then send sources before generating
+            retrieval_start = time.time()
+            documents = await self.legal_retriever.retrieve_by_reference(
+                reference=parsed_ref,
+                top_k=settings.rag_rerank_top_k
+            )
+            retrieval_time = time.time() - retrieval_start
 
+            sources = self.rag_pipeline._convert_to_source_documents_enriched(documents)
             yield {
                 "type": "sources",
                 "sources": sources,
                 "metadata": {
-                    "retrieval_time_ms": meta.get("retrieval_time_ms", 0),
+                    "retrieval_time_ms": int(retrieval_time * 1000),
                     "num_sources": len(sources),
-                    "retrieval_type": meta.get("retrieval_type", "legal_reference_search"),
-                    "target_reference": meta.get("target_reference")
+                    "retrieval_type": "legal_reference_search",
+                    "target_reference": ref_text
                 }
             }
 
-            answer = reference_state.get("answer", "Aucune référence trouvée.")
-            for char in answer:
+            # Stream generation
+            context_report = {}
+            doc_context = self.rag_pipeline._format_context(documents, report=context_report)
+
+            generation_start = time.time()
+            token_count = 0
+            usage = {}
+
+            async for chunk in self.rag_pipeline.llm_client.generate_stream(
+                **self.rag_pipeline._assemble_prompt(query, doc_context),
+                temperature=0.3,
+                max_tokens=2000,
+                usage=usage
+            ):
+                token_count += 1
                 yield {
                     "type": "token",
-                    "content": char
+                    "content": chunk
                 }
 
+            generation_time = time.time() - generation_start
             total_time = time.time() - start_time
+
             yield {
                 "type": "done",
                 "metadata": {
                     "conversation_id": conversation_id,
                     "latency_ms": int(total_time * 1000),
+                    "retrieval_time_ms": int(retrieval_time * 1000),
+                    "generation_time_ms": int(generation_time * 1000),
                     "intent_type": "legal_reference_search",
-                    "num_sources": meta.get("num_sources", len(sources)),
-                    "target_reference": meta.get("target_reference"),
-                    "retrieval_type": meta.get("retrieval_type", "legal_reference_search"),
-                    "model_used": meta.get("model_used"),
-                    "tokens_used": meta.get("tokens_used")
+                    "num_sources": len(documents),
+                    "target_reference": ref_text,
+                    "retrieval_type": "legal_reference_search",
+                    "model_used": usage.get("model", f"{settings.llm_provider}/{settings.llm_model}"),
+                    "tokens_used": usage.get("total_tokens", token_count),
+                    "prompt_tokens": usage.get("prompt_tokens"),
+                    "cached_tokens": usage.get("cached_tokens"),
+                    **context_report
                 }
             }
 
-        elif intent.intent_type == "case_law_research":
+        elif route == "case_law_research":
             logger.info("workflow_case_law_stream")
+            if speculation is not None:
+                speculation.discard("case_law_research")
 
-            initial_state = {
-                "query": query,
-                "conversation_id": conversation_id,
-                "db_session": db_session,
-                "intent": intent,
-                "conversation_context": conversation_context,
-                "context_info": context_info.to_dict() if context_info else None,
-                "documents": None,
-                "answer": None,
-                "sources": None,
-                "metadata": metadata or {},
-                "error": None
-            }
+            legal_metadata = intent.legal_metadata
+            jurisdiction = legal_metadata.jurisdiction if legal_metadata else None
 
-            case_law_state = await self._case_law_research_node(initial_state)
-            sources = case_law_state.get("sources", [])
-            meta = case_law_state.get("metadata", {})
+            # Retrieve case law, then send sources before generating
+            retrieval_start = time.time()
+            documents = await self.legal_retriever.retrieve_case_law(
+                topic=retrieval_query,
+                jurisdiction=jurisdiction,
+                top_k=settings.rag_rerank_top_k
+            )
+            retrieval_time = time.time() - retrieval_start
 
+            sources = self.rag_pipeline._convert_to_source_documents_enriched(documents)
             yield {
                 "type": "sources",
                 "sources": sources,
                 "metadata": {
-                    "retrieval_time_ms": meta.get("retrieval_time_ms", 0),
+                    "retrieval_time_ms": int(retrieval_time * 1000),
                     "num_sources": len(sources),
-                    "retrieval_type": meta.get("retrieval_type", "case_law_research"),
-                    "jurisdiction_filter": meta.get("jurisdiction_filter")
+                    "retrieval_type": "case_law_research",
+                    "jurisdiction_filter": jurisdiction
                 }
             }
 
-            answer = case_law_state.get("answer", "Je n'ai trouvé aucune jurisprudence correspondante.")
-            for char in answer:
+            generation_start = time.time()
+            token_count = 0
+            usage = {}
+            context_report = {}
+            report_generated = False
+
+            if not documents:
                 yield {
                     "type": "token",
-                    "content": char
+                    "content": self._case_law_not_found_message(jurisdiction)
                 }
+            else:
+                # Structured report (sections streamed as generated) or standard answer
+                report_generated = (
+                    settings.enable_legal_reports
+                    and len(documents) >= settings.report_auto_generate_threshold
+                )
+                if report_generated:
+                    logger.info("generating_legal_report", num_documents=len(documents))
+
+                    from src.rag.agents.legal_report_generator import get_report_generator
+                    chunks = get_report_generator().stream_jurisprudence_report(
+                        query=query,
+                        documents=documents,
+                        jurisdiction=jurisdiction,
+                        usage=usage
+                    )
+                else:
+                    chunks = self.rag_pipeline.llm_client.generate_stream(
+                        **self.rag_pipeline._assemble_prompt(
+                            query,
+                            self.rag_pipeline._format_context(documents, report=context_report),
+                            instructions=CASE_LAW_INSTRUCTIONS
+                        ),
+                        temperature=0.3,
+                        max_tokens=2500,
+                        usage=usage
+                    )
 
+                async for chunk in chunks:
+                    token_count += 1
+                    yield {
+                        "type": "token",
+                        "content": chunk
+                    }
+
+            generation_time = time.time() - generation_start
             total_time = time.time() - start_time
+
             yield {
                 "type": "done",
                 "metadata": {
                     "conversation_id": conversation_id,
                     "latency_ms": int(total_time * 1000),
+                    "retrieval_time_ms": int(retrieval_time * 1000),
+                    "generation_time_ms": int(generation_time * 1000),
                     "intent_type": "case_law_research",
-                    "num_sources": meta.get("num_sources", len(sources)),
-                    "retrieval_type": meta.get("retrieval_type", "case_law_research"),
-                    "jurisdiction_filter": meta.get("jurisdiction_filter"),
-                    "model_used": meta.get("model_used"),
-                    "tokens_used": meta.get("tokens_used"),
-                    "report_generated": meta.get("report_generated", False),
-                    "report_type": meta.get("report_type")
+                    "num_sources": len(documents),
+                    "retrieval_type": "case_law_research",
+                    "jurisdiction_filter": jurisdiction,
+                    "model_used": usage.get("model", f"{settings.llm_provider}/{settings.llm_model}") if documents else None,
+                    "tokens_used": usage.get("total_tokens", token_count) if documents else None,
+                    "prompt_tokens": usage.get("prompt_tokens"),
+                    "cached_tokens": usage.get("cached_tokens"),
+                    "report_generated": report_generated,
+                    "report_type": "jurisprudence" if report_generated else None,
+                    "no_results": not documents,
+                    **context_report
                 }
             }
 
+        if speculation is not None:
+            speculation.discard(intent.intent_type)
+
         logger.info("workflow_execute_stream_complete", intent_type=intent.intent_type)
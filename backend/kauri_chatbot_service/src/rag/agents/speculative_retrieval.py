@@ -0,0 +1,134 @@
+"""
+Speculative retrieval
+Hybrid retrieval for the raw query is started while the intent is still
+being classified; RAG handlers consume the result, other intents cancel it.
+"""
+from typing import List, Dict, Any, Optional
+import asyncio
+import time
+import structlog
+
+logger = structlog.get_logger()
+
+
+class SpeculationStats:
+    """Outcome counters of speculative retrievals (waste rate)"""
+
+    def __init__(self):
+        self.launched = 0
+        self.used = 0
+        self.cancelled = 0   # Discarded while still running
+        self.wasted = 0      # Discarded after completing
+        self.failed = 0
+        self.total_saved = 0.0
+        self.total_wasted = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        discarded = self.cancelled + self.wasted
+        return {
+            "launched": self.launched,
+            "used": self.used,
+            "cancelled": self.cancelled,
+            "wasted": self.wasted,
+            "failed": self.failed,
+            "waste_rate": round(discarded / self.launched, 4) if self.launched else 0.0,
+            "avg_saved_ms": round(self.total_saved / self.used * 1000, 2) if self.used else 0.0,
+            "total_wasted_ms": round(self.total_wasted * 1000, 2)
+        }
+
+
+class SpeculativeRetrieval:
+    """
+    One in-flight hybrid retrieval started before the intent is known
+
+    The result is only handed out to a caller asking for exactly the same
+    retrieval parameters; anything else must call discard().
+    """
+
+    def __init__(self, hybrid_retriever, stats: SpeculationStats, **params):
+        """
+        Args:
+            hybrid_retriever: HybridRetriever instance
+            stats: Shared outcome counters
+            **params: HybridRetriever.retrieve() arguments
+        """
+        self.params = params
+        self.stats = stats
+        self.started_at = time.perf_counter()
+        self.finished_at: Optional[float] = None
+        self.settled = False
+
+        self.task = asyncio.ensure_future(hybrid_retriever.retrieve(**params))
+        self.task.add_done_callback(self._on_done)
+        stats.launched += 1
+
+    def _on_done(self, task: asyncio.Task):
+        self.finished_at = time.perf_counter()
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("speculative_retrieval_failed", error=str(task.exception()))
+
+    async def take(self, **params) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the speculative result
+
+        Args:
+            **params: Retrieval arguments of the caller
+
+        Returns:
+            Documents, or None if the parameters differ or the retrieval
+            failed (the caller then retrieves normally)
+        """
+        if self.settled:
+            return None
+        if params != self.params:
+            self.discard("parameters_mismatch")
+            return None
+
+        self.settled = True
+        requested_at = time.perf_counter()
+        try:
+            documents = await self.task
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.stats.failed += 1
+            return None
+
+        # Head start = retrieval time already elapsed when the handler asked for it
+        saved = min(requested_at, self.finished_at or requested_at) - self.started_at
+        self.stats.used += 1
+        self.stats.total_saved += saved
+        logger.info("speculative_retrieval_used", saved_ms=int(saved * 1000))
+        return documents
+
+    def discard(self, reason: str):
+        """
+        Drop the speculative retrieval (cancelled if still running)
+
+        Args:
+            reason: Why it is not used (intent type, ...)
+        """
+        if self.settled:
+            return
+        self.settled = True
+
+        if self.task.done():
+            self.stats.wasted += 1
+            self.stats.total_wasted += (self.finished_at or time.perf_counter()) - self.started_at
+        else:
+            self.task.cancel()
+            self.stats.cancelled += 1
+            self.stats.total_wasted += time.perf_counter() - self.started_at
+
+        logger.info("speculative_retrieval_discarded", reason=reason)
+
+
+# Global stats
+_speculation_stats = None
+
+def get_speculation_stats() -> SpeculationStats:
+    """Get global speculative retrieval counters"""
+    global _speculation_stats
+    if _speculation_stats is None:
+        _speculation_stats = SpeculationStats()
+    return _speculation_stats
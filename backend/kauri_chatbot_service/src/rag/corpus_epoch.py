@@ -0,0 +1,68 @@
+"""
+Corpus epoch
+Version stamp of the ChromaDB corpus (bumped by ingest_documents.py when
+chunks are added or removed). Caches derived from the corpus tag their
+entries with it so that a new ingestion invalidates them.
+"""
+from typing import Optional
+import asyncio
+import time
+import structlog
+
+from ..config import settings
+from ..utils.executors import run_blocking
+
+logger = structlog.get_logger()
+
+
+class CorpusEpoch:
+    """
+    Current corpus version stamp, re-read from ChromaDB at most every
+    refresh_seconds (the check runs off the event loop)
+    """
+
+    def __init__(self, refresh_seconds: Optional[int] = None):
+        self.refresh_seconds = refresh_seconds if refresh_seconds is not None else settings.corpus_epoch_refresh_seconds
+        self.value: Optional[str] = None
+        self._checked_at = float("-inf")
+        self._refreshing: Optional[asyncio.Task] = None
+
+    async def current(self) -> Optional[str]:
+        """
+        Get the corpus epoch
+
+        Returns:
+            Version stamp, or None if ChromaDB could not be reached yet
+        """
+        if time.monotonic() - self._checked_at >= self.refresh_seconds:
+            # One refresh in flight at a time; concurrent callers share it
+            if self._refreshing is None or self._refreshing.done():
+                self._refreshing = asyncio.ensure_future(self.refresh())
+            await asyncio.shield(self._refreshing)
+        return self.value
+
+    async def refresh(self):
+        """Re-read the stamp from ChromaDB"""
+        from .vector_store.chroma_store import get_chroma_store
+
+        self._checked_at = time.monotonic()
+        try:
+            stamp = await run_blocking(get_chroma_store().get_version_stamp)
+        except Exception as e:
+            logger.warning("corpus_epoch_refresh_failed", error=str(e))
+            return
+
+        if stamp != self.value:
+            logger.info("corpus_epoch_changed", previous=self.value, current=stamp)
+            self.value = stamp
+
+
+# Global singleton
+_corpus_epoch = None
+
+def get_corpus_epoch() -> CorpusEpoch:
+    """Get global corpus epoch tracker"""
+    global _corpus_epoch
+    if _corpus_epoch is None:
+        _corpus_epoch = CorpusEpoch()
+    return _corpus_epoch
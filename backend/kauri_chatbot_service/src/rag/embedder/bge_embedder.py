@@ -3,10 +3,14 @@ BGE-M3 Embedder for semantic search
 """
 from typing import List, Union
 import numpy as np
+import threading
 import structlog
 from sentence_transformers import SentenceTransformer
 
 from ...config import settings
+from ...utils.executors import run_blocking
+from ..inference_scheduler import InferenceScheduler
+from .embedding_cache import EmbeddingCache
 
 logger = structlog.get_logger()
 
@@ -19,17 +23,28 @@ class BGEEmbedder:
     
     def __init__(self):
         self.model = None
+        self._load_lock = threading.Lock()  # Retrieval runs on several executor threads
         self.model_name = settings.embedding_model
         self.dimension = settings.embedding_dimension
         self.device = settings.embedding_device
+        self.scheduler = InferenceScheduler("embedder", self._encode_batch)
+        self.cache = EmbeddingCache(
+            model_name=self.model_name,
+            max_bytes=settings.embedding_cache_max_mb * 1024 * 1024,
+            shared_dir=settings.embedding_cache_shared_dir or None,
+            shared_ttl=settings.embedding_cache_ttl
+        ) if settings.embedding_cache_enabled else None
         logger.info("embedder_initialized_lazy", model=self.model_name)
     
     def _load_model(self):
         """Lazy load model on first use"""
-        if self.model is None:
-            logger.info("loading_embedding_model", model=self.model_name, device=self.device)
-            self.model = SentenceTransformer(self.model_name, device=self.device)
-            logger.info("embedding_model_loaded", model=self.model_name)
+        if self.model is not None:
+            return
+        with self._load_lock:
+            if self.model is None:
+                logger.info("loading_embedding_model", model=self.model_name, device=self.device)
+                self.model = SentenceTransformer(self.model_name, device=self.device)
+                logger.info("embedding_model_loaded", model=self.model_name)
     
     def embed_text(self, text: str, normalize: bool = True) -> List[float]:
         """
@@ -42,6 +57,12 @@ class BGEEmbedder:
         Returns:
             Embedding vector as list of floats
         """
+        use_cache = normalize and self.cache is not None
+        if use_cache:
+            cached = self.cache.get(text)
+            if cached is not None:
+                return cached.tolist()
+        
         self._load_model()
         
         embedding = self.model.encode(
@@ -50,8 +71,51 @@ class BGEEmbedder:
             show_progress_bar=False
         )
         
+        if use_cache:
+            self.cache.put(text, embedding)
+        
         return embedding.tolist()
     
+    async def aembed_text(self, text: str) -> List[float]:
+        """
+        Embed single text (normalized) without blocking the event loop
+        Concurrent calls are micro-batched into one model.encode
+        
+        Args:
+            text: Input text
+            
+        Returns:
+            Embedding vector as list of floats
+        """
+        # Memory tier on the loop, shared tier (np.load/np.save) on the executor
+        if self.cache is not None:
+            cached = self.cache.get_local(text)
+            if cached is None and self.cache.has_shared_tier:
+                cached = await run_blocking(self.cache.get_shared, text)
+            if cached is not None:
+                return cached.tolist()
+        
+        if settings.inference_batching_enabled:
+            (embedding,) = await self.scheduler.submit([text])
+        else:
+            (embedding,) = await run_blocking(self._encode_batch, [text])
+        
+        if self.cache is not None:
+            vector = self.cache.put_local(text, embedding)
+            if self.cache.has_shared_tier:
+                await run_blocking(self.cache.put_shared, text, vector)
+        return embedding.tolist()
+    
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        """Encode one micro-batch (runs on the retrieval executor)"""
+        self._load_model()
+        return self.model.encode(
+            texts,
+            normalize_embeddings=True,
+            batch_size=len(texts),
+            show_progress_bar=False
+        )
+    
     def embed_batch(
         self, 
         texts: List[str], 
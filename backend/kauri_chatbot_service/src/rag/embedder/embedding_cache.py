@@ -0,0 +1,246 @@
+"""
+Query embedding cache
+Bounded in-process LRU of float32 vectors, with an optional file tier
+(e.g. a directory under /dev/shm) shared by every worker on the host.
+"""
+from typing import Any, Dict, Optional
+from collections import OrderedDict
+from pathlib import Path
+import hashlib
+import os
+import re
+import threading
+import time
+import unicodedata
+import uuid
+import numpy as np
+import structlog
+
+logger = structlog.get_logger()
+
+
+class EmbeddingCache:
+    """
+    Size-aware LRU cache of query embeddings
+
+    Keys are the normalized query text plus the model name, so a model
+    change never serves stale vectors. Memory usage is bounded in bytes
+    (vectors are float32, 4 KB each for BGE-M3).
+    """
+
+    PRUNE_EVERY = 1000  # Shared-tier writes between expiry sweeps
+
+    def __init__(
+        self,
+        model_name: str,
+        max_bytes: int,
+        shared_dir: Optional[str] = None,
+        shared_ttl: Optional[int] = None
+    ):
+        """
+        Args:
+            model_name: Embedding model (part of the key)
+            max_bytes: Memory budget for cached vectors
+            shared_dir: Optional directory for the cross-worker tier
+            shared_ttl: Max age in seconds of shared entries
+        """
+        self.model_name = model_name
+        self.max_bytes = max_bytes
+        self.shared_dir = Path(shared_dir) if shared_dir else None
+        self.shared_ttl = shared_ttl
+
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self._shared_writes = 0
+
+        if self.shared_dir is not None:
+            try:
+                self.shared_dir.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                logger.warning("embedding_cache_shared_dir_unavailable", path=str(self.shared_dir), error=str(e))
+                self.shared_dir = None
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Unicode NFC + collapsed whitespace (embedding input is unchanged)"""
+        return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+    def key(self, text: str) -> str:
+        """Cache key for a query"""
+        raw = f"{self.model_name}\x00{self.normalize(text)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @property
+    def has_shared_tier(self) -> bool:
+        return self.shared_dir is not None
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """
+        Look up a query embedding (memory tier, then shared tier)
+
+        Args:
+            text: Query text
+
+        Returns:
+            Cached float32 vector or None
+        """
+        vector = self.get_local(text)
+        if vector is None and self.has_shared_tier:
+            vector = self.get_shared(text)
+        return vector
+
+    def get_local(self, text: str) -> Optional[np.ndarray]:
+        """
+        Look up a query embedding in the memory tier only (no file I/O,
+        safe to call on the event loop)
+
+        Args:
+            text: Query text
+
+        Returns:
+            Cached float32 vector or None
+        """
+        key = self.key(text)
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            elif not self.has_shared_tier:
+                self.misses += 1
+        return vector
+
+    def get_shared(self, text: str) -> Optional[np.ndarray]:
+        """
+        Look up a query embedding in the shared tier (file I/O: call from a
+        worker thread), promoting hits to the memory tier
+
+        Args:
+            text: Query text
+
+        Returns:
+            Cached float32 vector or None
+        """
+        key = self.key(text)
+        vector = self._read_shared(key)
+        with self._lock:
+            if vector is not None:
+                self.shared_hits += 1
+                self._insert(key, vector)
+            else:
+                self.misses += 1
+        return vector
+
+    def put(self, text: str, vector) -> np.ndarray:
+        """
+        Store a query embedding in both tiers
+
+        Args:
+            text: Query text
+            vector: Embedding (any array-like)
+
+        Returns:
+            The stored float32 vector
+        """
+        vector = self.put_local(text, vector)
+        self.put_shared(text, vector)
+        return vector
+
+    def put_local(self, text: str, vector) -> np.ndarray:
+        """
+        Store a query embedding in the memory tier only
+
+        Args:
+            text: Query text
+            vector: Embedding (any array-like)
+
+        Returns:
+            The stored float32 vector
+        """
+        vector = np.asarray(vector, dtype=np.float32)
+        vector.setflags(write=False)  # Shared between callers
+
+        with self._lock:
+            self._insert(self.key(text), vector)
+        return vector
+
+    def put_shared(self, text: str, vector: np.ndarray):
+        """Store a query embedding in the shared tier (file I/O: call from a worker thread)"""
+        self._write_shared(self.key(text), vector)
+
+    def _insert(self, key: str, vector: np.ndarray):
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.nbytes
+        self._entries[key] = vector
+        self._bytes += vector.nbytes
+
+        while self._bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+
+    def _shared_path(self, key: str) -> Path:
+        return self.shared_dir / f"{key}.npy"
+
+    def _read_shared(self, key: str) -> Optional[np.ndarray]:
+        if self.shared_dir is None:
+            return None
+        path = self._shared_path(key)
+        try:
+            if self.shared_ttl and time.time() - path.stat().st_mtime > self.shared_ttl:
+                path.unlink(missing_ok=True)
+                return None
+            vector = np.load(path)
+        except (OSError, ValueError):
+            return None
+        vector.setflags(write=False)
+        return vector
+
+    def _write_shared(self, key: str, vector: np.ndarray):
+        if self.shared_dir is None:
+            return
+        path = self._shared_path(key)
+        tmp_path = path.with_name(f".{key}.{uuid.uuid4().hex[:8]}.npy")
+        try:
+            np.save(tmp_path, vector)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("embedding_cache_shared_write_failed", error=str(e))
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        self._shared_writes += 1
+        if self.shared_ttl and self._shared_writes % self.PRUNE_EVERY == 0:
+            self._prune_shared()
+
+    def _prune_shared(self):
+        """Remove expired shared entries"""
+        cutoff = time.time() - self.shared_ttl
+        removed = 0
+        for path in self.shared_dir.glob("*.npy"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        logger.info("embedding_cache_shared_pruned", removed=removed)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and memory usage"""
+        lookups = self.hits + self.shared_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.shared_hits) / lookups, 4) if lookups else 0.0,
+            "shared_tier": str(self.shared_dir) if self.shared_dir else None
+        }
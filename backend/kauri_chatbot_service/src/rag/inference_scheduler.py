@@ -0,0 +1,178 @@
+"""
+Dynamic micro-batching for model inference
+Concurrent requests to the embedder / cross-encoder are collected for a
+short window and run as one padded batch on the retrieval executor.
+"""
+from typing import Any, Callable, Dict, List, Optional
+from dataclasses import dataclass, field
+import asyncio
+import time
+import structlog
+
+from ..config import settings
+from ..utils.executors import run_blocking
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class _PendingRequest:
+    items: List[Any]
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class InferenceScheduler:
+    """
+    Micro-batching queue in front of a model
+
+    A batch is closed when max_batch_size items are collected or the window
+    since the first request elapses, whichever comes first. One request may
+    carry several items (e.g. all query-document pairs of a rerank); its
+    results are returned in order.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: Optional[int] = None,
+        window_ms: Optional[float] = None
+    ):
+        """
+        Args:
+            name: Scheduler name (logs/metrics)
+            batch_fn: Blocking function mapping a list of items to results
+            max_batch_size: Max items per batch (default: from settings)
+            window_ms: Collection window in ms (default: from settings)
+        """
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size or settings.inference_max_batch_size
+        self.window = (window_ms if window_ms is not None else settings.inference_batch_window_ms) / 1000
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._queued_items = 0
+
+        # Metrics
+        self.batches = 0
+        self.items = 0
+        self.requests = 0
+        self.max_batch_seen = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    async def submit(self, items: List[Any]) -> List[Any]:
+        """
+        Queue items for the next batch
+
+        Args:
+            items: Model inputs (texts, pairs...)
+
+        Returns:
+            Model outputs, one per item
+        """
+        if not items:
+            return []
+
+        self._ensure_worker()
+        request = _PendingRequest(items=items, future=asyncio.get_running_loop().create_future())
+        self._queued_items += len(items)
+        await self._queue.put(request)
+        return await request.future
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._queued_items = 0
+            self._worker = asyncio.create_task(self._run())
+            logger.info(
+                "inference_scheduler_started",
+                scheduler=self.name,
+                max_batch_size=self.max_batch_size,
+                window_ms=self.window * 1000
+            )
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            size = len(batch[0].items)
+            deadline = loop.time() + self.window
+
+            while size < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    request = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(request)
+                size += len(request.items)
+
+            await self._execute(batch, size)
+
+    async def _execute(self, batch: List[_PendingRequest], size: int):
+        started = time.perf_counter()
+        self._queued_items -= size
+
+        waits = [started - request.enqueued_at for request in batch]
+        self.batches += 1
+        self.items += size
+        self.requests += len(batch)
+        self.max_batch_seen = max(self.max_batch_seen, size)
+        self.total_wait += sum(waits)
+        self.max_wait = max(self.max_wait, max(waits))
+
+        inputs = [item for request in batch for item in request.items]
+        try:
+            outputs = await run_blocking(self.batch_fn, inputs)
+        except Exception as e:
+            logger.error("inference_batch_failed", scheduler=self.name, batch_size=size, error=str(e))
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            return
+
+        position = 0
+        for request in batch:
+            count = len(request.items)
+            if not request.future.done():
+                request.future.set_result(list(outputs[position:position + count]))
+            position += count
+
+        logger.debug(
+            "inference_batch_complete",
+            scheduler=self.name,
+            requests=len(batch),
+            batch_size=size,
+            max_wait_ms=round(max(waits) * 1000, 2),
+            duration_ms=round((time.perf_counter() - started) * 1000, 2)
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, batch size and wait time metrics"""
+        return {
+            "queue_depth": self._queued_items,
+            "batches": self.batches,
+            "requests": self.requests,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_seen,
+            "avg_wait_ms": round(self.total_wait / self.requests * 1000, 2) if self.requests else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 2),
+            "window_ms": self.window * 1000,
+            "batch_limit": self.max_batch_size
+        }
+
+    async def close(self):
+        """Stop the worker task (application shutdown)"""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
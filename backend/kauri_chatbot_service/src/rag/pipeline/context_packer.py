@@ -0,0 +1,220 @@
+"""
+Context packer - Token-budgeted LLM context from reranked chunks
+1. Adjacent/overlapping chunks of the same file are merged and the
+   duplicated overlap (chunk_text: 300 characters) is removed
+2. Merged segments fill the token budget greedily by rerank score; the
+   segment that no longer fits is trimmed, the rest is dropped
+"""
+from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field
+import re
+import structlog
+
+from src.config import settings
+from src.utils.token_counter import TokenCounter
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class ContextSegment:
+    """Contiguous text of one file (one or more merged chunks)"""
+    documents: List[Dict[str, Any]]
+    content: str
+    score: float
+    trimmed: bool = False
+
+    @property
+    def tokens(self) -> int:
+        return TokenCounter.estimate_tokens(self.content)
+
+
+@dataclass
+class PackedContext:
+    """Packing result and savings"""
+    segments: List[ContextSegment] = field(default_factory=list)
+    input_tokens: int = 0
+    packed_tokens: int = 0
+    merged_chunks: int = 0
+    trimmed_segments: int = 0
+    dropped_segments: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(self.input_tokens - self.packed_tokens, 0)
+
+    def report(self) -> Dict[str, int]:
+        return {
+            "context_tokens": self.packed_tokens,
+            "context_tokens_saved": self.tokens_saved,
+            "context_chunks_merged": self.merged_chunks,
+            "context_segments_trimmed": self.trimmed_segments,
+            "context_segments_dropped": self.dropped_segments
+        }
+
+
+class ContextPacker:
+    """
+    Builds the retrieved context under a token budget
+
+    Tokens are estimated with TokenCounter (same estimate as the
+    conversation context limits).
+    """
+
+    MIN_OVERLAP_CHARS = 20   # Shorter suffix/prefix matches are coincidences
+    MAX_OVERLAP_CHARS = 600  # Upper bound searched (ingestion overlap is 300)
+    TRIM_MARKER = " […]"
+
+    def __init__(
+        self,
+        max_tokens: Optional[int] = None,
+        min_segment_tokens: Optional[int] = None
+    ):
+        """
+        Args:
+            max_tokens: Context token budget
+            min_segment_tokens: Smallest trimmed segment worth keeping
+        """
+        self.max_tokens = max_tokens or settings.rag_context_max_tokens
+        self.min_segment_tokens = min_segment_tokens or settings.rag_context_min_segment_tokens
+
+        self.requests = 0
+        self.total_input_tokens = 0
+        self.total_packed_tokens = 0
+
+    def pack(self, documents: List[Dict[str, Any]]) -> PackedContext:
+        """
+        Merge and budget reranked documents
+
+        Args:
+            documents: Reranked chunks (content, score, metadata)
+
+        Returns:
+            PackedContext with segments in descending score order
+        """
+        packed = PackedContext(
+            input_tokens=sum(TokenCounter.estimate_tokens(doc.get("content", "")) for doc in documents)
+        )
+
+        segments = self._merge(documents)
+        packed.merged_chunks = len(documents) - len(segments)
+        segments.sort(key=lambda segment: segment.score, reverse=True)
+
+        used = 0
+        for segment in segments:
+            tokens = segment.tokens
+            remaining = self.max_tokens - used
+
+            if tokens <= remaining:
+                packed.segments.append(segment)
+                used += tokens
+            elif remaining >= self.min_segment_tokens or not packed.segments:
+                # Low-value tail: keep the beginning of the segment
+                segment.content = self._trim(segment.content, max(remaining, self.min_segment_tokens))
+                segment.trimmed = True
+                packed.segments.append(segment)
+                packed.trimmed_segments += 1
+                used += segment.tokens
+            else:
+                packed.dropped_segments += 1
+
+        packed.packed_tokens = used
+
+        self.requests += 1
+        self.total_input_tokens += packed.input_tokens
+        self.total_packed_tokens += packed.packed_tokens
+
+        logger.info("context_packed",
+                   chunks=len(documents),
+                   segments=len(packed.segments),
+                   input_tokens=packed.input_tokens,
+                   packed_tokens=packed.packed_tokens,
+                   tokens_saved=packed.tokens_saved,
+                   merged=packed.merged_chunks,
+                   trimmed=packed.trimmed_segments,
+                   dropped=packed.dropped_segments)
+
+        return packed
+
+    def _merge(self, documents: List[Dict[str, Any]]) -> List[ContextSegment]:
+        """Merge consecutive/overlapping chunks of the same file, drop exact duplicates"""
+        by_file: Dict[str, List[Dict[str, Any]]] = {}
+        segments: List[ContextSegment] = []
+
+        for doc in documents:
+            metadata = doc.get("metadata", {})
+            file_path = metadata.get("file_path")
+            if file_path and metadata.get("chunk_index") is not None:
+                by_file.setdefault(file_path, []).append(doc)
+            else:
+                segments.append(ContextSegment([doc], doc.get("content", "").strip(), doc.get("score", 0.0)))
+
+        for docs in by_file.values():
+            docs.sort(key=lambda doc: int(doc["metadata"]["chunk_index"]))
+            current: Optional[ContextSegment] = None
+            last_index = None
+
+            for doc in docs:
+                index = int(doc["metadata"]["chunk_index"])
+                content = doc.get("content", "").strip()
+                score = doc.get("score", 0.0)
+
+                if current is not None and index == last_index:
+                    current.score = max(current.score, score)  # Same chunk retrieved twice
+                    continue
+
+                overlap = self._overlap(current.content, content) if current is not None else 0
+                if current is not None and (index == last_index + 1 or overlap):
+                    separator = "" if overlap else "\n"
+                    current.content = current.content + separator + content[overlap:]
+                    current.documents.append(doc)
+                    current.score = max(current.score, score)
+                else:
+                    current = ContextSegment([doc], content, score)
+                    segments.append(current)
+                last_index = index
+
+        return segments
+
+    def _overlap(self, previous: str, following: str) -> int:
+        """Length of the longest suffix of previous that starts following"""
+        longest = min(len(previous), len(following), self.MAX_OVERLAP_CHARS)
+        for size in range(longest, self.MIN_OVERLAP_CHARS - 1, -1):
+            if previous.endswith(following[:size]):
+                return size
+        return 0
+
+    def _trim(self, content: str, max_tokens: int) -> str:
+        """Cut content to max_tokens, preferably at a sentence or line end"""
+        limit = max(max_tokens * TokenCounter.CHARS_PER_TOKEN - len(self.TRIM_MARKER), 0)
+        if len(content) <= limit:
+            return content
+
+        cut = content[:limit]
+        boundaries = [match.end() for match in re.finditer(r"[.!?;:]\s|\n", cut)]
+        if boundaries and boundaries[-1] >= limit * 0.7:
+            cut = cut[:boundaries[-1]]
+        return cut.rstrip() + self.TRIM_MARKER
+
+    def get_stats(self) -> Dict[str, Any]:
+        saved = self.total_input_tokens - self.total_packed_tokens
+        return {
+            "requests": self.requests,
+            "max_tokens": self.max_tokens,
+            "avg_input_tokens": round(self.total_input_tokens / self.requests, 1) if self.requests else 0.0,
+            "avg_packed_tokens": round(self.total_packed_tokens / self.requests, 1) if self.requests else 0.0,
+            "total_tokens_saved": saved,
+            "saved_ratio": round(saved / self.total_input_tokens, 4) if self.total_input_tokens else 0.0
+        }
+
+
+# Singleton instance
+_context_packer_instance: Optional[ContextPacker] = None
+
+
+def get_context_packer() -> ContextPacker:
+    """Get singleton context packer instance"""
+    global _context_packer_instance
+    if _context_packer_instance is None:
+        _context_packer_instance = ContextPacker()
+    return _context_packer_instance
@@ -3,12 +3,15 @@ Conversation-Aware RAG Pipeline
 Extends RAG pipeline with conversation history and message persistence
 """
 from typing import List, Dict, Any, Optional, AsyncGenerator
+import time
 import uuid
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
 
 from src.rag.pipeline.rag_pipeline import RAGPipeline
+from src.rag.pipeline.semantic_cache import get_semantic_cache
 from src.services.conversation_service import ConversationService
+from src.services.context_manager import context_manager
 from src.schemas.chat import SourceDocument
 
 logger = structlog.get_logger()
@@ -88,9 +91,66 @@ Tu continues une conversation existante avec l'utilisateur. L'historique des mes
 - Maintiens la cohérence avec tes réponses précédentes
 - Si l'utilisateur demande des clarifications, réfère-toi au contexte de la conversation"""
 
+    def _semantic_cache_for(self, query: str, messages: List[Any]):
+        """
+        Semantic cache applicable to this turn
+
+        Only context-free first turns are served from (and stored in) the
+        cache; questions asking for a specific number of sources are excluded.
+        """
+        if messages or self.rag_pipeline._extract_requested_source_count(query):
+            return None
+        return get_semantic_cache()
+
+    async def _replay_cached_answer(
+        self,
+        cached: Dict[str, Any],
+        conversation_id: str,
+        start_time: float
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Stream a cached answer in the same chunk format as the workflow
+
+        Args:
+            cached: Semantic cache hit
+            conversation_id: Conversation ID
+            start_time: Request start (for latency)
+
+        Yields:
+            sources, token and done chunks
+        """
+        yield {
+            "type": "sources",
+            "sources": [SourceDocument(**src) for src in cached["sources"]],
+            "metadata": {
+                "retrieval_time_ms": 0,
+                "num_sources": len(cached["sources"]),
+                "retrieval_skipped": True
+            }
+        }
+
+        # Whole answer in one chunk (the SSE layer frames it)
+        yield {
+            "type": "token",
+            "content": cached["answer"]
+        }
+
+        yield {
+            "type": "done",
+            "metadata": {
+                "conversation_id": conversation_id,
+                "model_used": cached["model_used"],
+                "tokens_used": 0,
+                "latency_ms": int((time.time() - start_time) * 1000),
+                "retrieval_time_ms": 0,
+                "generation_time_ms": 0,
+                "intent_type": cached["intent_type"]
+            }
+        }
+
     async def query(
         self,
-        db: Session,
+        db: AsyncSession,
         user_id: uuid.UUID,
         query: str,
         conversation_id: Optional[uuid.UUID] = None,
@@ -120,33 +180,20 @@ Tu continues une conversation existante avec l'utilisateur. L'historique des mes
                    query=query[:100],
                    conversation_id=str(conversation_id) if conversation_id else None)
 
+        start_time = time.time()
+
         # Step 1: Get or create conversation
-        conversation = ConversationService.get_or_create_conversation(
+        conversation = await ConversationService.get_or_create_conversation(
             db=db,
             user_id=user_id,
             conversation_id=conversation_id
         )
 
-        # Step 2: Retrieve conversation history
-        messages = ConversationService.get_conversation_messages(
-            db=db,
-            conversation_id=conversation.id,
-            user_id=user_id,
-            limit=self.max_history_messages
-        )
-
-        # Convert to dict format
-        message_dicts = [
-            {
-                "role": msg.role,
-                "content": msg.content,
-                "created_at": msg.created_at.isoformat()
-            }
-            for msg in messages
-        ]
+        # Step 2: Retrieve conversation history (recent window cache)
+        message_dicts = (await context_manager.get_recent_messages(db, conversation.id))[-self.max_history_messages:]
 
         # Step 3: Save user message
-        user_message = ConversationService.save_message(
+        user_message = await ConversationService.save_message(
             db=db,
             conversation_id=conversation.id,
             role="user",
@@ -158,22 +205,53 @@ Tu continues une conversation existante avec l'utilisateur. L'historique des mes
         # Step 4: Build conversation context
         conversation_context = self._build_conversation_context(message_dicts)
 
-        # Step 5: Augment query with conversation history if exists
-        # Note: We'll inject this into the RAG pipeline's context
+        # Step 5: Resolve the question against the conversation history for
+        # intent classification and retrieval; the generation prompt gets the
+        # history as chat messages instead (loaded by the workflow)
         augmented_query = query
         if conversation_context:
             augmented_query = f"{conversation_context}\nNOUVELLE QUESTION:\n{query}"
 
-        # Step 6: Execute RAG pipeline
-        result = await self.rag_pipeline.query(
-            query=augmented_query,
-            conversation_id=str(conversation.id),
-            db_session=db,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            use_reranking=use_reranking,
-            use_fallback=use_fallback
-        )
+        # Step 6: Serve near-duplicate first turns from the semantic cache,
+        # otherwise execute RAG pipeline
+        semantic_cache = self._semantic_cache_for(query, message_dicts)
+        cached = await semantic_cache.lookup(query) if semantic_cache else None
+
+        if cached:
+            result = {
+                "conversation_id": str(conversation.id),
+                "query": query,
+                "answer": cached["answer"],
+                "sources": [SourceDocument(**src) for src in cached["sources"]],
+                "model_used": cached["model_used"],
+                "tokens_used": 0,
+                "latency_ms": int((time.time() - start_time) * 1000),
+                "metadata": {"intent_type": cached["intent_type"]}
+            }
+        else:
+            result = await self.rag_pipeline.query(
+                query=query,
+                context_query=augmented_query,
+                conversation_id=str(conversation.id),
+                db_session=db,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                use_reranking=use_reranking,
+                use_fallback=use_fallback
+            )
+
+            if semantic_cache:
+                await semantic_cache.store(
+                    query=query,
+                    answer=result.get("answer"),
+                    sources=[src.dict() for src in result.get("sources", [])],
+                    model_used=result.get("model_used"),
+                    tokens_used=result.get("tokens_used"),
+                    intent_type=result.get("metadata", {}).get("intent_type")
+                )
+
+        if semantic_cache:
+            result.setdefault("metadata", {}).update(semantic_cache.report(cached))
 
         # Step 7: Save assistant message
         sources_dict = [
@@ -181,7 +259,7 @@ Tu continues une conversation existante avec l'utilisateur. L'historique des mes
             for src in result.get("sources", [])
         ]
 
-        assistant_message = ConversationService.save_message(
+        assistant_message = await ConversationService.save_message(
             db=db,
             conversation_id=conversation.id,
             role="assistant",
@@ -191,15 +269,17 @@ Tu continues une conversation existante avec l'utilisateur. L'historique des mes
                 "model_used": result.get("model_used"),
                 "tokens_used": result.get("tokens_used"),
                 "latency_ms": result.get("latency_ms"),
-                "intent_type": result.get("metadata", {}).get("intent_type")
+                "intent_type": result.get("metadata", {}).get("intent_type"),
+                "prompt_tokens": result.get("metadata", {}).get("prompt_tokens"),
+                "cached_tokens": result.get("metadata", {}).get("cached_tokens")
             }
         )
 
         logger.info("assistant_message_saved", message_id=str(assistant_message.id))
 
         # Step 8: Auto-generate title if first user message
-        if len(messages) == 0 and not conversation.title:
-            ConversationService.auto_generate_title(
+        if len(message_dicts) == 0 and not conversation.title:
+            await ConversationService.auto_generate_title(
                 db=db,
                 conversation_id=conversation.id,
                 user_id=user_id
@@ -213,7 +293,7 @@ Tu continues une conversation existante avec l'utilisateur. L'historique des mes
 
     async def query_stream(
         self,
-        db: Session,
+        db: AsyncSession,
         user_id: uuid.UUID,
         query: str,
         conversation_id: Optional[uuid.UUID] = None,
@@ -243,6 +323,8 @@ Tu continues une conversation existante avec l'utilisateur. L'historique des mes
                    query=query[:100],
                    conversation_id=str(conversation_id) if conversation_id else None)
 
+        start_time = time.time()
+
         # Send initial status
         yield {
             "type": "status",
@@ -250,32 +332,17 @@ Tu continues une conversation existante avec l'utilisateur. L'historique des mes
         }
 
         # Step 1: Get or create conversation
-        conversation = ConversationService.get_or_create_conversation(
+        conversation = await ConversationService.get_or_create_conversation(
             db=db,
             user_id=user_id,
             conversation_id=conversation_id
         )
 
-        # Step 2: Retrieve conversation history
-        messages = ConversationService.get_conversation_messages(
-            db=db,
-            conversation_id=conversation.id,
-            user_id=user_id,
-            limit=self.max_history_messages
-        )
-
-        # Convert to dict format
-        message_dicts = [
-            {
-                "role": msg.role,
-                "content": msg.content,
-                "created_at": msg.created_at.isoformat()
-            }
-            for msg in messages
-        ]
+        # Step 2: Retrieve conversation history (recent window cache)
+        message_dicts = (await context_manager.get_recent_messages(db, conversation.id))[-self.max_history_messages:]
 
         # Step 3: Save user message
-        user_message = ConversationService.save_message(
+        user_message = await ConversationService.save_message(
             db=db,
             conversation_id=conversation.id,
             role="user",
@@ -285,7 +352,9 @@ Tu continues une conversation existante avec l'utilisateur. L'historique des mes
         # Step 4: Build conversation context
         conversation_context = self._build_conversation_context(message_dicts)
 
-        # Step 5: Augment query with conversation history
+        # Step 5: Resolve the question against the conversation history for
+        # intent classification and retrieval; the generation prompt gets the
+        # history as chat messages instead (loaded by the workflow)
         augmented_query = query
         if conversation_context:
             augmented_query = f"{conversation_context}\nNOUVELLE QUESTION:\n{query}"
@@ -296,21 +365,32 @@ Tu continues une conversation existante avec l'utilisateur. L'historique des mes
             "content": "Je cherche des sources pour vous répondre"
         }
 
-        # Step 6: Stream RAG pipeline
+        # Step 6: Replay a cached answer for near-duplicate first turns,
+        # otherwise stream RAG pipeline
+        semantic_cache = self._semantic_cache_for(query, message_dicts)
+        cached = await semantic_cache.lookup(query) if semantic_cache else None
+
+        if cached:
+            chunks = self._replay_cached_answer(cached, str(conversation.id), start_time)
+        else:
+            chunks = self.rag_pipeline.query_stream(
+                query=query,
+                context_query=augmented_query,
+                conversation_id=str(conversation.id),
+                db_session=db,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                use_reranking=use_reranking,
+                use_fallback=use_fallback
+            )
+
         accumulated_response = []
         sources = []
         metadata = {}
         sources_received = False
+        failed = False
 
-        async for chunk in self.rag_pipeline.query_stream(
-            query=augmented_query,
-            conversation_id=str(conversation.id),
-            db_session=db,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            use_reranking=use_reranking,
-            use_fallback=use_fallback
-        ):
+        async for chunk in chunks:
             # Capture sources and metadata for later persistence
             if chunk["type"] == "sources":
                 sources = chunk.get("sources", [])
@@ -331,10 +411,14 @@ Tu continues une conversation existante avec l'utilisateur. L'historique des mes
                 accumulated_response.append(chunk.get("content", ""))
             elif chunk["type"] == "done":
                 metadata = chunk.get("metadata", {})
+            elif chunk["type"] == "error":
+                failed = True
 
-            # Update conversation_id in metadata chunks
+            # Update conversation_id (and semantic cache report) in metadata chunks
             if chunk["type"] == "done" and "metadata" in chunk:
                 chunk["metadata"]["conversation_id"] = str(conversation.id)
+                if semantic_cache:
+                    chunk["metadata"].update(semantic_cache.report(cached))
 
             # Yield chunk to client
             yield chunk
@@ -347,7 +431,17 @@ Tu continues une conversation existante avec l'utilisateur. L'historique des mes
             for src in sources
         ]
 
-        assistant_message = ConversationService.save_message(
+        if semantic_cache and not cached and not failed:
+            await semantic_cache.store(
+                query=query,
+                answer=full_response,
+                sources=sources_dict,
+                model_used=metadata.get("model_used"),
+                tokens_used=metadata.get("tokens_used"),
+                intent_type=metadata.get("intent_type")
+            )
+
+        assistant_message = await ConversationService.save_message(
             db=db,
             conversation_id=conversation.id,
             role="assistant",
@@ -357,7 +451,9 @@ Tu continues une conversation existante avec l'utilisateur. L'historique des mes
                 "model_used": metadata.get("model_used"),
                 "tokens_used": metadata.get("tokens_used"),
                 "latency_ms": metadata.get("latency_ms"),
-                "intent_type": metadata.get("intent_type")
+                "intent_type": metadata.get("intent_type"),
+                "prompt_tokens": metadata.get("prompt_tokens"),
+                "cached_tokens": metadata.get("cached_tokens")
             }
         )
 
@@ -371,8 +467,8 @@ Tu continues une conversation existante avec l'utilisateur. L'historique des mes
         }
 
         # Step 8: Auto-generate title if first user message
-        if len(messages) == 0 and not conversation.title:
-            ConversationService.auto_generate_title(
+        if len(message_dicts) == 0 and not conversation.title:
+            await ConversationService.auto_generate_title(
                 db=db,
                 conversation_id=conversation.id,
                 user_id=user_id
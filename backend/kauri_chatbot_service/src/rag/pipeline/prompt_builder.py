@@ -0,0 +1,143 @@
+"""
+Prompt assembly ordered from most static to most dynamic
+system prompt + static instructions -> conversation history (chat messages)
+-> retrieved context + question, so the provider prefix cache (DeepSeek,
+OpenAI) covers the long static part and previous turns.
+"""
+from typing import Any, Dict, List, Optional
+
+
+# Static answer instructions for RAG generations (same text for every call)
+RAG_INSTRUCTIONS = """INSTRUCTIONS IMPORTANTES POUR LA RÉPONSE:
+
+1. **Citations professionnelles** :
+   - NE DIS JAMAIS "[Document 1]", "[Document 2]", etc.
+   - UTILISE UNIQUEMENT les titres exacts des sources (ex: "Plan Comptable OHADA : Partie 2 - Chapitre 35")
+   - Format recommandé : "Selon le [Titre exact de la source], ..." ou "D'après [Titre exact], ..."
+   - Exemple : "D'après le Plan Comptable OHADA : Partie 2 - Chapitre 35, ..."
+
+2. **Style de réponse** :
+   - Réponds de manière simple, directe et naturelle
+   - Entre directement dans le vif du sujet
+   - Ne commence PAS par "En tant qu'expert" ou "Je vous explique"
+   - Ne dis JAMAIS "les documents fournis" ou "selon les documents"
+
+3. **Références et preuves** :
+   - Cite les sources avec leur titre exact pour appuyer tes explications
+   - Mentionne les articles, chapitres, titres quand ils sont disponibles
+   - Reste factuel et précis
+
+4. **Si l'utilisateur demande un nombre spécifique de sources** :
+   - Utilise UNIQUEMENT ce nombre exact parmi les sources fournies avec la question (les plus pertinentes)
+   - Liste chaque source avec son titre EXACT
+   - Fournis un extrait ou résumé pertinent pour chacune
+
+EXEMPLE DE FORMAT PROFESSIONNEL:
+
+Si les sources fournies sont:
+SOURCE N°1: Plan Comptable OHADA : Partie 2 - Chapitre 35 (Article 15)
+SOURCE N°2: Actes Uniformes : Organisation Des Sûretés - Titre 5 (Article 42)
+
+Et l'utilisateur demande "donne-moi 2 sources sur les contrats", réponds:
+
+Voici 2 sources pertinentes sur les contrats :
+
+**1. Plan Comptable OHADA : Partie 2 - Chapitre 35**
+Selon ce document (Article 15), les contrats de franchise sont définis comme...
+[Extrait pertinent avec explication]
+
+**2. Actes Uniformes : Organisation Des Sûretés - Titre 5**
+D'après l'article 42 de ce texte, les sûretés contractuelles...
+[Extrait pertinent avec explication]"""
+
+# Static instructions for case law answers
+CASE_LAW_INSTRUCTIONS = """INSTRUCTIONS SPÉCIALES POUR RECHERCHE JURISPRUDENTIELLE:
+Tu réponds à une demande de recherche jurisprudentielle. Structure ta réponse ainsi :
+
+1. **Résumé** : Nombre et types de jurisprudences trouvées
+2. **Analyse par décision** : Pour chaque jurisprudence importante, indique :
+   - Le titre exact (juridiction, date, référence)
+   - Le principe juridique dégagé
+   - L'extrait pertinent
+3. **Synthèse** : Tendance jurisprudentielle générale sur le sujet
+
+Utilise UNIQUEMENT les titres exacts des sources (pas de [Document X])."""
+
+HISTORY_SOURCES_LIMIT = 3  # Source titles recalled per assistant turn
+
+
+def history_to_messages(
+    conversation_history: Optional[List[Dict[str, Any]]],
+    current_query: Optional[str] = None,
+    include_sources: bool = True
+) -> List[Dict[str, str]]:
+    """
+    Convert stored conversation messages into chat messages
+
+    Args:
+        conversation_history: Messages (role, content, optional sources), chronological
+        current_query: Current question; a trailing user message with the
+            same text (already persisted) is dropped
+        include_sources: Recall the source titles used by assistant turns
+
+    Returns:
+        List of {"role", "content"} messages
+    """
+    history = [
+        msg for msg in (conversation_history or [])
+        if msg.get("role") in ("user", "assistant") and msg.get("content")
+    ]
+    if current_query and history and history[-1]["role"] == "user" and history[-1]["content"] == current_query:
+        history = history[:-1]
+
+    messages = []
+    for msg in history:
+        content = msg["content"]
+        sources = msg.get("sources") or []
+        if include_sources and msg["role"] == "assistant" and sources:
+            titles = [source.get("title", "Unknown") for source in sources[:HISTORY_SOURCES_LIMIT]]
+            content += "\n\n*Sources utilisées:*\n" + "\n".join(
+                f"  {i}. {title}" for i, title in enumerate(titles, 1)
+            )
+        messages.append({"role": msg["role"], "content": content})
+
+    return messages
+
+
+def build_user_prompt(query: str, context: str) -> str:
+    """Dynamic part of the prompt: retrieved context, then the question"""
+    return f"""{context}
+
+QUESTION DE L'UTILISATEUR:
+{query}"""
+
+
+def assemble_prompt(
+    system_prompt: str,
+    query: str,
+    context: str,
+    instructions: Optional[str] = RAG_INSTRUCTIONS,
+    conversation_history: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """
+    Assemble an LLM request from most static to most dynamic
+
+    Args:
+        system_prompt: Base system prompt
+        query: User question
+        context: Formatted retrieved documents
+        instructions: Static instructions appended to the system prompt
+        conversation_history: Previous messages of the conversation
+
+    Returns:
+        Dict with system_prompt, history and prompt (LLMClient.generate /
+        generate_stream keyword arguments)
+    """
+    if instructions:
+        system_prompt = f"{system_prompt}\n\n{instructions}"
+
+    return {
+        "system_prompt": system_prompt,
+        "history": history_to_messages(conversation_history, current_query=query),
+        "prompt": build_user_prompt(query, context)
+    }
@@ -10,6 +10,8 @@ import structlog
 from src.config import settings
 from src.rag.retriever.hybrid_retriever import get_hybrid_retriever
 from src.llm.llm_client import get_llm_client
+from src.rag.pipeline.prompt_builder import RAG_INSTRUCTIONS, assemble_prompt
+from src.rag.pipeline.context_packer import get_context_packer
 from src.schemas.chat import SourceDocument
 
 logger = structlog.get_logger()
@@ -114,16 +116,36 @@ Règles importantes pour tes réponses :
 11. Si une information n'est pas dans ta documentation : "Je n'ai pas cette information dans ma documentation actuelle"
 12. Ne jamais inventer ou extrapoler au-delà des sources fournies"""
 
-    def _format_context(self, documents: List[Dict[str, Any]]) -> str:
-        """Format retrieved documents into context string with human-readable titles"""
+    def _format_context(
+        self,
+        documents: List[Dict[str, Any]],
+        report: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Format retrieved documents into context string with human-readable titles
+
+        Chunks are packed first (overlapping chunks of a file merged, token
+        budget RAG_CONTEXT_MAX_TOKENS filled by score).
+
+        Args:
+            documents: Reranked documents
+            report: Optional dict filled with the packing report (tokens saved)
+
+        Returns:
+            Context string
+        """
         if not documents:
             return "Aucun document pertinent trouvé dans la base de connaissances."
 
+        packed = get_context_packer().pack(documents)
+        if report is not None:
+            report.update(packed.report())
+
         context_parts = ["CONTEXTE - Documents pertinents:\n"]
 
-        for i, doc in enumerate(documents, 1):
-            metadata = doc.get("metadata", {})
-            content = doc.get("content", "").strip()
+        for i, segment in enumerate(packed.segments, 1):
+            metadata = segment.documents[0].get("metadata", {})
+            content = segment.content
 
             # Generate human-readable title from file_path and metadata
             file_path = metadata.get("file_path", "")
@@ -140,60 +162,33 @@ Règles importantes pour tes réponses :
 
             # Format: SOURCE N°X: [Title] (Article X, Page Y)
             context_parts.append(f"\nSOURCE N°{i}: {document_title}{ref_suffix}")
-            context_parts.append(f"Pertinence: {doc.get('score', 0.0):.3f}")
+            context_parts.append(f"Pertinence: {segment.score:.3f}")
             context_parts.append(f"Contenu:\n{content}\n")
             context_parts.append("-" * 80)
 
         return "\n".join(context_parts)
 
-    def _build_user_prompt(self, query: str, context: str) -> str:
-        """Build complete user prompt with context and query"""
-        return f"""{context}
-
-QUESTION DE L'UTILISATEUR:
-{query}
-
-INSTRUCTIONS IMPORTANTES POUR LA RÉPONSE:
-
-1. **Citations professionnelles** :
-   - NE DIS JAMAIS "[Document 1]", "[Document 2]", etc.
-   - UTILISE UNIQUEMENT les titres exacts des sources (ex: "Plan Comptable OHADA : Partie 2 - Chapitre 35")
-   - Format recommandé : "Selon le [Titre exact de la source], ..." ou "D'après [Titre exact], ..."
-   - Exemple : "D'après le Plan Comptable OHADA : Partie 2 - Chapitre 35, ..."
-
-2. **Style de réponse** :
-   - Réponds de manière simple, directe et naturelle
-   - Entre directement dans le vif du sujet
-   - Ne commence PAS par "En tant qu'expert" ou "Je vous explique"
-   - Ne dis JAMAIS "les documents fournis" ou "selon les documents"
-
-3. **Références et preuves** :
-   - Cite les sources avec leur titre exact pour appuyer tes explications
-   - Mentionne les articles, chapitres, titres quand ils sont disponibles
-   - Reste factuel et précis
-
-4. **Si l'utilisateur demande un nombre spécifique de sources** :
-   - Utilise UNIQUEMENT ce nombre exact parmi les sources ci-dessus (les plus pertinentes)
-   - Liste chaque source avec son titre EXACT
-   - Fournis un extrait ou résumé pertinent pour chacune
-
-EXEMPLE DE FORMAT PROFESSIONNEL:
-
-Si les sources fournies sont:
-SOURCE N°1: Plan Comptable OHADA : Partie 2 - Chapitre 35 (Article 15)
-SOURCE N°2: Actes Uniformes : Organisation Des Sûretés - Titre 5 (Article 42)
-
-Et l'utilisateur demande "donne-moi 2 sources sur les contrats", réponds:
-
-Voici 2 sources pertinentes sur les contrats :
-
-**1. Plan Comptable OHADA : Partie 2 - Chapitre 35**
-Selon ce document (Article 15), les contrats de franchise sont définis comme...
-[Extrait pertinent avec explication]
+    def _assemble_prompt(
+        self,
+        query: str,
+        context: str,
+        conversation_history: Optional[List[Dict[str, Any]]] = None,
+        instructions: Optional[str] = RAG_INSTRUCTIONS
+    ) -> Dict[str, Any]:
+        """
+        Build the LLM request (system prompt + static instructions, history
+        messages, then context and question)
 
-**2. Actes Uniformes : Organisation Des Sûretés - Titre 5**
-D'après l'article 42 de ce texte, les sûretés contractuelles...
-[Extrait pertinent avec explication]"""
+        Returns:
+            system_prompt / history / prompt keyword arguments for the LLM client
+        """
+        return assemble_prompt(
+            system_prompt=self._prepare_system_prompt(),
+            query=query,
+            context=context,
+            instructions=instructions,
+            conversation_history=conversation_history
+        )
 
     def _generate_title_from_path(self, file_path: str, metadata: Dict[str, Any] = None) -> str:
         """
@@ -338,7 +333,8 @@ D'après l'article 42 de ce texte, les sûretés contractuelles...
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
         use_reranking: bool = True,
-        use_fallback: bool = False
+        use_fallback: bool = False,
+        context_query: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Execute complete RAG query pipeline with intelligent routing
@@ -356,6 +352,8 @@ D'après l'article 42 de ce texte, les sûretés contractuelles...
             max_tokens: Max tokens to generate (default from settings)
             use_reranking: Whether to use cross-encoder reranking
             use_fallback: Force use of fallback LLM
+            context_query: Context-resolved text (e.g. with conversation history) used for
+                intent classification and retrieval; the prompt keeps the bare query
 
         Returns:
             Dict with answer, sources, metadata
@@ -378,6 +376,7 @@ D'après l'article 42 de ce texte, les sûretés contractuelles...
                     query=query,
                     conversation_id=conversation_id,
                     db_session=db_session,
+                    context_query=context_query,
                     metadata={
                         "use_reranking": use_reranking,
                         "use_fallback": use_fallback
@@ -408,7 +407,7 @@ D'après l'article 42 de ce texte, les sûretés contractuelles...
             # Step 1: Retrieve relevant documents
             retrieval_start = time.time()
             documents = await self.hybrid_retriever.retrieve(
-                query=query,
+                query=context_query or query,
                 top_k=settings.rag_rerank_top_k if use_reranking else settings.rag_top_k,
                 use_reranking=use_reranking
             )
@@ -419,15 +418,13 @@ D'après l'article 42 de ce texte, les sûretés contractuelles...
                        retrieval_time_ms=int(retrieval_time * 1000))
 
             # Step 2: Prepare context and prompts
-            system_prompt = self._prepare_system_prompt()
             context = self._format_context(documents)
-            user_prompt = self._build_user_prompt(query, context)
+            prompt = self._assemble_prompt(query, context)
 
             # Step 3: Generate answer with LLM
             generation_start = time.time()
             llm_response = await self.llm_client.generate(
-                prompt=user_prompt,
-                system_prompt=system_prompt,
+                **prompt,
                 temperature=temperature or settings.llm_temperature,
                 max_tokens=max_tokens or settings.llm_max_tokens,
                 use_fallback=use_fallback
@@ -456,7 +453,9 @@ D'après l'article 42 de ce texte, les sûretés contractuelles...
                     "retrieval_time_ms": int(retrieval_time * 1000),
                     "generation_time_ms": int(generation_time * 1000),
                     "num_sources": len(documents),
-                    "use_reranking": use_reranking
+                    "use_reranking": use_reranking,
+                    "prompt_tokens": llm_response.get("prompt_tokens"),
+                    "cached_tokens": llm_response.get("cached_tokens")
                 }
             }
 
@@ -472,13 +471,16 @@ D'après l'article 42 de ce texte, les sûretés contractuelles...
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
         use_reranking: bool = True,
-        use_fallback: bool = False
+        use_fallback: bool = False,
+        context_query: Optional[str] = None
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Execute RAG query with streaming response
 
         Uses same workflow as query() with intent classification and routing.
         Only difference: streams the final answer generation.
+        context_query: Context-resolved text (e.g. with conversation history) used for
+        intent classification and retrieval; the prompt keeps the bare query
 
         Yields chunks in format:
         {
@@ -504,6 +506,7 @@ D'après l'article 42 de ce texte, les sûretés contractuelles...
                     query=query,
                     conversation_id=conversation_id,
                     db_session=db_session,
+                    context_query=context_query,
                     metadata={
                         "use_reranking": use_reranking,
                         "use_fallback": use_fallback,
@@ -529,7 +532,7 @@ D'après l'article 42 de ce texte, les sûretés contractuelles...
                 # Step 1: Retrieve documents
                 retrieval_start = time.time()
                 documents = await self.hybrid_retriever.retrieve(
-                    query=query,
+                    query=context_query or query,
                     top_k=settings.rag_rerank_top_k if use_reranking else settings.rag_top_k,
                     use_reranking=use_reranking
                 )
@@ -550,21 +553,20 @@ D'après l'article 42 de ce texte, les sûretés contractuelles...
                 }
 
                 # Step 3: Prepare prompts
-                system_prompt = self._prepare_system_prompt()
                 context = self._format_context(documents)
-                user_prompt = self._build_user_prompt(query, context)
+                prompt = self._assemble_prompt(query, context)
 
                 # Step 4: Stream LLM response
                 generation_start = time.time()
                 token_count = 0
-                model_used = f"{settings.llm_provider}/{settings.llm_model}"
+                usage = {}
 
                 async for chunk in self.llm_client.generate_stream(
-                    prompt=user_prompt,
-                    system_prompt=system_prompt,
+                    **prompt,
                     temperature=temperature or settings.llm_temperature,
                     max_tokens=max_tokens or settings.llm_max_tokens,
-                    use_fallback=use_fallback
+                    use_fallback=use_fallback,
+                    usage=usage
                 ):
                     token_count += 1
                     yield {
@@ -580,8 +582,10 @@ D'après l'article 42 de ce texte, les sûretés contractuelles...
                     "type": "done",
                     "metadata": {
                         "conversation_id": conversation_id,
-                        "model_used": model_used,
-                        "tokens_used": token_count,
+                        "model_used": usage.get("model", f"{settings.llm_provider}/{settings.llm_model}"),
+                        "tokens_used": usage.get("total_tokens", token_count),
+                        "prompt_tokens": usage.get("prompt_tokens"),
+                        "cached_tokens": usage.get("cached_tokens"),
                         "latency_ms": int(total_time * 1000),
                         "retrieval_time_ms": int(retrieval_time * 1000),
                         "generation_time_ms": int(generation_time * 1000),
@@ -0,0 +1,286 @@
+"""
+Semantic answer cache
+Serves stored answers to paraphrases of earlier first-turn questions.
+Lookup is a cosine search over the query embeddings (BGE-M3, already
+cached by the embedder); entries are dropped as a whole when the corpus
+epoch or the prompt version changes.
+Embeddings barely move when only a cited article, account or number
+changes, so a hit also requires the same legal references and numbers.
+"""
+from typing import List, Dict, Any, Optional, Tuple
+import re
+import time
+import numpy as np
+import structlog
+
+from src.config import settings
+from src.rag.corpus_epoch import get_corpus_epoch
+from src.rag.agents.reference_parser import get_reference_parser
+
+logger = structlog.get_logger()
+
+
+class SemanticAnswerCache:
+    """
+    Per-worker cache of final answers keyed by query embedding
+
+    Vectors live in one float32 matrix so a lookup is a single
+    matrix-vector product. Only answers grounded in retrieved sources are
+    stored (see CACHEABLE_INTENTS). Each entry keeps the references and
+    numbers of its query; a near-duplicate is only served if they match
+    exactly ("Article 15" never answers "Article 16").
+    """
+
+    CACHEABLE_INTENTS = ("rag_query", "legal_reference_search", "case_law_research", "document_sourcing")
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        ttl: Optional[int] = None
+    ):
+        """
+        Args:
+            threshold: Min cosine similarity to serve a cached answer
+            max_entries: Max cached answers (least recently used evicted)
+            ttl: Max age in seconds of an entry
+        """
+        self.threshold = threshold if threshold is not None else settings.semantic_cache_threshold
+        self.max_entries = max_entries or settings.semantic_cache_max_entries
+        self.ttl = ttl or settings.semantic_cache_ttl
+        self.epoch = get_corpus_epoch()
+
+        self._vectors: Optional[np.ndarray] = None
+        self._last_used = np.zeros(0)
+        self._entries: List[Optional[Dict[str, Any]]] = []
+        self._free: List[int] = []
+        self._generation: Optional[Tuple[str, str]] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.reference_mismatches = 0
+        self.tokens_saved = 0
+
+    async def lookup(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Find the cached answer of a near-duplicate question
+
+        Args:
+            query: User question (first turn, no conversation context)
+
+        Returns:
+            Dict with answer, sources (dicts), model_used, tokens_used,
+            intent_type and similarity, or None
+        """
+        if await self._sync_generation() is None or not self._entries:
+            self.misses += 1
+            return None
+
+        vector = await self._embed(query)
+        size = len(self._entries)
+        if vector is None or not size:
+            self.misses += 1
+            return None
+
+        scores = self._vectors[:size] @ vector
+        references = self._reference_key(query)
+
+        # Best fresh candidate above the threshold citing exactly the same references
+        now = time.monotonic()
+        slot, entry, similarity = None, None, 0.0
+        candidates = np.flatnonzero(scores >= self.threshold)
+        for candidate in candidates[np.argsort(-scores[candidates])]:
+            candidate_entry = self._entries[candidate]
+            if candidate_entry is None:
+                continue
+            if candidate_entry["expires_at"] < now:
+                self._release(int(candidate))
+                continue
+            if candidate_entry["references"] != references:
+                self.reference_mismatches += 1
+                continue
+            slot, entry, similarity = int(candidate), candidate_entry, float(scores[candidate])
+            break
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._last_used[slot] = now
+        self.hits += 1
+        self.tokens_saved += entry["tokens_used"] or 0
+
+        logger.info("semantic_cache_hit",
+                   similarity=round(similarity, 4),
+                   cached_query=entry["query"][:100],
+                   query=query[:100])
+
+        return {
+            "answer": entry["answer"],
+            "sources": entry["sources"],
+            "model_used": entry["model_used"],
+            "tokens_used": entry["tokens_used"],
+            "intent_type": entry["intent_type"],
+            "similarity": similarity
+        }
+
+    async def store(
+        self,
+        query: str,
+        answer: str,
+        sources: List[Dict[str, Any]],
+        model_used: Optional[str],
+        tokens_used: Optional[int],
+        intent_type: Optional[str]
+    ):
+        """
+        Cache a first-turn answer (skipped for non-RAG intents or when
+        no sources were found)
+
+        Args:
+            query: User question
+            answer: Final answer
+            sources: Source documents as dicts
+            model_used: LLM that generated the answer
+            tokens_used: Tokens spent on the answer
+            intent_type: Classified intent
+        """
+        if intent_type not in self.CACHEABLE_INTENTS or not answer or not sources:
+            return
+        if await self._sync_generation() is None:
+            return
+
+        vector = await self._embed(query)
+        if vector is None:
+            return
+        slot = self._allocate(vector.shape[0])
+        self._vectors[slot] = vector
+        self._last_used[slot] = time.monotonic()
+        self._entries[slot] = {
+            "query": query,
+            "references": self._reference_key(query),
+            "answer": answer,
+            "sources": sources,
+            "model_used": model_used,
+            "tokens_used": tokens_used,
+            "intent_type": intent_type,
+            "expires_at": time.monotonic() + self.ttl
+        }
+        self.stores += 1
+
+    def report(self, hit: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Metadata attached to the response (done chunk / ChatResponse.metadata)
+
+        Args:
+            hit: Result of lookup() for this request, if any
+        """
+        lookups = self.hits + self.misses
+        return {
+            "semantic_cache_hit": hit is not None,
+            "semantic_cache_similarity": round(hit["similarity"], 4) if hit else None,
+            "semantic_cache_tokens_saved": (hit["tokens_used"] or 0) if hit else 0,
+            "semantic_cache_hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "semantic_cache_total_tokens_saved": self.tokens_saved
+        }
+
+    async def _sync_generation(self) -> Optional[Tuple[str, str]]:
+        """Drop every entry when the corpus epoch or prompt version changed"""
+        epoch = await self.epoch.current()
+        if epoch is None:
+            return None
+
+        generation = (epoch, settings.prompt_version)
+        if generation != self._generation:
+            if self._generation is not None and self._entries:
+                self.invalidations += 1
+                logger.info("semantic_cache_invalidated",
+                           previous=self._generation,
+                           current=generation,
+                           entries=len(self._entries) - len(self._free))
+            self._clear()
+            self._generation = generation
+        return generation
+
+    @staticmethod
+    def _reference_key(query: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """Normalized legal references and every number of the query"""
+        references = sorted({ref.normalized.lower() for ref in get_reference_parser().parse(query)})
+        numbers = sorted(set(re.findall(r"\d+", query)))
+        return tuple(references), tuple(numbers)
+
+    async def _embed(self, query: str) -> Optional[np.ndarray]:
+        from src.rag.embedder.bge_embedder import get_embedder
+
+        try:
+            vector = np.asarray(await get_embedder().aembed_text(query), dtype=np.float32)
+        except Exception as e:
+            logger.warning("semantic_cache_embedding_failed", error=str(e))
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _allocate(self, dim: int) -> int:
+        """Free slot, new slot (matrix grows by doubling) or LRU slot"""
+        if self._free:
+            return self._free.pop()
+
+        size = len(self._entries)
+        if size < self.max_entries:
+            if self._vectors is None or size == len(self._vectors):
+                capacity = min(self.max_entries, max(64, size * 2))
+                vectors = np.zeros((capacity, dim), dtype=np.float32)
+                last_used = np.zeros(capacity)
+                if self._vectors is not None:
+                    vectors[:size] = self._vectors[:size]
+                    last_used[:size] = self._last_used[:size]
+                self._vectors, self._last_used = vectors, last_used
+            self._entries.append(None)
+            return size
+
+        self.evictions += 1
+        return int(np.argmin(self._last_used[:size]))
+
+    def _release(self, slot: int):
+        self._entries[slot] = None
+        self._vectors[slot] = 0.0  # Never matches again
+        self._free.append(slot)
+
+    def _clear(self):
+        self._vectors = None
+        self._last_used = np.zeros(0)
+        self._entries = []
+        self._free = []
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rate, saved tokens and occupancy"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "tokens_saved": self.tokens_saved,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "reference_mismatches": self.reference_mismatches,
+            "entries": len(self._entries) - len(self._free),
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+            "epoch": self._generation[0] if self._generation else None,
+            "prompt_version": settings.prompt_version
+        }
+
+
+# Global singleton
+_semantic_cache = None
+
+def get_semantic_cache() -> Optional[SemanticAnswerCache]:
+    """Get global semantic answer cache (None when disabled)"""
+    global _semantic_cache
+    if _semantic_cache is None and settings.semantic_cache_enabled:
+        _semantic_cache = SemanticAnswerCache()
+    return _semantic_cache
@@ -2,10 +2,13 @@
 Cross-Encoder Reranker for improving retrieval quality
 """
 from typing import List, Dict, Any
+import threading
 import structlog
 from sentence_transformers import CrossEncoder
 
 from ...config import settings
+from ...utils.executors import run_blocking
+from ..inference_scheduler import InferenceScheduler
 
 logger = structlog.get_logger()
 
@@ -18,15 +21,20 @@ class CrossEncoderReranker:
     
     def __init__(self):
         self.model = None
+        self._load_lock = threading.Lock()  # Retrieval runs on several executor threads
         self.model_name = settings.reranker_model
+        self.scheduler = InferenceScheduler("reranker", self._predict_batch)
         logger.info("reranker_initialized_lazy", model=self.model_name)
     
     def _load_model(self):
         """Lazy load model on first use"""
-        if self.model is None:
-            logger.info("loading_reranker_model", model=self.model_name)
-            self.model = CrossEncoder(self.model_name)
-            logger.info("reranker_model_loaded")
+        if self.model is not None:
+            return
+        with self._load_lock:
+            if self.model is None:
+                logger.info("loading_reranker_model", model=self.model_name)
+                self.model = CrossEncoder(self.model_name)
+                logger.info("reranker_model_loaded")
     
     def rerank(
         self,
@@ -78,6 +86,54 @@ class CrossEncoderReranker:
         # Get cross-encoder scores
         scores = self.model.predict(pairs)
 
+        return self._select(documents, scores, top_k, use_dynamic_filtering, requested_count)
+
+    async def arerank(
+        self,
+        query: str,
+        documents: List[Dict[str, Any]],
+        top_k: int = None,
+        use_dynamic_filtering: bool = True,
+        requested_count: int = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Async rerank (same arguments and result as rerank)
+        Pairs of concurrent requests are micro-batched into one model.predict
+        """
+        if not documents:
+            return []
+
+        if not settings.inference_batching_enabled:
+            return await run_blocking(
+                self.rerank, query, documents, top_k, use_dynamic_filtering, requested_count
+            )
+
+        top_k = top_k or settings.rag_rerank_top_k
+
+        logger.info("reranking_documents",
+                   query_length=len(query),
+                   candidates=len(documents),
+                   use_dynamic_filtering=use_dynamic_filtering)
+
+        pairs = [[query, doc['content']] for doc in documents]
+        scores = await self.scheduler.submit(pairs)
+
+        return self._select(documents, scores, top_k, use_dynamic_filtering, requested_count)
+
+    def _predict_batch(self, pairs: List[List[str]]):
+        """Score one micro-batch of pairs (runs on the retrieval executor)"""
+        self._load_model()
+        return self.model.predict(pairs, batch_size=len(pairs), show_progress_bar=False)
+
+    def _select(
+        self,
+        documents: List[Dict[str, Any]],
+        scores,
+        top_k: int,
+        use_dynamic_filtering: bool,
+        requested_count: int
+    ) -> List[Dict[str, Any]]:
+        """Apply rerank scores, sort and filter (see rerank)"""
         # Add scores to documents and sort
         for doc, score in zip(documents, scores):
             doc['rerank_score'] = float(score)
@@ -0,0 +1,353 @@
+"""
+Incremental BM25 inverted index
+Postings lists + per-document lengths, updated in place by chunk id.
+Scoring runs on a frozen CSR term-document weight matrix (also the
+on-disk snapshot layout).
+"""
+from typing import List, Dict, Optional, Tuple
+from collections import Counter
+import numpy as np
+from scipy import sparse
+
+
+class BM25Index:
+    """
+    Mutable inverted index
+
+    Each chunk occupies a slot; postings map a term to {slot: term frequency}.
+    Document frequencies, total length and document count are maintained on
+    every add/delete, so updates never require a corpus rebuild.
+
+    Searching compiles the index into a FrozenBM25Index, cached until the
+    next mutation.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, epsilon: float = 0.25):
+        self.k1 = k1
+        self.b = b
+        self.epsilon = epsilon
+
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.doc_ids: List[Optional[str]] = []
+        self.doc_lengths: List[int] = []
+        self.doc_terms: List[Optional[Counter]] = []
+        self.slot_by_id: Dict[str, int] = {}
+        self.free_slots: List[int] = []
+        self.total_length = 0
+
+        # Compiled scoring form, invalidated by mutations
+        self._frozen: Optional["FrozenBM25Index"] = None
+
+    @property
+    def num_docs(self) -> int:
+        """Number of live documents"""
+        return len(self.slot_by_id)
+
+    @property
+    def avgdl(self) -> float:
+        """Average document length"""
+        return self.total_length / self.num_docs if self.num_docs else 0.0
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.slot_by_id
+
+    def __len__(self) -> int:
+        return self.num_docs
+
+    def add(self, doc_id: str, tokens: List[str]):
+        """
+        Add (or replace) a document
+
+        Args:
+            doc_id: Chunk id
+            tokens: Tokenized content
+        """
+        if doc_id in self.slot_by_id:
+            self.remove(doc_id)
+
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            slot = len(self.doc_ids)
+            self.doc_ids.append(None)
+            self.doc_lengths.append(0)
+            self.doc_terms.append(None)
+
+        term_freqs = Counter(tokens)
+        for term, tf in term_freqs.items():
+            self.postings.setdefault(term, {})[slot] = tf
+
+        self.doc_ids[slot] = doc_id
+        self.doc_lengths[slot] = len(tokens)
+        self.doc_terms[slot] = term_freqs
+        self.slot_by_id[doc_id] = slot
+        self.total_length += len(tokens)
+        self._frozen = None
+
+    def remove(self, doc_id: str) -> bool:
+        """
+        Remove a document
+
+        Args:
+            doc_id: Chunk id
+
+        Returns:
+            True if the document was indexed
+        """
+        slot = self.slot_by_id.pop(doc_id, None)
+        if slot is None:
+            return False
+
+        for term in self.doc_terms[slot]:
+            term_postings = self.postings[term]
+            del term_postings[slot]
+            if not term_postings:
+                del self.postings[term]
+
+        self.total_length -= self.doc_lengths[slot]
+        self.doc_ids[slot] = None
+        self.doc_lengths[slot] = 0
+        self.doc_terms[slot] = None
+        self.free_slots.append(slot)
+        self._frozen = None
+        return True
+
+    def clear(self):
+        """Drop every document"""
+        self.__init__(k1=self.k1, b=self.b, epsilon=self.epsilon)
+
+    def freeze(self) -> "FrozenBM25Index":
+        """
+        Compact the index into a read-only CSR layout
+
+        Free slots are dropped, so slot numbers of the frozen index follow
+        the order of live documents. The vocabulary is sorted.
+
+        Returns:
+            Frozen copy of the index (cached until the next mutation)
+        """
+        if self._frozen is not None:
+            return self._frozen
+
+        live_slots = np.asarray(
+            [slot for slot, doc_id in enumerate(self.doc_ids) if doc_id is not None],
+            dtype=np.int64
+        )
+        new_slot = np.full(len(self.doc_ids), -1, dtype=np.int64)
+        new_slot[live_slots] = np.arange(len(live_slots))
+
+        vocabulary = sorted(self.postings)
+        lengths = [len(self.postings[term]) for term in vocabulary]
+        nnz = sum(lengths)
+        rows = np.repeat(np.arange(len(vocabulary)), lengths)
+        cols = np.empty(nnz, dtype=np.int64)
+        tfs = np.empty(nnz, dtype=np.int32)
+        position = 0
+        for term, length in zip(vocabulary, lengths):
+            term_postings = self.postings[term]
+            cols[position:position + length] = np.fromiter(term_postings.keys(), dtype=np.int64, count=length)
+            tfs[position:position + length] = np.fromiter(term_postings.values(), dtype=np.int32, count=length)
+            position += length
+
+        # COO -> CSR sorts postings by (term, slot)
+        tf_matrix = sparse.csr_matrix(
+            (tfs, (rows, new_slot[cols])),
+            shape=(len(vocabulary), len(live_slots))
+        )
+        tf_matrix.sort_indices()
+
+        self._frozen = FrozenBM25Index(
+            vocabulary=vocabulary,
+            term_offsets=tf_matrix.indptr,
+            posting_slots=tf_matrix.indices,
+            posting_tfs=tf_matrix.data.astype(np.int32),
+            doc_ids=[self.doc_ids[slot] for slot in live_slots],
+            doc_lengths=np.asarray([self.doc_lengths[slot] for slot in live_slots], dtype=np.int32),
+            k1=self.k1,
+            b=self.b,
+            epsilon=self.epsilon
+        )
+        return self._frozen
+
+    def top_k_batch(self, queries: List[List[str]], top_k: int) -> List[List[Tuple[str, float]]]:
+        """Score queries on the compiled index (see FrozenBM25Index.top_k_batch)"""
+        return self.freeze().top_k_batch(queries, top_k)
+
+
+class FrozenBM25Index:
+    """
+    Read-only BM25 index in CSR layout
+
+    Postings are stored term-major: the postings of vocabulary[i] are
+    posting_slots/posting_tfs[term_offsets[i]:term_offsets[i + 1]].
+    The same structure holds the precomputed BM25 weight of every posting,
+    so a query is one sparse row-slice sum. Arrays may be numpy memmaps so
+    that index pages are shared between processes.
+
+    Weights reproduce rank_bm25.BM25Okapi: idf * tf * (k1 + 1) /
+    (tf + k1 * (1 - b + b * dl / avgdl)), with negative IDF floored to
+    epsilon * average IDF.
+    """
+
+    def __init__(
+        self,
+        vocabulary: List[str],
+        term_offsets: np.ndarray,
+        posting_slots: np.ndarray,
+        posting_tfs: np.ndarray,
+        doc_ids: List[str],
+        doc_lengths: np.ndarray,
+        k1: float = 1.5,
+        b: float = 0.75,
+        epsilon: float = 0.25,
+        posting_weights: Optional[np.ndarray] = None
+    ):
+        self.k1 = k1
+        self.b = b
+        self.epsilon = epsilon
+
+        self.vocabulary = vocabulary
+        self.term_index = {term: i for i, term in enumerate(vocabulary)}
+        self.term_offsets = term_offsets
+        self.posting_slots = posting_slots
+        self.posting_tfs = posting_tfs
+        self.doc_ids = doc_ids
+        self.doc_lengths = doc_lengths
+        self.slot_by_id = {doc_id: slot for slot, doc_id in enumerate(doc_ids)}
+        self.total_length = int(np.asarray(doc_lengths, dtype=np.int64).sum())
+
+        if posting_weights is None:
+            posting_weights = self._compute_weights()
+        self.posting_weights = posting_weights
+
+        # scipy keeps the (possibly memory-mapped) arrays as long as the
+        # index dtypes agree, so the matrix does not copy them
+        self.weights = sparse.csr_matrix(
+            (posting_weights, posting_slots, term_offsets),
+            shape=(len(vocabulary), len(doc_ids))
+        )
+
+    @property
+    def num_docs(self) -> int:
+        """Number of documents"""
+        return len(self.doc_ids)
+
+    @property
+    def avgdl(self) -> float:
+        """Average document length"""
+        return self.total_length / self.num_docs if self.num_docs else 0.0
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.slot_by_id
+
+    def __len__(self) -> int:
+        return self.num_docs
+
+    def _compute_weights(self) -> np.ndarray:
+        """BM25 weight of every posting"""
+        if not self.num_docs:
+            return np.zeros(len(self.posting_slots), dtype=np.float64)
+
+        dfs = np.diff(np.asarray(self.term_offsets, dtype=np.int64))
+        idfs = np.log(self.num_docs - dfs + 0.5) - np.log(dfs + 0.5)
+        if len(idfs):
+            idfs[idfs < 0] = self.epsilon * float(idfs.mean())
+
+        length_norm = self.k1 * (
+            1 - self.b + self.b * np.asarray(self.doc_lengths, dtype=np.float64) / self.avgdl
+        )
+        tfs = np.asarray(self.posting_tfs, dtype=np.float64)
+
+        return np.repeat(idfs, dfs) * tfs * (self.k1 + 1) / (tfs + length_norm[self.posting_slots])
+
+    def query_matrix(self, queries: List[List[str]]) -> sparse.csr_matrix:
+        """
+        Build the (queries x vocabulary) term-count matrix
+
+        Args:
+            queries: Tokenized queries (repeated terms count repeatedly)
+
+        Returns:
+            Sparse query matrix
+        """
+        indptr = [0]
+        indices: List[int] = []
+        data: List[float] = []
+        for tokens in queries:
+            counts = Counter(self.term_index[t] for t in tokens if t in self.term_index)
+            indices.extend(counts.keys())
+            data.extend(counts.values())
+            indptr.append(len(indices))
+
+        return sparse.csr_matrix(
+            (
+                np.asarray(data, dtype=np.float64),
+                np.asarray(indices, dtype=np.int64),
+                np.asarray(indptr, dtype=np.int64)
+            ),
+            shape=(len(queries), len(self.vocabulary))
+        )
+
+    def top_k_batch(self, queries: List[List[str]], top_k: int) -> List[List[Tuple[str, float]]]:
+        """
+        Score many queries with one sparse matrix product
+
+        Only documents containing at least one query term get a score, so
+        top-k selection (argpartition) runs on those candidates only.
+        Documents with a non-positive score are dropped.
+
+        Args:
+            queries: Tokenized queries
+            top_k: Results per query
+
+        Returns:
+            Per query, (chunk id, score) pairs sorted by descending score
+        """
+        if not queries or not self.num_docs or top_k <= 0:
+            return [[] for _ in queries]
+
+        scores = (self.query_matrix(queries) @ self.weights).tocsr()
+
+        results = []
+        for row in range(len(queries)):
+            start, end = scores.indptr[row], scores.indptr[row + 1]
+            slots = scores.indices[start:end]
+            row_scores = scores.data[start:end]
+
+            positive = row_scores > 0
+            slots, row_scores = slots[positive], row_scores[positive]
+
+            if len(row_scores) > top_k:
+                selected = np.argpartition(-row_scores, top_k - 1)[:top_k]
+                slots, row_scores = slots[selected], row_scores[selected]
+
+            order = np.lexsort((slots, -row_scores))
+            results.append([(self.doc_ids[slots[i]], float(row_scores[i])) for i in order])
+
+        return results
+
+    def thaw(self) -> BM25Index:
+        """
+        Convert back into a mutable index
+
+        Returns:
+            BM25Index with identical contents (slots preserved)
+        """
+        index = BM25Index(k1=self.k1, b=self.b, epsilon=self.epsilon)
+        index.doc_ids = list(self.doc_ids)
+        index.doc_lengths = [int(length) for length in self.doc_lengths]
+        index.doc_terms = [Counter() for _ in self.doc_ids]
+        index.slot_by_id = dict(self.slot_by_id)
+        index.total_length = self.total_length
+
+        offsets = np.asarray(self.term_offsets).tolist()
+        slots = np.asarray(self.posting_slots).tolist()
+        tfs = np.asarray(self.posting_tfs).tolist()
+        for term_id, term in enumerate(self.vocabulary):
+            start, end = offsets[term_id], offsets[term_id + 1]
+            term_postings = dict(zip(slots[start:end], tfs[start:end]))
+            index.postings[term] = term_postings
+            for slot, tf in term_postings.items():
+                index.doc_terms[slot][term] = tf
+
+        return index
@@ -1,12 +1,12 @@
 """
 BM25 Retriever for keyword-based search
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import structlog
-from rank_bm25 import BM25Okapi
-import numpy as np
 
 from ...config import settings
+from .bm25_index import BM25Index, FrozenBM25Index
+from .bm25_snapshot import load_snapshot, save_snapshot, snapshot_lock
 
 logger = structlog.get_logger()
 
@@ -18,51 +18,177 @@ class BM25Retriever:
     """
     
     def __init__(self):
-        self.bm25 = None
-        self.documents = []
-        self.document_ids = []
-        self.tokenized_corpus = []
         self.k1 = settings.bm25_k1
         self.b = settings.bm25_b
+        # BM25Index while mutable, FrozenBM25Index when memory-mapped from a snapshot
+        self.index = BM25Index(k1=self.k1, b=self.b)
+        self.documents = {}
         
         logger.info("bm25_retriever_initialized", k1=self.k1, b=self.b)
     
+    @property
+    def is_built(self) -> bool:
+        """True once at least one document is indexed"""
+        return self.index.num_docs > 0
+    
+    @property
+    def document_count(self) -> int:
+        """Number of indexed documents"""
+        return self.index.num_docs
+    
     def build_index(self, documents: List[Dict[str, Any]]):
         """
-        Build BM25 index from documents
+        Build BM25 index from documents (replaces the current index)
         
         Args:
             documents: List of dicts with 'id', 'content', 'metadata'
         """
         logger.info("building_bm25_index", count=len(documents))
         
-        self.documents = documents
-        self.document_ids = [doc['id'] for doc in documents]
-        
-        # Tokenize corpus
-        self.tokenized_corpus = [
-            self._tokenize(doc['content'])
-            for doc in documents
-        ]
-        
-        # Build BM25 index
-        self.bm25 = BM25Okapi(
-            self.tokenized_corpus,
-            k1=self.k1,
-            b=self.b
-        )
+        self.index = BM25Index(k1=self.k1, b=self.b)
+        self.documents = {}
+        self._index_documents(documents)
         
-        logger.info("bm25_index_built", documents=len(documents))
+        logger.info("bm25_index_built", documents=self.index.num_docs)
     
     def add_documents(self, documents: List[Dict[str, Any]]):
         """
-        Add documents to existing index (rebuild)
+        Add documents to the existing index incrementally
+        Documents whose id is already indexed are replaced
         
         Args:
             documents: New documents to add
         """
-        all_docs = self.documents + documents
-        self.build_index(all_docs)
+        self._index_documents(documents)
+        logger.info("bm25_documents_added", count=len(documents), total=self.index.num_docs)
+    
+    def update_documents(self, documents: List[Dict[str, Any]]):
+        """
+        Re-index documents whose content changed
+        
+        Args:
+            documents: Documents with 'id', 'content', 'metadata'
+        """
+        self._index_documents(documents)
+        logger.info("bm25_documents_updated", count=len(documents), total=self.index.num_docs)
+    
+    def delete_documents(self, ids: List[str]) -> int:
+        """
+        Remove documents from the index by chunk id
+        
+        Args:
+            ids: Chunk ids to remove
+            
+        Returns:
+            Number of documents actually removed
+        """
+        self._ensure_mutable()
+        removed = 0
+        for doc_id in ids:
+            if self.index.remove(doc_id):
+                self.documents.pop(doc_id, None)
+                removed += 1
+        
+        logger.info("bm25_documents_deleted", requested=len(ids), removed=removed, total=self.index.num_docs)
+        return removed
+    
+    def _ensure_mutable(self):
+        """Thaw a snapshot-backed index before the first mutation"""
+        if isinstance(self.index, FrozenBM25Index):
+            logger.info("bm25_thawing_snapshot_index", documents=self.index.num_docs)
+            self.documents = dict(self.documents.items())
+            self.index = self.index.thaw()
+    
+    def _index_documents(self, documents: List[Dict[str, Any]]):
+        self._ensure_mutable()
+        for doc in documents:
+            self.index.add(doc['id'], self._tokenize(doc['content']))
+            self.documents[doc['id']] = {
+                'content': doc['content'],
+                'metadata': doc.get('metadata', {})
+            }
+    
+    def build_from_collection(self, chroma_store):
+        """
+        Rebuild the index from every chunk of a ChromaDB collection (paginated)
+        
+        Args:
+            chroma_store: ChromaStore instance
+        """
+        self.build_index(list(chroma_store.iter_documents()))
+    
+    def load_snapshot(self, snapshot_dir: str, expected_stamp: Optional[str] = None) -> bool:
+        """
+        Replace the index with the memory-mapped on-disk snapshot
+        
+        Args:
+            snapshot_dir: Snapshot root directory
+            expected_stamp: Collection version stamp (None accepts any snapshot)
+            
+        Returns:
+            True if a fresh snapshot was loaded
+        """
+        try:
+            loaded = load_snapshot(snapshot_dir, expected_stamp=expected_stamp, k1=self.k1, b=self.b)
+        except Exception as e:
+            logger.warning("bm25_snapshot_load_failed", path=snapshot_dir, error=str(e))
+            return False
+        
+        if loaded is None:
+            return False
+        
+        self.index, self.documents = loaded
+        return True
+    
+    def save_snapshot(self, snapshot_dir: str, stamp: str) -> str:
+        """
+        Persist the current index as a new snapshot version
+        Callers must hold snapshot_lock(snapshot_dir)
+        
+        Args:
+            snapshot_dir: Snapshot root directory
+            stamp: Collection version stamp the index corresponds to
+            
+        Returns:
+            Path of the written snapshot
+        """
+        index = self.index if isinstance(self.index, FrozenBM25Index) else self.index.freeze()
+        return save_snapshot(snapshot_dir, index, self.documents, stamp)
+    
+    def load_or_build(self, chroma_store) -> str:
+        """
+        Load the snapshot if it matches the collection, otherwise rebuild it
+        
+        Only one process rebuilds (inter-process lock); the others wait and
+        then map the snapshot it wrote.
+        
+        Args:
+            chroma_store: ChromaStore instance
+            
+        Returns:
+            "snapshot" if loaded from disk, "rebuilt" otherwise
+        """
+        if not settings.bm25_snapshot_enabled:
+            self.build_from_collection(chroma_store)
+            return "rebuilt"
+        
+        snapshot_dir = settings.bm25_snapshot_dir
+        stamp = chroma_store.get_version_stamp()
+        
+        if self.load_snapshot(snapshot_dir, expected_stamp=stamp):
+            return "snapshot"
+        
+        with snapshot_lock(snapshot_dir):
+            # Another worker may have rebuilt it while we waited for the lock
+            if self.load_snapshot(snapshot_dir, expected_stamp=stamp):
+                return "snapshot"
+            
+            self.build_from_collection(chroma_store)
+            self.save_snapshot(snapshot_dir, stamp)
+        
+        # Switch to the mapped snapshot so index pages are shared between workers
+        self.load_snapshot(snapshot_dir, expected_stamp=stamp)
+        return "rebuilt"
     
     def search(self, query: str, top_k: int = 10) -> List[Dict[str, Any]]:
         """
@@ -75,34 +201,51 @@ class BM25Retriever:
         Returns:
             List of results with content, score, metadata
         """
-        if self.bm25 is None:
-            logger.warning("bm25_index_not_built")
-            return []
+        return self.search_batch([query], top_k=top_k)[0]
+    
+    def search_batch(self, queries: List[str], top_k: int = 10) -> List[List[Dict[str, Any]]]:
+        """
+        Search several queries with a single sparse matrix product
         
-        # Tokenize query
-        tokenized_query = self._tokenize(query)
+        Args:
+            queries: Search queries
+            top_k: Number of results per query
+            
+        Returns:
+            Per query, list of results with content, score, metadata
+        """
+        if not self.is_built:
+            logger.warning("bm25_index_not_built")
+            return [[] for _ in queries]
         
-        # Get BM25 scores
-        scores = self.bm25.get_scores(tokenized_query)
+        # Tokenize queries
+        tokenized_queries = [self._tokenize(query) for query in queries]
         
-        # Get top-k indices
-        top_indices = np.argsort(scores)[::-1][:top_k]
+        # Sparse scoring + top-k selection
+        hits = self.index.top_k_batch(tokenized_queries, top_k)
         
         # Build results
-        results = []
-        for idx in top_indices:
-            if scores[idx] > 0:  # Only include if score > 0
+        all_results = []
+        for query_hits in hits:
+            results = []
+            for doc_id, score in query_hits:
+                doc = self.documents[doc_id]
                 results.append({
-                    'content': self.documents[idx]['content'],
-                    'score': float(scores[idx]),
-                    'metadata': self.documents[idx].get('metadata', {}),
-                    'id': self.document_ids[idx],
+                    'content': doc['content'],
+                    'score': score,
+                    'metadata': doc['metadata'],
+                    'id': doc_id,
                     'rank': len(results) + 1
                 })
+            all_results.append(results)
         
-        logger.info("bm25_search_complete", query_length=len(tokenized_query), results=len(results))
+        logger.info(
+            "bm25_search_complete",
+            queries=len(queries),
+            results=sum(len(results) for results in all_results)
+        )
         
-        return results
+        return all_results
     
     def _tokenize(self, text: str) -> List[str]:
         """
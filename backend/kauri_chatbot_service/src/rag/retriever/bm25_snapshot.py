@@ -0,0 +1,303 @@
+"""
+On-disk BM25 snapshots
+Versioned directories of numpy arrays + text blobs, memory-mapped read-only
+so that every uvicorn worker shares the same index pages.
+
+Layout:
+    <snapshot_dir>/CURRENT          name of the active version directory
+    <snapshot_dir>/.lock            serializes rebuilds across processes
+    <snapshot_dir>/<version>/       manifest.json, vocabulary.json, doc_ids.json,
+                                    *.npy arrays (CSR postings + BM25 weights),
+                                    content.bin, metadata.bin
+"""
+from typing import Dict, Any, Iterator, Mapping, Optional, Tuple
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+import fcntl
+import json
+import mmap
+import os
+import shutil
+import uuid
+import structlog
+import numpy as np
+
+from .bm25_index import FrozenBM25Index
+
+logger = structlog.get_logger()
+
+SNAPSHOT_FORMAT_VERSION = 2
+CURRENT_FILE = "CURRENT"
+LOCK_FILE = ".lock"
+MANIFEST_FILE = "manifest.json"
+
+
+class SnapshotDocuments(Mapping):
+    """
+    Read-only chunk store backed by memory-mapped blobs
+
+    Maps chunk id -> {'content', 'metadata'}; text is decoded on access only.
+    """
+
+    def __init__(
+        self,
+        index: FrozenBM25Index,
+        content_blob,
+        content_offsets: np.ndarray,
+        metadata_blob,
+        metadata_offsets: np.ndarray
+    ):
+        self.index = index
+        self.content_blob = content_blob
+        self.content_offsets = content_offsets
+        self.metadata_blob = metadata_blob
+        self.metadata_offsets = metadata_offsets
+
+    def __getitem__(self, doc_id: str) -> Dict[str, Any]:
+        slot = self.index.slot_by_id[doc_id]
+        return {
+            'content': self._read(self.content_blob, self.content_offsets, slot),
+            'metadata': json.loads(self._read(self.metadata_blob, self.metadata_offsets, slot))
+        }
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index.doc_ids)
+
+    def __len__(self) -> int:
+        return self.index.num_docs
+
+    def __contains__(self, doc_id) -> bool:
+        return doc_id in self.index.slot_by_id
+
+    @staticmethod
+    def _read(blob, offsets: np.ndarray, slot: int) -> str:
+        return bytes(blob[int(offsets[slot]):int(offsets[slot + 1])]).decode("utf-8")
+
+
+def _write_blob(path: Path, values) -> np.ndarray:
+    """Write UTF-8 strings back to back, return their offsets"""
+    offsets = [0]
+    with open(path, "wb") as f:
+        for value in values:
+            data = value.encode("utf-8")
+            f.write(data)
+            offsets.append(offsets[-1] + len(data))
+    return np.asarray(offsets, dtype=np.int64)
+
+
+def _map_blob(path: Path):
+    """Memory-map a blob read-only (empty files cannot be mapped)"""
+    if path.stat().st_size == 0:
+        return b""
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+@contextmanager
+def snapshot_lock(snapshot_dir: str):
+    """
+    Exclusive inter-process lock on the snapshot directory
+
+    Held while checking staleness and rebuilding, so that only one worker
+    (or the ingestion script) rebuilds and the others load the result.
+    """
+    directory = Path(snapshot_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / LOCK_FILE, "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def read_manifest(snapshot_dir: str) -> Optional[Dict[str, Any]]:
+    """
+    Read the manifest of the active snapshot
+
+    Args:
+        snapshot_dir: Snapshot root directory
+
+    Returns:
+        Manifest dict (with 'path'), or None if there is no usable snapshot
+    """
+    directory = Path(snapshot_dir)
+    try:
+        version = (directory / CURRENT_FILE).read_text().strip()
+        version_dir = directory / version
+        manifest = json.loads((version_dir / MANIFEST_FILE).read_text())
+    except (OSError, ValueError):
+        return None
+
+    if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        return None
+
+    manifest["path"] = str(version_dir)
+    return manifest
+
+
+def save_snapshot(
+    snapshot_dir: str,
+    index: FrozenBM25Index,
+    documents: Mapping[str, Dict[str, Any]],
+    stamp: str
+) -> str:
+    """
+    Write a new snapshot version and make it current
+
+    The version is written to a temporary directory, renamed, then published
+    by atomically replacing CURRENT. The previous version is kept so that
+    processes still mapping it are unaffected; older ones are removed.
+
+    Args:
+        snapshot_dir: Snapshot root directory
+        index: Frozen index to persist
+        documents: Chunk id -> {'content', 'metadata'} for every indexed id
+        stamp: Collection version stamp the snapshot corresponds to
+
+    Returns:
+        Path of the new version directory
+    """
+    directory = Path(snapshot_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    version = f"v{datetime.utcnow().strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:8]}"
+    tmp_dir = directory / f".tmp_{version}"
+    tmp_dir.mkdir()
+
+    try:
+        # Offsets and slots share one dtype so scipy maps them without copying
+        index_dtype = np.int32 if len(index.posting_slots) < np.iinfo(np.int32).max else np.int64
+        np.save(tmp_dir / "term_offsets.npy", np.asarray(index.term_offsets, dtype=index_dtype))
+        np.save(tmp_dir / "posting_slots.npy", np.asarray(index.posting_slots, dtype=index_dtype))
+        np.save(tmp_dir / "posting_tfs.npy", np.asarray(index.posting_tfs, dtype=np.int32))
+        np.save(tmp_dir / "posting_weights.npy", np.asarray(index.posting_weights, dtype=np.float64))
+        np.save(tmp_dir / "doc_lengths.npy", np.asarray(index.doc_lengths, dtype=np.int32))
+
+        chunks = [documents[doc_id] for doc_id in index.doc_ids]
+        np.save(
+            tmp_dir / "content_offsets.npy",
+            _write_blob(tmp_dir / "content.bin", (chunk['content'] for chunk in chunks))
+        )
+        np.save(
+            tmp_dir / "metadata_offsets.npy",
+            _write_blob(
+                tmp_dir / "metadata.bin",
+                (json.dumps(chunk.get('metadata') or {}, ensure_ascii=False) for chunk in chunks)
+            )
+        )
+
+        with open(tmp_dir / "vocabulary.json", "w", encoding="utf-8") as f:
+            json.dump(index.vocabulary, f, ensure_ascii=False)
+        with open(tmp_dir / "doc_ids.json", "w", encoding="utf-8") as f:
+            json.dump(index.doc_ids, f)
+
+        manifest = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "stamp": stamp,
+            "num_docs": index.num_docs,
+            "num_terms": len(index.vocabulary),
+            "num_postings": int(len(index.posting_slots)),
+            "k1": index.k1,
+            "b": index.b,
+            "epsilon": index.epsilon,
+            "created_at": datetime.utcnow().isoformat()
+        }
+        with open(tmp_dir / MANIFEST_FILE, "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        tmp_dir.rename(directory / version)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    previous = read_manifest(snapshot_dir)
+
+    current_tmp = directory / f"{CURRENT_FILE}.tmp"
+    current_tmp.write_text(version)
+    os.replace(current_tmp, directory / CURRENT_FILE)
+
+    # Keep the new and the previous version only
+    keep = {version, Path(previous["path"]).name if previous else None}
+    for entry in directory.iterdir():
+        if entry.is_dir() and entry.name not in keep:
+            shutil.rmtree(entry, ignore_errors=True)
+
+    logger.info(
+        "bm25_snapshot_saved",
+        version=version,
+        stamp=stamp,
+        num_docs=manifest["num_docs"],
+        num_terms=manifest["num_terms"]
+    )
+
+    return str(directory / version)
+
+
+def load_snapshot(
+    snapshot_dir: str,
+    expected_stamp: Optional[str] = None,
+    k1: Optional[float] = None,
+    b: Optional[float] = None
+) -> Optional[Tuple[FrozenBM25Index, SnapshotDocuments]]:
+    """
+    Memory-map the active snapshot read-only
+
+    Args:
+        snapshot_dir: Snapshot root directory
+        expected_stamp: Collection version stamp; a different stamp means stale
+        k1: Expected BM25 k1 (snapshot is stale if it differs)
+        b: Expected BM25 b (snapshot is stale if it differs)
+
+    Returns:
+        (index, documents) or None if missing or stale
+    """
+    manifest = read_manifest(snapshot_dir)
+    if manifest is None:
+        logger.info("bm25_snapshot_missing", path=snapshot_dir)
+        return None
+
+    if expected_stamp is not None and manifest["stamp"] != expected_stamp:
+        logger.info("bm25_snapshot_stale", snapshot_stamp=manifest["stamp"], collection_stamp=expected_stamp)
+        return None
+
+    if (k1 is not None and manifest["k1"] != k1) or (b is not None and manifest["b"] != b):
+        logger.info("bm25_snapshot_parameters_changed", snapshot_k1=manifest["k1"], snapshot_b=manifest["b"])
+        return None
+
+    path = Path(manifest["path"])
+    with open(path / "vocabulary.json", encoding="utf-8") as f:
+        vocabulary = json.load(f)
+    with open(path / "doc_ids.json", encoding="utf-8") as f:
+        doc_ids = json.load(f)
+
+    index = FrozenBM25Index(
+        vocabulary=vocabulary,
+        term_offsets=np.load(path / "term_offsets.npy", mmap_mode="r"),
+        posting_slots=np.load(path / "posting_slots.npy", mmap_mode="r"),
+        posting_tfs=np.load(path / "posting_tfs.npy", mmap_mode="r"),
+        doc_ids=doc_ids,
+        doc_lengths=np.load(path / "doc_lengths.npy", mmap_mode="r"),
+        k1=manifest["k1"],
+        b=manifest["b"],
+        epsilon=manifest["epsilon"],
+        posting_weights=np.load(path / "posting_weights.npy", mmap_mode="r")
+    )
+    documents = SnapshotDocuments(
+        index,
+        content_blob=_map_blob(path / "content.bin"),
+        content_offsets=np.load(path / "content_offsets.npy", mmap_mode="r"),
+        metadata_blob=_map_blob(path / "metadata.bin"),
+        metadata_offsets=np.load(path / "metadata_offsets.npy", mmap_mode="r")
+    )
+
+    logger.info(
+        "bm25_snapshot_loaded",
+        version=path.name,
+        stamp=manifest["stamp"],
+        num_docs=index.num_docs,
+        num_terms=len(vocabulary)
+    )
+
+    return index, documents
@@ -2,13 +2,16 @@
 Hybrid Retriever combining Vector + BM25 + Reranking
 """
 from typing import List, Dict, Any
+import asyncio
 import structlog
 
 from ...config import settings
+from ...utils.executors import run_blocking
 from ..embedder.bge_embedder import get_embedder
 from ..vector_store.chroma_store import get_chroma_store
 from .bm25_retriever import get_bm25_retriever
 from ..reranker.cross_encoder_reranker import get_reranker
+from .result_cache import get_result_cache
 
 logger = structlog.get_logger()
 
@@ -20,6 +23,9 @@ class HybridRetriever:
     2. BM25 search (lexical)
     3. Score fusion
     4. Cross-encoder reranking
+
+    Blocking stages run on the retrieval executor; the vector leg
+    (embedding + ChromaDB) and BM25 run concurrently.
     """
     
     def __init__(self):
@@ -27,6 +33,7 @@ class HybridRetriever:
         self.vector_store = get_chroma_store()
         self.bm25_retriever = get_bm25_retriever()
         self.reranker = get_reranker()
+        self.result_cache = get_result_cache()
         
         self.vector_weight = 0.6  # Weight for vector search
         self.bm25_weight = 0.4    # Weight for BM25 search
@@ -64,16 +71,23 @@ class HybridRetriever:
                    top_k=top_k,
                    requested_count=requested_count)
 
-        # Step 1: Vector Search
-        query_embedding = self.embedder.embed_text(query)
-        vector_results = self.vector_store.search(
-            query_embedding,
-            top_k=top_k * 2  # Get more candidates
+        cache_params = {
+            "query": query,
+            "top_k": top_k,
+            "use_reranking": use_reranking,
+            "requested_count": requested_count
+        }
+        if self.result_cache is not None:
+            cached = await self.result_cache.get("hybrid", cache_params)
+            if cached is not None:
+                return cached
+
+        # Step 1+2: Vector search and BM25 search in parallel
+        vector_results, bm25_results = await asyncio.gather(
+            self._vector_search(query, top_k=top_k * 2),  # Get more candidates
+            run_blocking(self.bm25_retriever.search, query, top_k=top_k * 2)
         )
         logger.info("vector_search_complete", results=len(vector_results))
-
-        # Step 2: BM25 Search
-        bm25_results = self.bm25_retriever.search(query, top_k=top_k * 2)
         logger.info("bm25_search_complete", results=len(bm25_results))
 
         # Step 3: Fusion
@@ -84,7 +98,7 @@ class HybridRetriever:
         if use_reranking and settings.rag_rerank_top_k > 0:
             # Take top candidates for reranking
             candidates = fused_results[:top_k * 2]
-            final_results = self.reranker.rerank(
+            final_results = await self.reranker.arerank(
                 query,
                 candidates,
                 top_k=settings.rag_rerank_top_k,
@@ -97,8 +111,78 @@ class HybridRetriever:
 
         logger.info("hybrid_retrieval_complete", final_results=len(final_results))
 
+        if self.result_cache is not None:
+            await self.result_cache.set("hybrid", cache_params, final_results)
+
         return final_results
     
+    async def retrieve_many(
+        self,
+        queries: List[str],
+        top_k: int = None,
+        use_reranking: bool = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Hybrid retrieval for several queries (e.g. sourcing keywords)
+        BM25 scores every query in one sparse matrix product
+
+        Args:
+            queries: Search queries
+            top_k: Final number of results per query (default: from settings)
+            use_reranking: Whether to apply reranking (default: from settings)
+
+        Returns:
+            Per query, list of relevant documents with scores
+        """
+        top_k = top_k or settings.rag_top_k
+        use_reranking = use_reranking if use_reranking is not None else settings.rag_enable_reranking
+
+        logger.info("hybrid_retrieval_many_start", queries=len(queries), top_k=top_k)
+
+        # One BM25 batch in parallel with every query's vector leg
+        bm25_batches, *vector_batches = await asyncio.gather(
+            run_blocking(self.bm25_retriever.search_batch, queries, top_k=top_k * 2),
+            *(self._vector_search(query, top_k=top_k * 2) for query in queries)
+        )
+
+        async def finalize(query, vector_results, bm25_results):
+            fused_results = self._fuse_results(vector_results, bm25_results)
+            if use_reranking and settings.rag_rerank_top_k > 0:
+                return await self.reranker.arerank(
+                    query,
+                    fused_results[:top_k * 2],
+                    top_k=settings.rag_rerank_top_k,
+                    use_dynamic_filtering=True
+                )
+            return fused_results[:top_k]
+
+        all_results = await asyncio.gather(*(
+            finalize(query, vector_results, bm25_results)
+            for query, vector_results, bm25_results in zip(queries, vector_batches, bm25_batches)
+        ))
+
+        logger.info(
+            "hybrid_retrieval_many_complete",
+            queries=len(queries),
+            final_results=sum(len(results) for results in all_results)
+        )
+
+        return list(all_results)
+
+    async def _vector_search(self, query: str, top_k: int) -> List[Dict[str, Any]]:
+        """
+        Embed the query (micro-batched) and search ChromaDB off the event loop
+
+        Args:
+            query: Search query
+            top_k: Number of candidates
+
+        Returns:
+            Vector search results
+        """
+        query_embedding = await self.embedder.aembed_text(query)
+        return await run_blocking(self.vector_store.search, query_embedding, top_k=top_k)
+
     def _fuse_results(
         self,
         vector_results: List[Dict[str, Any]],
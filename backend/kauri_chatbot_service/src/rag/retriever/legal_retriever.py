@@ -7,6 +7,7 @@ import structlog
 
 from ...config import settings
 from .hybrid_retriever import get_hybrid_retriever
+from .result_cache import get_result_cache
 from ..agents.reference_parser import get_reference_parser, LegalReference
 
 logger = structlog.get_logger()
@@ -27,6 +28,7 @@ class LegalRetriever:
         """Initialize legal retriever with hybrid retriever and reference parser"""
         self.hybrid_retriever = get_hybrid_retriever()
         self.reference_parser = get_reference_parser()
+        self.result_cache = get_result_cache()
 
         logger.info("legal_retriever_initialized")
 
@@ -265,6 +267,26 @@ class LegalRetriever:
         Returns:
             Documents pertinents
         """
+        cache_params = {"query": query, "legal_metadata": legal_metadata, "top_k": top_k}
+        if self.result_cache is not None:
+            cached = await self.result_cache.get("legal_enhanced", cache_params)
+            if cached is not None:
+                return cached
+
+        documents = await self._retrieve_enhanced(query, legal_metadata, top_k)
+
+        if self.result_cache is not None:
+            await self.result_cache.set("legal_enhanced", cache_params, documents)
+
+        return documents
+
+    async def _retrieve_enhanced(
+        self,
+        query: str,
+        legal_metadata: Optional[Dict[str, Any]],
+        top_k: int
+    ) -> List[Dict[str, Any]]:
+        """Routage de retrieve_enhanced (sans cache)"""
         if not legal_metadata:
             # Fallback to standard hybrid retrieval
             logger.info("legal_retrieve_enhanced_fallback_to_hybrid")
@@ -0,0 +1,156 @@
+"""
+Retrieval result cache
+Stores ranked chunk ids + scores (not chunk contents) per
+(query, top_k, requested_count, filters), tagged with the corpus epoch.
+Contents are rehydrated from the BM25 chunk store (ChromaDB as fallback).
+"""
+from typing import List, Dict, Any, Optional
+import hashlib
+import json
+import structlog
+
+from ...config import settings
+from ...utils.cache_backends import create_cache_backend
+from ...utils.executors import run_blocking
+from ..corpus_epoch import get_corpus_epoch
+
+logger = structlog.get_logger()
+
+# Per-document fields kept in the cache (content/metadata are rehydrated)
+CACHED_FIELDS = (
+    "id", "score", "rank", "vector_score", "bm25_score",
+    "fusion_score", "rerank_score", "original_score"
+)
+
+
+class RetrievalResultCache:
+    """
+    Cache of ranked retrieval results
+
+    Keys include the corpus epoch, so entries from before an ingestion are
+    never served; they age out through TTL/LRU.
+    """
+
+    def __init__(self):
+        self.backend = create_cache_backend(
+            namespace="retrieval",
+            max_entries=settings.retrieval_cache_max_entries,
+            ttl=settings.retrieval_cache_ttl
+        )
+        self.epoch = get_corpus_epoch()
+
+        self.hits = 0
+        self.misses = 0
+        self.hydration_failures = 0
+
+    @staticmethod
+    def make_key(kind: str, epoch: str, params: Dict[str, Any]) -> str:
+        """Stable key for a retrieval call"""
+        params = dict(params)
+        if "query" in params:
+            params["query"] = " ".join(params["query"].split())
+        raw = json.dumps({"kind": kind, "epoch": epoch, "params": params}, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def get(self, kind: str, params: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up cached results
+
+        Args:
+            kind: Retrieval entry point ("hybrid", "legal_enhanced")
+            params: Call parameters (query, top_k, filters...)
+
+        Returns:
+            Documents (fresh dicts with content and metadata) or None
+        """
+        epoch = await self.epoch.current()
+        if epoch is None:
+            return None
+
+        entries = await self.backend.get(self.make_key(kind, epoch, params))
+        if entries is None:
+            self.misses += 1
+            return None
+
+        documents = await self._hydrate(entries)
+        if documents is None:
+            self.hydration_failures += 1
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        logger.info("retrieval_cache_hit", kind=kind, results=len(documents))
+        return documents
+
+    async def set(self, kind: str, params: Dict[str, Any], documents: List[Dict[str, Any]]):
+        """
+        Store results (skipped if a document has no chunk id)
+
+        Args:
+            kind: Retrieval entry point
+            params: Call parameters
+            documents: Ranked documents
+        """
+        epoch = await self.epoch.current()
+        if epoch is None or any(not doc.get("id") for doc in documents):
+            return
+
+        entries = [
+            {field: doc[field] for field in CACHED_FIELDS if field in doc}
+            for doc in documents
+        ]
+        await self.backend.set(self.make_key(kind, epoch, params), entries)
+
+    async def _hydrate(self, entries: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """Attach content and metadata to cached entries"""
+        from .bm25_retriever import get_bm25_retriever
+        from ..vector_store.chroma_store import get_chroma_store
+
+        chunks = {}
+        store = get_bm25_retriever().documents
+        for entry in entries:
+            if entry["id"] in store:
+                chunks[entry["id"]] = store[entry["id"]]
+
+        missing = [entry["id"] for entry in entries if entry["id"] not in chunks]
+        if missing:
+            try:
+                chunks.update(await run_blocking(get_chroma_store().get_documents, missing))
+            except Exception as e:
+                logger.warning("retrieval_cache_hydration_failed", error=str(e))
+                return None
+
+        if any(entry["id"] not in chunks for entry in entries):
+            return None
+
+        return [
+            {
+                **entry,
+                "content": chunks[entry["id"]]["content"],
+                "metadata": dict(chunks[entry["id"]]["metadata"])
+            }
+            for entry in entries
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hydration_failures": self.hydration_failures,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "epoch": self.epoch.value,
+            **self.backend.get_stats()
+        }
+
+
+# Global singleton
+_result_cache = None
+
+def get_result_cache() -> Optional[RetrievalResultCache]:
+    """Get global retrieval result cache (None when disabled)"""
+    global _result_cache
+    if _result_cache is None and settings.retrieval_cache_enabled:
+        _result_cache = RetrievalResultCache()
+    return _result_cache
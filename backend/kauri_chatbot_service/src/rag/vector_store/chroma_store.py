@@ -1,7 +1,8 @@
 """
 ChromaDB Vector Store for document embeddings
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
+import uuid
 import structlog
 import chromadb
 from chromadb.config import Settings as ChromaSettings
@@ -115,12 +116,14 @@ class ChromaStore:
             # Format results
             formatted_results = []
             if results and results["documents"]:
-                for i, (doc, metadata, distance) in enumerate(zip(
+                for i, (doc_id, doc, metadata, distance) in enumerate(zip(
+                    results["ids"][0],
                     results["documents"][0],
                     results["metadatas"][0],
                     results["distances"][0]
                 )):
                     formatted_results.append({
+                        "id": doc_id,
                         "content": doc,
                         "score": 1.0 - distance,  # Convert distance to similarity
                         "metadata": metadata,
@@ -135,6 +138,27 @@ class ChromaStore:
             logger.error("chromadb_search_failed", error=str(e))
             return []
     
+    def get_documents(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch chunks by id
+        
+        Args:
+            ids: Chunk ids
+            
+        Returns:
+            Dict chunk id -> {'content', 'metadata'} (missing ids are absent)
+        """
+        if not ids:
+            return {}
+        
+        results = self.collection.get(ids=ids, include=["documents", "metadatas"])
+        return {
+            doc_id: {"content": content, "metadata": metadata or {}}
+            for doc_id, content, metadata in zip(
+                results["ids"], results["documents"], results["metadatas"]
+            )
+        }
+    
     def delete_documents(self, ids: List[str]):
         """Delete documents by IDs"""
         try:
@@ -148,6 +172,73 @@ class ChromaStore:
         """Get total number of documents in collection"""
         return self.collection.count()
     
+    def iter_documents(
+        self,
+        include: Optional[List[str]] = None,
+        batch_size: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the whole collection page by page
+        
+        Args:
+            include: Fields to fetch (default: documents and metadatas)
+            batch_size: Page size (default: settings.vector_db_page_size)
+            
+        Yields:
+            Dicts with 'id' plus the included fields ('content', 'metadata')
+        """
+        include = include or ["documents", "metadatas"]
+        batch_size = batch_size or settings.vector_db_page_size
+        offset = 0
+        
+        while True:
+            page = self.collection.get(include=include, limit=batch_size, offset=offset)
+            ids = page["ids"] if page else []
+            if not ids:
+                break
+            
+            documents = page.get("documents") or [None] * len(ids)
+            metadatas = page.get("metadatas") or [None] * len(ids)
+            for doc_id, content, metadata in zip(ids, documents, metadatas):
+                yield {"id": doc_id, "content": content, "metadata": metadata or {}}
+            
+            if len(ids) < batch_size:
+                break
+            offset += batch_size
+    
+    def get_version_stamp(self) -> str:
+        """
+        Get the collection version stamp
+        
+        Combines the corpus version written by ingestion (collection
+        metadata) with the chunk count, so derived indexes (BM25 snapshot)
+        can detect that they are stale.
+        
+        Returns:
+            Version stamp string
+        """
+        metadata = self.client.get_collection(name=self.collection_name).metadata or {}
+        return f"{metadata.get('corpus_version', '0')}:{self.collection.count()}"
+    
+    def bump_corpus_version(self) -> str:
+        """
+        Record that the corpus changed (called by ingestion after writes)
+        
+        Returns:
+            New corpus version
+        """
+        collection = self.client.get_collection(name=self.collection_name)
+        # hnsw:* keys cannot be passed to modify()
+        metadata = {
+            key: value for key, value in (collection.metadata or {}).items()
+            if not key.startswith("hnsw:")
+        }
+        metadata["corpus_version"] = uuid.uuid4().hex
+        collection.modify(metadata=metadata)
+        
+        logger.info("corpus_version_bumped", corpus_version=metadata["corpus_version"])
+        return metadata["corpus_version"]
+    
     def clear(self):
         """Clear all documents from collection"""
         try:
@@ -64,6 +64,8 @@ class ConversationResponse(BaseModel):
     is_archived: bool = Field(..., description="Archive status")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Conversation metadata")
     message_count: int = Field(..., description="Number of messages in conversation")
+    last_message_preview: Optional[str] = Field(None, description="Beginning of the last message (listing only)")
+    last_message_at: Optional[datetime] = Field(None, description="Timestamp of the last message (listing only)")
 
     class Config:
         from_attributes = True
@@ -81,6 +83,7 @@ class ConversationListResponse(BaseModel):
     total: int = Field(..., description="Total number of conversations")
     limit: int = Field(..., description="Limit applied")
     offset: int = Field(..., description="Offset applied")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page (keyset pagination), None on the last page")
 
 
 # ============================================
@@ -142,3 +145,4 @@ class ConversationContextInfo(BaseModel):
     is_near_limit: bool = Field(..., description="Whether context is near limit (warning)")
     usage_percentage: float = Field(..., description="Percentage of context used")
     messages_included: int = Field(..., description="Number of messages included in context")
+    conversation_tokens: int = Field(0, description="Running token total of the whole conversation")
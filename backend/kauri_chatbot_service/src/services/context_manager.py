@@ -3,7 +3,8 @@ Conversation Context Manager - Manages conversation history and context limits
 """
 import uuid
 from typing import List, Dict, Any, Optional, Tuple
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
 from datetime import datetime
 import structlog
 
@@ -11,6 +12,7 @@ from src.models.message import Message
 from src.models.conversation import Conversation
 from src.config import settings
 from src.utils.token_counter import TokenCounter
+from src.services.conversation_cache import get_conversation_cache
 
 logger = structlog.get_logger()
 
@@ -25,7 +27,8 @@ class ContextInfo:
         warning_threshold_tokens: int,
         is_over_limit: bool,
         is_near_limit: bool,
-        messages_included: int
+        messages_included: int,
+        conversation_tokens: int = 0
     ):
         self.total_tokens = total_tokens
         self.max_tokens = max_tokens
@@ -33,6 +36,7 @@ class ContextInfo:
         self.is_over_limit = is_over_limit
         self.is_near_limit = is_near_limit
         self.messages_included = messages_included
+        self.conversation_tokens = conversation_tokens
         self.usage_percentage = (total_tokens / max_tokens * 100) if max_tokens > 0 else 0
 
     def to_dict(self) -> Dict[str, Any]:
@@ -44,7 +48,8 @@ class ContextInfo:
             "is_over_limit": self.is_over_limit,
             "is_near_limit": self.is_near_limit,
             "usage_percentage": round(self.usage_percentage, 2),
-            "messages_included": self.messages_included
+            "messages_included": self.messages_included,
+            "conversation_tokens": self.conversation_tokens
         }
 
 
@@ -62,9 +67,9 @@ class ConversationContextManager:
         self.max_messages = settings.conversation_history_max_messages
         self.warning_threshold_tokens = int(self.max_context_tokens * self.warning_threshold)
 
-    def get_conversation_context(
+    async def get_conversation_context(
         self,
-        db: Session,
+        db: AsyncSession,
         conversation_id: uuid.UUID,
         include_current_query: bool = True,
         current_query: Optional[str] = None
@@ -81,59 +86,165 @@ class ConversationContextManager:
         Returns:
             Tuple of (messages, context_info)
         """
-        # Get conversation messages (most recent first, then reverse)
-        messages = db.query(Message).filter(
-            Message.conversation_id == conversation_id,
-            Message.deleted_at.is_(None)
-        ).order_by(Message.created_at.desc()).limit(self.max_messages).all()
-
-        messages = list(reversed(messages))  # Chronological order
-
-        # Convert to dict format
-        message_dicts = []
-        for msg in messages:
-            message_dict = {
-                "id": str(msg.id),
-                "role": msg.role,
-                "content": msg.content,
-                "sources": msg.sources or [],
-                "created_at": msg.created_at.isoformat() if msg.created_at else None
-            }
-            message_dicts.append(message_dict)
-
-        # Calculate tokens
-        total_tokens = TokenCounter.estimate_tokens_from_messages(message_dicts)
-
-        # Add current query tokens if needed
-        if include_current_query and current_query:
-            total_tokens += TokenCounter.estimate_tokens(current_query)
-            total_tokens += 10  # Overhead
-
-        # Determine limits
-        is_over_limit = total_tokens >= self.max_context_tokens
-        is_near_limit = total_tokens >= self.warning_threshold_tokens
-
-        context_info = ContextInfo(
-            total_tokens=total_tokens,
-            max_tokens=self.max_context_tokens,
-            warning_threshold_tokens=self.warning_threshold_tokens,
-            is_over_limit=is_over_limit,
-            is_near_limit=is_near_limit,
-            messages_included=len(message_dicts)
+        # Recent messages, chronological (window cache, database on miss)
+        message_dicts = await self.get_recent_messages(db, conversation_id)
+
+        # Stored per-message counts (estimated only for messages saved before they existed)
+        history_tokens = TokenCounter.estimate_tokens_from_messages(message_dicts)
+        context_info = await self._build_context_info(
+            db, conversation_id, history_tokens, len(message_dicts),
+            current_query if include_current_query else None
         )
 
         logger.info(
             "conversation_context_retrieved",
             conversation_id=str(conversation_id),
-            total_tokens=total_tokens,
+            total_tokens=context_info.total_tokens,
             max_tokens=self.max_context_tokens,
-            is_over_limit=is_over_limit,
-            is_near_limit=is_near_limit,
+            is_over_limit=context_info.is_over_limit,
+            is_near_limit=context_info.is_near_limit,
             messages_count=len(message_dicts)
         )
 
         return message_dicts, context_info
 
+    async def get_recent_messages(self, db: AsyncSession, conversation_id: uuid.UUID) -> List[Dict[str, Any]]:
+        """
+        Last messages of a conversation, chronological
+
+        Args:
+            db: Database session
+            conversation_id: UUID of conversation
+
+        Returns:
+            Message dicts (id, role, content, sources, token_count, created_at)
+        """
+        return (await self._get_window(db, conversation_id))["messages"]
+
+    async def _get_window(self, db: AsyncSession, conversation_id: uuid.UUID) -> Dict[str, Any]:
+        """Recent messages and assistant sources, loaded from the database on cache miss"""
+        cache = get_conversation_cache()
+        window = await cache.get(conversation_id) if cache else None
+        if window is not None:
+            return window
+
+        # Most recent first, then reverse
+        messages = (await db.scalars(
+            select(Message).where(
+                Message.conversation_id == conversation_id,
+                Message.deleted_at.is_(None)
+            ).order_by(Message.created_at.desc()).limit(self.max_messages)
+        )).all()
+
+        assistant_sources = (await db.scalars(
+            select(Message.sources).where(
+                Message.conversation_id == conversation_id,
+                Message.role == "assistant",
+                Message.deleted_at.is_(None)
+            ).order_by(Message.created_at.desc()).limit(self.max_messages)
+        )).all()
+
+        window = {
+            "messages": [self._to_context_dict(msg) for msg in reversed(messages)],
+            "assistant_sources": [sources or [] for sources in reversed(assistant_sources)]
+        }
+        if cache:
+            await cache.put(conversation_id, window["messages"], window["assistant_sources"])
+        return window
+
+    @staticmethod
+    def _to_context_dict(msg: Message) -> Dict[str, Any]:
+        return {
+            "id": str(msg.id),
+            "role": msg.role,
+            "content": msg.content,
+            "sources": msg.sources or [],
+            "token_count": msg.token_count,
+            "created_at": msg.created_at.isoformat() if msg.created_at else None
+        }
+
+    async def record_message(self, message: Message):
+        """
+        Write-through of a saved message to the window cache
+
+        Args:
+            message: Committed Message
+        """
+        cache = get_conversation_cache()
+        if cache:
+            await cache.append(message.conversation_id, self._to_context_dict(message))
+
+    async def invalidate(self, conversation_id: uuid.UUID):
+        """
+        Drop a conversation from the window cache (messages deleted)
+
+        Args:
+            conversation_id: UUID of conversation
+        """
+        cache = get_conversation_cache()
+        if cache:
+            await cache.invalidate(conversation_id)
+
+    async def get_context_info(
+        self,
+        db: AsyncSession,
+        conversation_id: uuid.UUID,
+        current_query: Optional[str] = None
+    ) -> ContextInfo:
+        """
+        Context limits from the stored token counts only (one aggregate
+        query, no message content loaded or re-tokenized)
+
+        Args:
+            db: Database session
+            conversation_id: UUID of conversation
+            current_query: Optional current user query to include
+
+        Returns:
+            ContextInfo
+        """
+        window = select(Message.token_count.label("token_count")).where(
+            Message.conversation_id == conversation_id,
+            Message.deleted_at.is_(None)
+        ).order_by(Message.created_at.desc()).limit(self.max_messages).subquery()
+
+        history_tokens, messages_included = (await db.execute(
+            select(
+                func.coalesce(func.sum(window.c.token_count), 0),
+                func.count()
+            ).select_from(window)
+        )).one()
+
+        return await self._build_context_info(db, conversation_id, history_tokens, messages_included, current_query)
+
+    async def _build_context_info(
+        self,
+        db: AsyncSession,
+        conversation_id: uuid.UUID,
+        history_tokens: int,
+        messages_included: int,
+        current_query: Optional[str] = None
+    ) -> ContextInfo:
+        """Apply the limits to the history window total (+ current query)"""
+        total_tokens = history_tokens
+        if current_query:
+            total_tokens += TokenCounter.count_tokens(current_query)
+            total_tokens += TokenCounter.MESSAGE_OVERHEAD_TOKENS
+
+        conversation_tokens = await db.scalar(
+            select(Conversation.total_tokens).where(Conversation.id == conversation_id)
+        ) or 0
+
+        return ContextInfo(
+            total_tokens=total_tokens,
+            max_tokens=self.max_context_tokens,
+            warning_threshold_tokens=self.warning_threshold_tokens,
+            is_over_limit=total_tokens >= self.max_context_tokens,
+            is_near_limit=total_tokens >= self.warning_threshold_tokens,
+            messages_included=messages_included,
+            conversation_tokens=conversation_tokens
+        )
+
     def should_retrieve_new_documents(
         self,
         query: str,
@@ -247,26 +358,20 @@ class ConversationContextManager:
 
         return False
 
-    def get_recent_sources(
+    async def get_recent_sources(
         self,
-        db: Session,
+        db: AsyncSession,
         conversation_id: uuid.UUID,
         limit: int = 5
     ) -> List[Dict[str, Any]]:
         """Return recent assistant sources with enriched metadata"""
-        messages = db.query(Message).filter(
-            Message.conversation_id == conversation_id,
-            Message.role == "assistant",
-            Message.deleted_at.is_(None)
-        ).order_by(Message.created_at.desc()).limit(self.max_messages).all()
+        assistant_sources = (await self._get_window(db, conversation_id))["assistant_sources"]
 
         collected: List[Dict[str, Any]] = []
         seen_keys = set()
 
-        for msg in messages:
-            if not msg.sources:
-                continue
-            for source in msg.sources:
+        for sources in reversed(assistant_sources):
+            for source in sources:
                 key = source.get("file_path") or source.get("title")
                 if key and key in seen_keys:
                     continue
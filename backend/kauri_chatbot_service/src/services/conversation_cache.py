@@ -0,0 +1,158 @@
+"""
+Write-through cache of recent conversation windows
+Per active conversation: the last CONVERSATION_HISTORY_MAX_MESSAGES messages
+(as returned by the context manager) and the sources of the last assistant
+messages. Filled on the first read, appended to by save_message, invalidated
+by deletes; idle conversations expire after CONVERSATION_CACHE_TTL (every
+appended message restarts it).
+- memory: per-process (default, single uvicorn worker)
+- redis:  shared by every worker (CACHE_BACKEND=redis)
+"""
+from typing import Any, Dict, List, Optional
+import structlog
+
+from src.config import settings
+from src.utils.cache_backends import create_cache_backend
+
+logger = structlog.get_logger()
+
+
+class ConversationWindowCache:
+    """
+    Recent messages and assistant sources per conversation
+
+    Entries are {"messages": [...], "assistant_sources": [[...], ...]}, both
+    chronological. Stored in a cache backend (memory LRU or redis.asyncio),
+    so every method is awaited on the event loop without blocking it.
+    """
+
+    def __init__(
+        self,
+        window_size: Optional[int] = None,
+        max_conversations: Optional[int] = None,
+        ttl: Optional[int] = None,
+        backend: Optional[str] = None
+    ):
+        """
+        Args:
+            window_size: Messages (and assistant source lists) kept per conversation
+            max_conversations: LRU size (memory backend)
+            ttl: Idle time before a conversation is evicted (seconds)
+            backend: "memory" or "redis" (default: settings.cache_backend)
+        """
+        self.window_size = window_size or settings.conversation_history_max_messages
+        self.max_conversations = max_conversations or settings.conversation_cache_max_conversations
+        self.ttl = ttl or settings.conversation_cache_ttl
+        self.backend = create_cache_backend(
+            namespace="conversation_window",
+            max_entries=self.max_conversations,
+            ttl=self.ttl,
+            backend=backend
+        )
+
+        self.hits = 0
+        self.misses = 0
+        self.appends = 0
+        self.invalidations = 0
+
+    async def get(self, conversation_id: Any) -> Optional[Dict[str, Any]]:
+        """
+        Cached window of a conversation
+
+        Args:
+            conversation_id: Conversation UUID
+
+        Returns:
+            Entry (copies of the cached messages) or None on miss
+        """
+        entry = await self.backend.get(str(conversation_id))
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return {
+            "messages": [dict(message) for message in entry["messages"]],
+            "assistant_sources": [list(sources) for sources in entry["assistant_sources"]]
+        }
+
+    async def put(
+        self,
+        conversation_id: Any,
+        messages: List[Dict[str, Any]],
+        assistant_sources: List[List[Dict[str, Any]]]
+    ):
+        """
+        Store a window loaded from the database
+
+        Args:
+            conversation_id: Conversation UUID
+            messages: Last messages, chronological
+            assistant_sources: Sources of the last assistant messages, chronological
+        """
+        await self.backend.set(str(conversation_id), {
+            "messages": [dict(message) for message in messages[-self.window_size:]],
+            "assistant_sources": [list(sources) for sources in assistant_sources[-self.window_size:]]
+        })
+
+    async def append(self, conversation_id: Any, message: Dict[str, Any]):
+        """
+        Write-through of a saved message (no-op if the conversation is not cached)
+
+        Args:
+            conversation_id: Conversation UUID
+            message: Message dict in the context manager format
+        """
+        key = str(conversation_id)
+        entry = await self.backend.get(key)
+        if entry is None:
+            return
+
+        # New lists: the memory backend hands out the cached object itself
+        entry = {
+            "messages": (entry["messages"] + [message])[-self.window_size:],
+            "assistant_sources": entry["assistant_sources"]
+        }
+        if message.get("role") == "assistant":
+            entry["assistant_sources"] = (
+                entry["assistant_sources"] + [message.get("sources") or []]
+            )[-self.window_size:]
+
+        await self.backend.set(key, entry)
+        self.appends += 1
+
+    async def invalidate(self, conversation_id: Any):
+        """
+        Drop a conversation (message deleted, conversation deleted)
+
+        Args:
+            conversation_id: Conversation UUID
+        """
+        await self.backend.delete(str(conversation_id))
+        self.invalidations += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            **self.backend.get_stats(),
+            "window_size": self.window_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "appends": self.appends,
+            "invalidations": self.invalidations
+        }
+
+
+# Singleton instance
+_conversation_cache_instance: Optional[ConversationWindowCache] = None
+
+
+def get_conversation_cache() -> Optional[ConversationWindowCache]:
+    """Get singleton conversation window cache (None when disabled)"""
+    global _conversation_cache_instance
+    if not settings.conversation_cache_enabled:
+        return None
+    if _conversation_cache_instance is None:
+        _conversation_cache_instance = ConversationWindowCache()
+    return _conversation_cache_instance
@@ -2,22 +2,29 @@
 Conversation Service - Business logic for managing conversations and messages
 """
 import uuid
+import base64
 from typing import List, Optional, Dict, Any
 from datetime import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy import select, update, desc, and_, or_, func
 
 from src.models.conversation import Conversation
 from src.models.message import Message
 from src.models.conversation_tag import ConversationTag
+from src.utils.token_counter import TokenCounter
+from src.services.context_manager import context_manager
+
+
+LAST_MESSAGE_PREVIEW_CHARS = 120  # Last message excerpt shown in conversation lists
 
 
 class ConversationService:
     """Service for managing conversations and messages"""
 
     @staticmethod
-    def create_conversation(
-        db: Session,
+    async def create_conversation(
+        db: AsyncSession,
         user_id: uuid.UUID,
         title: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None
@@ -41,13 +48,13 @@ class ConversationService:
             extra_data=metadata or {}
         )
         db.add(conversation)
-        db.commit()
-        db.refresh(conversation)
+        await db.commit()
+        await db.refresh(conversation)
         return conversation
 
     @staticmethod
-    def get_or_create_conversation(
-        db: Session,
+    async def get_or_create_conversation(
+        db: AsyncSession,
         user_id: uuid.UUID,
         conversation_id: Optional[uuid.UUID] = None,
         title: Optional[str] = None
@@ -65,24 +72,20 @@ class ConversationService:
             Conversation object
         """
         if conversation_id:
-            conversation = db.query(Conversation).filter(
-                and_(
-                    Conversation.id == conversation_id,
-                    Conversation.user_id == user_id
-                )
-            ).first()
+            conversation = await ConversationService.get_conversation(db, conversation_id, user_id)
 
             if conversation:
                 return conversation
 
         # Create new conversation
-        return ConversationService.create_conversation(db, user_id, title)
+        return await ConversationService.create_conversation(db, user_id, title)
 
     @staticmethod
-    def get_conversation(
-        db: Session,
+    async def get_conversation(
+        db: AsyncSession,
         conversation_id: uuid.UUID,
-        user_id: uuid.UUID
+        user_id: uuid.UUID,
+        with_tags: bool = False
     ) -> Optional[Conversation]:
         """
         Get a conversation by ID (with user validation)
@@ -91,48 +94,140 @@ class ConversationService:
             db: Database session
             conversation_id: UUID of the conversation
             user_id: UUID of the user (for authorization)
+            with_tags: Eager-load the tags (relationships are not lazy-loaded
+                with an async session)
 
         Returns:
             Conversation object or None
         """
-        return db.query(Conversation).filter(
+        query = select(Conversation).where(
             and_(
                 Conversation.id == conversation_id,
                 Conversation.user_id == user_id
             )
-        ).first()
+        )
+        if with_tags:
+            query = query.options(selectinload(Conversation.tags))
+
+        return await db.scalar(query)
 
     @staticmethod
-    def list_user_conversations(
-        db: Session,
+    async def list_user_conversations(
+        db: AsyncSession,
         user_id: uuid.UUID,
         include_archived: bool = False,
         limit: int = 50,
-        offset: int = 0
-    ) -> List[Conversation]:
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
-        List conversations for a user
+        List conversations for a user, most recently updated first
+
+        Message counts come from the maintained counter column and the last
+        messages from one windowed query over the page; no message
+        collection is loaded.
 
         Args:
             db: Database session
             user_id: UUID of the user
             include_archived: Include archived conversations
             limit: Maximum number of results
-            offset: Pagination offset
+            offset: Pagination offset (ignored when a cursor is given)
+            cursor: Keyset cursor returned as next_cursor by the previous page
 
         Returns:
-            List of Conversation objects
-        """
-        query = db.query(Conversation).filter(Conversation.user_id == user_id)
+            Dict with conversations, last_messages (conversation id ->
+            {"preview", "created_at"}), total and next_cursor
 
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        filters = [Conversation.user_id == user_id]
         if not include_archived:
-            query = query.filter(Conversation.is_archived == False)
+            filters.append(Conversation.is_archived == False)
+
+        total = await db.scalar(select(func.count(Conversation.id)).where(*filters))
+
+        query = select(Conversation).where(*filters)
+        if cursor:
+            # Keyset pagination on (updated_at, id), served by idx_conversation_user_updated
+            cursor_updated_at, cursor_id = ConversationService._decode_cursor(cursor)
+            query = query.where(
+                or_(
+                    Conversation.updated_at < cursor_updated_at,
+                    and_(
+                        Conversation.updated_at == cursor_updated_at,
+                        Conversation.id < cursor_id
+                    )
+                )
+            )
+        else:
+            query = query.offset(offset)
 
-        return query.order_by(desc(Conversation.updated_at)).limit(limit).offset(offset).all()
+        query = query.order_by(desc(Conversation.updated_at), desc(Conversation.id)).limit(limit)
+        conversations = list((await db.scalars(query)).all())
+
+        last_messages = await ConversationService._get_last_messages(db, [conv.id for conv in conversations])
+
+        next_cursor = None
+        if len(conversations) == limit:
+            next_cursor = ConversationService._encode_cursor(conversations[-1])
+
+        return {
+            "conversations": conversations,
+            "last_messages": last_messages,
+            "total": total,
+            "next_cursor": next_cursor
+        }
 
     @staticmethod
-    def update_conversation(
-        db: Session,
+    async def _get_last_messages(
+        db: AsyncSession,
+        conversation_ids: List[uuid.UUID]
+    ) -> Dict[uuid.UUID, Dict[str, Any]]:
+        """Preview and timestamp of the last non-deleted message of each conversation"""
+        if not conversation_ids:
+            return {}
+
+        ranked = select(
+            Message.conversation_id,
+            func.substr(Message.content, 1, LAST_MESSAGE_PREVIEW_CHARS).label("preview"),
+            Message.created_at,
+            func.row_number().over(
+                partition_by=Message.conversation_id,
+                order_by=desc(Message.created_at)
+            ).label("rank")
+        ).where(
+            and_(
+                Message.conversation_id.in_(conversation_ids),
+                Message.deleted_at.is_(None)
+            )
+        ).subquery()
+
+        rows = await db.execute(
+            select(ranked.c.conversation_id, ranked.c.preview, ranked.c.created_at).where(ranked.c.rank == 1)
+        )
+        return {
+            conversation_id: {"preview": preview, "created_at": created_at}
+            for conversation_id, preview, created_at in rows
+        }
+
+    @staticmethod
+    def _encode_cursor(conversation: Conversation) -> str:
+        raw = f"{conversation.updated_at.isoformat()}|{conversation.id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str):
+        try:
+            updated_at, conversation_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+            return datetime.fromisoformat(updated_at), uuid.UUID(conversation_id)
+        except Exception as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    @staticmethod
+    async def update_conversation(
+        db: AsyncSession,
         conversation_id: uuid.UUID,
         user_id: uuid.UUID,
         title: Optional[str] = None,
@@ -153,7 +248,7 @@ class ConversationService:
         Returns:
             Updated Conversation object or None
         """
-        conversation = ConversationService.get_conversation(db, conversation_id, user_id)
+        conversation = await ConversationService.get_conversation(db, conversation_id, user_id)
 
         if not conversation:
             return None
@@ -166,18 +261,16 @@ class ConversationService:
 
         if metadata is not None:
             # Merge metadata
-            current_metadata = conversation.extra_data or {}
-            current_metadata.update(metadata)
-            conversation.extra_data = current_metadata
+            conversation.extra_data = {**(conversation.extra_data or {}), **metadata}
 
         conversation.updated_at = datetime.utcnow()
-        db.commit()
-        db.refresh(conversation)
+        await db.commit()
+        await db.refresh(conversation)
         return conversation
 
     @staticmethod
-    def delete_conversation(
-        db: Session,
+    async def delete_conversation(
+        db: AsyncSession,
         conversation_id: uuid.UUID,
         user_id: uuid.UUID
     ) -> bool:
@@ -192,18 +285,19 @@ class ConversationService:
         Returns:
             True if deleted, False if not found
         """
-        conversation = ConversationService.get_conversation(db, conversation_id, user_id)
+        conversation = await ConversationService.get_conversation(db, conversation_id, user_id)
 
         if not conversation:
             return False
 
-        db.delete(conversation)
-        db.commit()
+        await db.delete(conversation)
+        await db.commit()
+        await context_manager.invalidate(conversation_id)
         return True
 
     @staticmethod
-    def save_message(
-        db: Session,
+    async def save_message(
+        db: AsyncSession,
         conversation_id: uuid.UUID,
         role: str,
         content: str,
@@ -213,6 +307,10 @@ class ConversationService:
         """
         Save a new message to a conversation
 
+        The message token count is computed once here and added to the
+        conversation's running total; the message is appended to the cached
+        recent window of the conversation.
+
         Args:
             db: Database session
             conversation_id: UUID of the conversation
@@ -224,28 +322,38 @@ class ConversationService:
         Returns:
             Created Message object
         """
+        token_count = TokenCounter.count_message_tokens(role, content, sources)
+
         message = Message(
             id=uuid.uuid4(),
             conversation_id=conversation_id,
             role=role,
             content=content,
             sources=sources or [],
-            extra_data=metadata or {}
+            extra_data=metadata or {},
+            token_count=token_count
         )
         db.add(message)
 
-        # Update conversation's updated_at timestamp
-        db.query(Conversation).filter(Conversation.id == conversation_id).update({
-            "updated_at": datetime.utcnow()
-        })
+        # Update conversation's updated_at timestamp, message counter and running token total
+        await db.execute(
+            update(Conversation).where(Conversation.id == conversation_id).values(
+                updated_at=datetime.utcnow(),
+                message_count=Conversation.message_count + 1,
+                total_tokens=Conversation.total_tokens + token_count
+            )
+        )
+
+        await db.commit()
+        await db.refresh(message)
 
-        db.commit()
-        db.refresh(message)
+        # Write-through to the recent window cache
+        await context_manager.record_message(message)
         return message
 
     @staticmethod
-    def get_conversation_messages(
-        db: Session,
+    async def get_conversation_messages(
+        db: AsyncSession,
         conversation_id: uuid.UUID,
         user_id: uuid.UUID,
         limit: Optional[int] = None,
@@ -265,28 +373,26 @@ class ConversationService:
             List of Message objects
         """
         # Verify user owns the conversation
-        conversation = ConversationService.get_conversation(db, conversation_id, user_id)
+        conversation = await ConversationService.get_conversation(db, conversation_id, user_id)
         if not conversation:
             return []
 
-        query = db.query(Message).filter(Message.conversation_id == conversation_id)
+        query = select(Message).where(Message.conversation_id == conversation_id)
 
         if not include_deleted:
-            query = query.filter(Message.deleted_at.is_(None))
-
-        query = query.order_by(Message.created_at)
+            query = query.where(Message.deleted_at.is_(None))
 
         if limit:
-            # Get the last N messages
-            total = query.count()
-            if total > limit:
-                query = query.offset(total - limit)
+            # Get the last N messages, then restore chronological order
+            result = await db.scalars(query.order_by(desc(Message.created_at)).limit(limit))
+            return list(reversed(result.all()))
 
-        return query.all()
+        result = await db.scalars(query.order_by(Message.created_at))
+        return list(result.all())
 
     @staticmethod
-    def soft_delete_message(
-        db: Session,
+    async def soft_delete_message(
+        db: AsyncSession,
         message_id: uuid.UUID,
         user_id: uuid.UUID
     ) -> bool:
@@ -302,23 +408,32 @@ class ConversationService:
             True if deleted, False if not found or unauthorized
         """
         # Get message with conversation join for user validation
-        message = db.query(Message).join(Conversation).filter(
-            and_(
-                Message.id == message_id,
-                Conversation.user_id == user_id
+        message = await db.scalar(
+            select(Message).join(Conversation).where(
+                and_(
+                    Message.id == message_id,
+                    Conversation.user_id == user_id
+                )
             )
-        ).first()
+        )
 
-        if not message:
+        if not message or message.deleted_at:
             return False
 
         message.deleted_at = datetime.utcnow()
-        db.commit()
+        await db.execute(
+            update(Conversation).where(Conversation.id == message.conversation_id).values(
+                message_count=Conversation.message_count - 1,
+                total_tokens=Conversation.total_tokens - (message.token_count or 0)
+            )
+        )
+        await db.commit()
+        await context_manager.invalidate(message.conversation_id)
         return True
 
     @staticmethod
-    def add_tags(
-        db: Session,
+    async def add_tags(
+        db: AsyncSession,
         conversation_id: uuid.UUID,
         user_id: uuid.UUID,
         tags: List[str]
@@ -336,21 +451,18 @@ class ConversationService:
             List of created ConversationTag objects
         """
         # Verify user owns the conversation
-        conversation = ConversationService.get_conversation(db, conversation_id, user_id)
+        conversation = await ConversationService.get_conversation(db, conversation_id, user_id)
         if not conversation:
             return []
 
+        # Existing tags in one query
+        existing = set((await db.scalars(
+            select(ConversationTag.tag).where(ConversationTag.conversation_id == conversation_id)
+        )).all())
+
         created_tags = []
         for tag in tags:
-            # Check if tag already exists
-            existing = db.query(ConversationTag).filter(
-                and_(
-                    ConversationTag.conversation_id == conversation_id,
-                    ConversationTag.tag == tag.lower()
-                )
-            ).first()
-
-            if not existing:
+            if tag.lower() not in existing:
                 conversation_tag = ConversationTag(
                     id=uuid.uuid4(),
                     conversation_id=conversation_id,
@@ -358,16 +470,14 @@ class ConversationService:
                 )
                 db.add(conversation_tag)
                 created_tags.append(conversation_tag)
+                existing.add(tag.lower())
 
-        db.commit()
-        for tag in created_tags:
-            db.refresh(tag)
-
+        await db.commit()
         return created_tags
 
     @staticmethod
-    def remove_tag(
-        db: Session,
+    async def remove_tag(
+        db: AsyncSession,
         conversation_id: uuid.UUID,
         user_id: uuid.UUID,
         tag: str
@@ -385,27 +495,29 @@ class ConversationService:
             True if removed, False if not found
         """
         # Verify user owns the conversation
-        conversation = ConversationService.get_conversation(db, conversation_id, user_id)
+        conversation = await ConversationService.get_conversation(db, conversation_id, user_id)
         if not conversation:
             return False
 
-        tag_obj = db.query(ConversationTag).filter(
-            and_(
-                ConversationTag.conversation_id == conversation_id,
-                ConversationTag.tag == tag.lower()
+        tag_obj = await db.scalar(
+            select(ConversationTag).where(
+                and_(
+                    ConversationTag.conversation_id == conversation_id,
+                    ConversationTag.tag == tag.lower()
+                )
             )
-        ).first()
+        )
 
         if not tag_obj:
             return False
 
-        db.delete(tag_obj)
-        db.commit()
+        await db.delete(tag_obj)
+        await db.commit()
         return True
 
     @staticmethod
-    def get_conversation_stats(
-        db: Session,
+    async def get_conversation_stats(
+        db: AsyncSession,
         user_id: uuid.UUID
     ) -> Dict[str, Any]:
         """
@@ -418,20 +530,22 @@ class ConversationService:
         Returns:
             Dictionary with statistics
         """
-        total_conversations = db.query(func.count(Conversation.id)).filter(
-            Conversation.user_id == user_id
-        ).scalar()
+        total_conversations = await db.scalar(
+            select(func.count(Conversation.id)).where(Conversation.user_id == user_id)
+        )
 
-        active_conversations = db.query(func.count(Conversation.id)).filter(
-            and_(
-                Conversation.user_id == user_id,
-                Conversation.is_archived == False
+        active_conversations = await db.scalar(
+            select(func.count(Conversation.id)).where(
+                and_(
+                    Conversation.user_id == user_id,
+                    Conversation.is_archived == False
+                )
             )
-        ).scalar()
+        )
 
-        total_messages = db.query(func.count(Message.id)).join(Conversation).filter(
-            Conversation.user_id == user_id
-        ).scalar()
+        total_messages = await db.scalar(
+            select(func.count(Message.id)).join(Conversation).where(Conversation.user_id == user_id)
+        )
 
         return {
             "total_conversations": total_conversations,
@@ -441,8 +555,8 @@ class ConversationService:
         }
 
     @staticmethod
-    def auto_generate_title(
-        db: Session,
+    async def auto_generate_title(
+        db: AsyncSession,
         conversation_id: uuid.UUID,
         user_id: uuid.UUID
     ) -> Optional[str]:
@@ -457,18 +571,20 @@ class ConversationService:
         Returns:
             Generated title or None
         """
-        conversation = ConversationService.get_conversation(db, conversation_id, user_id)
+        conversation = await ConversationService.get_conversation(db, conversation_id, user_id)
         if not conversation:
             return None
 
         # Get first user message
-        first_message = db.query(Message).filter(
-            and_(
-                Message.conversation_id == conversation_id,
-                Message.role == "user",
-                Message.deleted_at.is_(None)
-            )
-        ).order_by(Message.created_at).first()
+        first_message = await db.scalar(
+            select(Message).where(
+                and_(
+                    Message.conversation_id == conversation_id,
+                    Message.role == "user",
+                    Message.deleted_at.is_(None)
+                )
+            ).order_by(Message.created_at).limit(1)
+        )
 
         if not first_message:
             return None
@@ -479,14 +595,14 @@ class ConversationService:
             title += "..."
 
         conversation.title = title
-        db.commit()
-        db.refresh(conversation)
+        await db.commit()
+        await db.refresh(conversation)
 
         return title
 
     @staticmethod
-    def add_message_feedback(
-        db: Session,
+    async def add_message_feedback(
+        db: AsyncSession,
         message_id: uuid.UUID,
         user_id: uuid.UUID,
         rating: str,
@@ -506,13 +622,15 @@ class ConversationService:
             True if feedback added, False if not found or unauthorized
         """
         # Get message with conversation join for user validation
-        message = db.query(Message).join(Conversation).filter(
-            and_(
-                Message.id == message_id,
-                Conversation.user_id == user_id,
-                Message.role == "assistant"  # Only assistant messages can have feedback
+        message = await db.scalar(
+            select(Message).join(Conversation).where(
+                and_(
+                    Message.id == message_id,
+                    Conversation.user_id == user_id,
+                    Message.role == "assistant"  # Only assistant messages can have feedback
+                )
             )
-        ).first()
+        )
 
         if not message:
             return False
@@ -525,5 +643,5 @@ class ConversationService:
         }
 
         message.user_feedback = feedback
-        db.commit()
+        await db.commit()
         return True
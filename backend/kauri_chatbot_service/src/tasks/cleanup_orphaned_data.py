@@ -4,14 +4,13 @@ Runs daily to remove conversations for deleted users
 """
 import asyncio
 import structlog
-import httpx
 from sqlalchemy import select, func
 from typing import Set
 import uuid
 
-from src.config import settings
 from src.models.database import SessionLocal
 from src.models.conversation import Conversation
+from src.utils.http_clients import get_http_client
 
 logger = structlog.get_logger()
 
@@ -27,11 +26,11 @@ async def verify_user_exists(user_id: uuid.UUID) -> bool:
         True if user exists, False otherwise
     """
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"{settings.user_service_url}/api/v1/users/{user_id}"
-            )
-            return response.status_code == 200
+        response = await get_http_client("user_service").get(
+            f"/api/v1/users/{user_id}",
+            timeout=10.0
+        )
+        return response.status_code == 200
     except Exception as e:
         logger.warning("error_verifying_user", user_id=str(user_id), error=str(e))
         # En cas d'erreur, on garde le user par sécurité
@@ -0,0 +1,128 @@
+"""
+Pluggable key-value backends for result caches
+- memory: per-process LRU with TTL (default)
+- redis:  shared by every worker (TTL per key, eviction by Redis maxmemory policy)
+Values are JSON-serializable objects.
+"""
+from typing import Any, Dict, Optional
+from collections import OrderedDict
+import json
+import time
+import structlog
+
+from ..config import settings
+
+logger = structlog.get_logger()
+
+
+class InMemoryCacheBackend:
+    """LRU + TTL cache local to the worker process"""
+
+    def __init__(self, namespace: str, max_entries: int, ttl: int):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        self._entries[key] = (time.monotonic() + (ttl or self.ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    async def clear(self):
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl
+        }
+
+
+class RedisCacheBackend:
+    """Cache shared through Redis (keys prefixed with REDIS_PREFIX and namespace)"""
+
+    def __init__(self, namespace: str, ttl: int):
+        import redis.asyncio as aioredis
+
+        self.namespace = namespace
+        self.ttl = ttl
+        self.prefix = f"{settings.redis_prefix}:{namespace}:"
+        self.client = aioredis.Redis(
+            host=settings.redis_host,
+            port=settings.redis_port,
+            password=settings.redis_password or None,
+            decode_responses=True
+        )
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = await self.client.get(self.prefix + key)
+        except Exception as e:
+            logger.warning("redis_cache_get_failed", namespace=self.namespace, error=str(e))
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        try:
+            await self.client.set(self.prefix + key, json.dumps(value, ensure_ascii=False), ex=ttl or self.ttl)
+        except Exception as e:
+            logger.warning("redis_cache_set_failed", namespace=self.namespace, error=str(e))
+
+    async def delete(self, key: str):
+        try:
+            await self.client.delete(self.prefix + key)
+        except Exception as e:
+            logger.warning("redis_cache_delete_failed", namespace=self.namespace, error=str(e))
+
+    async def clear(self):
+        try:
+            async for key in self.client.scan_iter(match=self.prefix + "*"):
+                await self.client.delete(key)
+        except Exception as e:
+            logger.warning("redis_cache_clear_failed", namespace=self.namespace, error=str(e))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "redis",
+            "prefix": self.prefix,
+            "ttl": self.ttl
+        }
+
+
+def create_cache_backend(namespace: str, max_entries: int, ttl: int, backend: Optional[str] = None):
+    """
+    Create a cache backend
+
+    Args:
+        namespace: Key namespace (e.g. "retrieval")
+        max_entries: LRU size (memory backend)
+        ttl: Default time-to-live in seconds
+        backend: "memory" or "redis" (default: settings.cache_backend)
+
+    Returns:
+        Backend instance
+    """
+    backend = backend or settings.cache_backend
+    if backend == "redis":
+        return RedisCacheBackend(namespace=namespace, ttl=ttl)
+    return InMemoryCacheBackend(namespace=namespace, max_entries=max_entries, ttl=ttl)
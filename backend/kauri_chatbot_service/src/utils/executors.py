@@ -0,0 +1,56 @@
+"""
+Bounded thread pool for blocking retrieval work
+Embedding, ChromaDB HTTP calls, BM25 scoring and reranking run here so
+they never block the event loop (and other users' token streams).
+"""
+from typing import Any, Callable, Optional
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
+import structlog
+
+from ..config import settings
+
+logger = structlog.get_logger()
+
+
+_retrieval_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_retrieval_executor() -> ThreadPoolExecutor:
+    """Get global retrieval executor (created on first use)"""
+    global _retrieval_executor
+    if _retrieval_executor is None:
+        _retrieval_executor = ThreadPoolExecutor(
+            max_workers=settings.rag_executor_workers,
+            thread_name_prefix="retrieval"
+        )
+        logger.info("retrieval_executor_started", max_workers=settings.rag_executor_workers)
+    return _retrieval_executor
+
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking function on the retrieval executor
+
+    Args:
+        func: Blocking callable
+        *args, **kwargs: Arguments for func
+
+    Returns:
+        func's return value
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_retrieval_executor(),
+        functools.partial(func, *args, **kwargs)
+    )
+
+
+def shutdown_executors():
+    """Stop the executor (application shutdown)"""
+    global _retrieval_executor
+    if _retrieval_executor is not None:
+        _retrieval_executor.shutdown(wait=False, cancel_futures=True)
+        _retrieval_executor = None
+        logger.info("retrieval_executor_stopped")
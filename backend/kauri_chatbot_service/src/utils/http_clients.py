@@ -0,0 +1,127 @@
+"""
+Shared pooled HTTP clients for inter-service calls
+One httpx.AsyncClient per downstream service, opened at startup and closed
+at shutdown, so calls reuse keep-alive connections instead of paying TCP
+(and TLS) setup each time. Per-route timeouts are passed at call time.
+"""
+from typing import Any, Dict
+import time
+import httpx
+import structlog
+
+from ..config import settings
+
+logger = structlog.get_logger()
+
+
+class HTTPClientStats:
+    """Request counters and latency of one downstream service"""
+
+    def __init__(self):
+        self.requests = 0
+        self.responses = 0
+        self.server_errors = 0
+        self.total_latency_ms = 0.0
+
+    async def on_request(self, request: httpx.Request):
+        self.requests += 1
+        request.extensions["started_at"] = time.perf_counter()
+
+    async def on_response(self, response: httpx.Response):
+        self.responses += 1
+        if response.status_code >= 500:
+            self.server_errors += 1
+        started_at = response.request.extensions.get("started_at")
+        if started_at is not None:
+            self.total_latency_ms += (time.perf_counter() - started_at) * 1000
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "responses": self.responses,
+            # Requests that never got a response (connect errors, timeouts) or still in flight
+            "unanswered": self.requests - self.responses,
+            "server_errors": self.server_errors,
+            "avg_latency_ms": round(self.total_latency_ms / self.responses, 2) if self.responses else 0.0
+        }
+
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+_stats: Dict[str, HTTPClientStats] = {}
+
+
+def _service_base_urls() -> Dict[str, str]:
+    return {
+        "user_service": settings.user_service_url.rstrip("/"),
+        # Loopback calls to this service (warm-up)
+        "chatbot": f"http://127.0.0.1:{settings.service_port}"
+    }
+
+
+def _http2_available() -> bool:
+    if not settings.http_client_http2:
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        logger.warning("http2_unavailable_h2_not_installed")
+        return False
+
+
+def get_http_client(service: str) -> httpx.AsyncClient:
+    """
+    Get the shared client of a downstream service (created on first use)
+
+    Args:
+        service: "user_service" or "chatbot"
+
+    Returns:
+        AsyncClient with the service as base_url (call it with paths)
+    """
+    client = _clients.get(service)
+    if client is None or client.is_closed:
+        base_url = _service_base_urls()[service]
+        stats = _stats.setdefault(service, HTTPClientStats())
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=settings.user_service_timeout,
+            limits=httpx.Limits(
+                max_connections=settings.http_client_max_connections,
+                max_keepalive_connections=settings.http_client_max_keepalive,
+                keepalive_expiry=settings.http_client_keepalive_expiry
+            ),
+            http2=_http2_available(),
+            event_hooks={"request": [stats.on_request], "response": [stats.on_response]}
+        )
+        _clients[service] = client
+        logger.info("http_client_opened", service=service, base_url=base_url)
+    return client
+
+
+def open_http_clients():
+    """Open the client of every downstream service (application startup)"""
+    for service in _service_base_urls():
+        get_http_client(service)
+
+
+async def close_http_clients():
+    """Close every client and its pooled connections (application shutdown)"""
+    for service, client in list(_clients.items()):
+        await client.aclose()
+        logger.info("http_client_closed", service=service)
+    _clients.clear()
+
+
+def get_http_client_stats() -> Dict[str, Any]:
+    stats = {}
+    for service, service_stats in _stats.items():
+        stats[service] = service_stats.get_stats()
+        client = _clients.get(service)
+        # httpcore pool of the default transport
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        if pool is not None:
+            connections = pool.connections
+            stats[service]["open_connections"] = len(connections)
+            stats[service]["idle_connections"] = sum(1 for connection in connections if connection.is_idle())
+    return stats
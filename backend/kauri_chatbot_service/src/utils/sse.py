@@ -0,0 +1,175 @@
+"""
+Server-Sent Events helpers
+- coalesce_tokens: merges consecutive token chunks into one frame per time
+  window (or byte budget) so a streamed answer is a few dozen SSE events
+  instead of one per token
+- SSEStreamMetrics: per-stream events/bytes, aggregated in get_sse_stats()
+"""
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+import time
+import structlog
+
+from ..config import settings
+
+logger = structlog.get_logger()
+
+
+class SSEStats:
+    """Aggregated SSE metrics of this worker"""
+
+    def __init__(self):
+        self.streams = 0
+        self.events = 0
+        self.bytes = 0
+        self.tokens_in = 0
+        self.token_frames = 0
+        self.total_duration = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "streams": self.streams,
+            "events": self.events,
+            "bytes": self.bytes,
+            "avg_events_per_stream": round(self.events / self.streams, 2) if self.streams else 0.0,
+            "avg_events_per_sec": round(self.events / self.total_duration, 2) if self.total_duration else 0.0,
+            "avg_bytes_per_event": round(self.bytes / self.events, 2) if self.events else 0.0,
+            "tokens_per_frame": round(self.tokens_in / self.token_frames, 2) if self.token_frames else 0.0,
+            "window_ms": settings.sse_coalesce_window_ms if settings.sse_coalescing_enabled else 0,
+            "max_frame_bytes": settings.sse_coalesce_max_bytes
+        }
+
+
+class SSEStreamMetrics:
+    """Events and bytes sent on one SSE stream"""
+
+    def __init__(self, stats: Optional[SSEStats] = None):
+        self.stats = stats or get_sse_stats()
+        self.started_at = time.perf_counter()
+        self.events = 0
+        self.bytes = 0
+        self.tokens_in = 0
+        self.token_frames = 0
+
+    def frame(self, data: str) -> str:
+        """Count an outgoing SSE frame (returned unchanged)"""
+        self.events += 1
+        self.bytes += len(data.encode("utf-8"))
+        return data
+
+    def finish(self, **log_fields):
+        """Log this stream's metrics and add them to the worker totals"""
+        duration = time.perf_counter() - self.started_at
+
+        self.stats.streams += 1
+        self.stats.events += self.events
+        self.stats.bytes += self.bytes
+        self.stats.tokens_in += self.tokens_in
+        self.stats.token_frames += self.token_frames
+        self.stats.total_duration += duration
+
+        logger.info("sse_stream_complete",
+                   events=self.events,
+                   bytes=self.bytes,
+                   tokens_in=self.tokens_in,
+                   token_frames=self.token_frames,
+                   duration_ms=int(duration * 1000),
+                   events_per_sec=round(self.events / duration, 2) if duration else 0.0,
+                   **log_fields)
+
+
+async def coalesce_tokens(
+    chunks: AsyncIterator[Dict[str, Any]],
+    window_ms: Optional[float] = None,
+    max_bytes: Optional[int] = None,
+    metrics: Optional[SSEStreamMetrics] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Merge token chunks into time-windowed frames
+
+    Buffered tokens are flushed when the window since the first buffered
+    token elapses (even if the producer is stalled), when the buffer reaches
+    max_bytes, or before any other chunk type (order is preserved).
+
+    Args:
+        chunks: Stream chunks ({"type": "token", "content": ...}, ...)
+        window_ms: Coalescing window (default: SSE_COALESCE_WINDOW_MS)
+        max_bytes: Max buffered bytes per frame (default: SSE_COALESCE_MAX_BYTES)
+        metrics: Optional per-stream metrics (token counts)
+
+    Yields:
+        The same chunks, with consecutive tokens merged
+    """
+    window = (window_ms if window_ms is not None else settings.sse_coalesce_window_ms) / 1000
+    max_bytes = max_bytes or settings.sse_coalesce_max_bytes
+    loop = asyncio.get_running_loop()
+
+    buffer: List[str] = []
+    buffered_bytes = 0
+    first_at = 0.0
+
+    def flush() -> Dict[str, Any]:
+        nonlocal buffer, buffered_bytes
+        frame = {"type": "token", "content": "".join(buffer)}
+        buffer, buffered_bytes = [], 0
+        if metrics is not None:
+            metrics.token_frames += 1
+        return frame
+
+    iterator = chunks.__aiter__()
+    pending: Optional[asyncio.Future] = None
+    try:
+        while True:
+            if pending is None:
+                # Pull the next chunk as a task so a stalled producer doesn't hold the buffer
+                pending = asyncio.ensure_future(iterator.__anext__())
+
+            timeout = max(first_at + window - loop.time(), 0) if buffer else None
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if not done:
+                yield flush()
+                continue
+
+            task, pending = pending, None
+            try:
+                chunk = task.result()
+            except StopAsyncIteration:
+                break
+
+            if chunk.get("type") == "token":
+                content = chunk.get("content") or ""
+                if not buffer:
+                    first_at = loop.time()
+                buffer.append(content)
+                buffered_bytes += len(content.encode("utf-8"))
+                if metrics is not None:
+                    metrics.tokens_in += 1
+                if buffered_bytes >= max_bytes or loop.time() - first_at >= window:
+                    yield flush()
+                continue
+
+            if buffer:
+                yield flush()
+            yield chunk
+
+        if buffer:
+            yield flush()
+
+    finally:
+        if pending is not None:
+            pending.cancel()
+            await asyncio.wait({pending})  # Let the producer unwind before closing it
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+# Global stats
+_sse_stats = None
+
+def get_sse_stats() -> SSEStats:
+    """Get global SSE metrics"""
+    global _sse_stats
+    if _sse_stats is None:
+        _sse_stats = SSEStats()
+    return _sse_stats
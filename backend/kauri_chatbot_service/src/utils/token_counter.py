@@ -1,9 +1,15 @@
 """
 Token counting utility for context management
-Uses simple estimation based on character count (more reliable than tiktoken for multilingual)
+Uses simple estimation based on character count (more reliable than tiktoken for multilingual),
+or the tokenizer of the configured LLM (LLM_TOKENIZER) for counts stored with each message
 """
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import structlog
+
+from ..config import settings
+
+logger = structlog.get_logger()
 
 
 class TokenCounter:
@@ -17,6 +23,10 @@ class TokenCounter:
     """
 
     CHARS_PER_TOKEN = 3
+    MESSAGE_OVERHEAD_TOKENS = 10  # Role/formatting overhead per message
+
+    _tokenizer = None
+    _tokenizer_loaded = False
 
     @classmethod
     def estimate_tokens(cls, text: str) -> int:
@@ -52,6 +62,11 @@ class TokenCounter:
         total_tokens = 0
 
         for msg in messages:
+            # Count computed when the message was saved
+            if msg.get('token_count') is not None:
+                total_tokens += msg['token_count']
+                continue
+
             # Count role tokens
             role = msg.get('role', '')
             total_tokens += cls.estimate_tokens(role)
@@ -68,10 +83,84 @@ class TokenCounter:
                     total_tokens += cls.estimate_tokens(title)
 
             # Add overhead for message formatting (~10 tokens per message)
-            total_tokens += 10
+            total_tokens += cls.MESSAGE_OVERHEAD_TOKENS
 
         return total_tokens
 
+    @classmethod
+    def load_tokenizer(cls):
+        """
+        Load the LLM tokenizer (blocking: may download it from the Hub)
+
+        Called once at application startup, off the event loop. Until it has
+        run, counts fall back to the estimate.
+        """
+        if cls._tokenizer_loaded:
+            return
+        cls._tokenizer_loaded = True
+        if settings.llm_tokenizer:
+            try:
+                from tokenizers import Tokenizer
+                cls._tokenizer = Tokenizer.from_pretrained(settings.llm_tokenizer)
+                logger.info("llm_tokenizer_loaded", tokenizer=settings.llm_tokenizer)
+            except Exception as e:
+                logger.warning("llm_tokenizer_load_failed",
+                             tokenizer=settings.llm_tokenizer,
+                             error=str(e))
+
+    @classmethod
+    def _get_tokenizer(cls):
+        """Preloaded LLM tokenizer (None: use the estimate)"""
+        return cls._tokenizer
+
+    @classmethod
+    def count_tokens(cls, text: str) -> int:
+        """
+        Count tokens with the LLM tokenizer, falling back to the estimate
+
+        Args:
+            text: Text to count
+
+        Returns:
+            Token count
+        """
+        if not text:
+            return 0
+
+        tokenizer = cls._get_tokenizer()
+        if tokenizer is None:
+            return cls.estimate_tokens(text)
+        return len(tokenizer.encode(text, add_special_tokens=False).ids)
+
+    @classmethod
+    def count_message_tokens(
+        cls,
+        role: str,
+        content: str,
+        sources: Optional[List[Dict[str, Any]]] = None
+    ) -> int:
+        """
+        Tokens of one stored message (computed once, at save time)
+
+        Same accounting as estimate_tokens_from_messages: role, content,
+        source titles and the per-message overhead.
+
+        Args:
+            role: 'user' or 'assistant'
+            content: Message content
+            sources: Optional list of source documents
+
+        Returns:
+            Token count
+        """
+        total_tokens = cls.count_tokens(role) + cls.count_tokens(content)
+
+        for source in sources or []:
+            if isinstance(source, dict):
+                total_tokens += cls.count_tokens(source.get('title', ''))
+
+        return total_tokens + cls.MESSAGE_OVERHEAD_TOKENS
+
     @classmethod
     def estimate_tokens_with_sources(cls, text: str, sources: List[Dict[str, Any]]) -> int:
         """
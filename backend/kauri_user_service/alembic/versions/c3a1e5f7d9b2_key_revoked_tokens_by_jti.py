@@ -0,0 +1,78 @@
+"""key_revoked_tokens_by_jti
+
+Revision ID: c3a1e5f7d9b2
+Revises: 64df4342ae35
+Create Date: 2026-10-18 09:12:41.208317
+
+"""
+from typing import Sequence, Union
+import base64
+import hashlib
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a1e5f7d9b2'
+down_revision: Union[str, None] = '64df4342ae35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _token_key(token: str) -> str:
+    """jti from the (already verified) token payload, SHA-256 of the token otherwise."""
+    try:
+        payload = token.split('.')[1]
+        jti = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4))).get('jti')
+        if jti:
+            return jti
+    except (IndexError, ValueError):
+        pass
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def upgrade() -> None:
+    """Upgrade schema - Key revoked_tokens by jti instead of the full token."""
+    bind = op.get_bind()
+    columns = {column['name'] for column in sa.inspect(bind).get_columns('revoked_tokens')}
+    if 'jti' in columns:
+        # Table already created with the new schema by init_db()
+        return
+
+    # Rebuild the table: expired rows are dropped, live ones re-keyed by jti
+    rows = bind.execute(sa.text(
+        "SELECT token, revoked_at, expires_at FROM revoked_tokens WHERE expires_at > (now() AT TIME ZONE 'utc')"
+    )).fetchall()
+
+    op.drop_table('revoked_tokens')
+    revoked_tokens = op.create_table(
+        'revoked_tokens',
+        sa.Column('jti', sa.String(length=64), primary_key=True),
+        sa.Column('revoked_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False)
+    )
+    op.create_index('ix_revoked_tokens_revoked_at', 'revoked_tokens', ['revoked_at'])
+    op.create_index('ix_revoked_tokens_expires_at', 'revoked_tokens', ['expires_at'])
+
+    entries = {}
+    for token, revoked_at, expires_at in rows:
+        entries[_token_key(token)] = {'revoked_at': revoked_at, 'expires_at': expires_at}
+    if entries:
+        op.bulk_insert(revoked_tokens, [{'jti': jti, **entry} for jti, entry in entries.items()])
+
+
+def downgrade() -> None:
+    """Downgrade schema - Restore the token-keyed revoked_tokens table (revocations are lost)."""
+    op.drop_index('ix_revoked_tokens_expires_at', table_name='revoked_tokens')
+    op.drop_index('ix_revoked_tokens_revoked_at', table_name='revoked_tokens')
+    op.drop_table('revoked_tokens')
+    op.create_table(
+        'revoked_tokens',
+        sa.Column('token_id', sa.String(length=36), primary_key=True),
+        sa.Column('token', sa.Text(), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False)
+    )
+    op.create_index('ix_revoked_tokens_token', 'revoked_tokens', ['token'], unique=True)
@@ -0,0 +1,83 @@
+"""add_usage_month_period_key
+
+Revision ID: d8f4b2a6c1e3
+Revises: c3a1e5f7d9b2
+Create Date: 2026-10-18 10:03:27.551942
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8f4b2a6c1e3'
+down_revision: Union[str, None] = 'c3a1e5f7d9b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - Monthly counters in their own rows keyed by (user_id, usage_month)."""
+    inspector = sa.inspect(op.get_bind())
+
+    # May already have been created (empty) by init_db()
+    if not inspector.has_table('user_usage_months'):
+        op.create_table(
+            'user_usage_months',
+            sa.Column('user_id', sa.String(length=36), nullable=False),
+            sa.Column('usage_month', sa.Date(), nullable=False),
+
+            # Monthly counters
+            sa.Column('messages_this_month', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('tokens_this_month', sa.BigInteger(), nullable=False, server_default='0'),
+
+            # Timestamps
+            sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+            sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+
+            sa.PrimaryKeyConstraint('user_id', 'usage_month')
+        )
+        op.create_foreign_key(
+            'fk_user_usage_months_user_id',
+            'user_usage_months',
+            'users',
+            ['user_id'],
+            ['user_id'],
+            ondelete='CASCADE'
+        )
+
+    columns = {column['name'] for column in inspector.get_columns('user_usage')}
+    if 'messages_this_month' not in columns:
+        # user_usage already created with the new schema by init_db()
+        return
+
+    # Each daily row restarted its month counters at 0, so they hold that
+    # day's totals: their sums per month are the monthly counters
+    op.execute("""
+        INSERT INTO user_usage_months
+            (user_id, usage_month, messages_this_month, tokens_this_month, created_at, updated_at)
+        SELECT user_id,
+               date_trunc('month', usage_date)::date,
+               SUM(messages_this_month),
+               SUM(tokens_this_month),
+               MIN(created_at),
+               MAX(updated_at)
+        FROM user_usage
+        GROUP BY user_id, date_trunc('month', usage_date)
+        ON CONFLICT (user_id, usage_month) DO NOTHING
+    """)
+
+    op.drop_column('user_usage', 'tokens_this_month')
+    op.drop_column('user_usage', 'messages_this_month')
+
+
+def downgrade() -> None:
+    """Downgrade schema - Monthly counters back on the daily rows (per-day token counts are lost)."""
+    op.add_column('user_usage', sa.Column('messages_this_month', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('user_usage', sa.Column('tokens_this_month', sa.BigInteger(), nullable=False, server_default='0'))
+    op.execute("UPDATE user_usage SET messages_this_month = messages_today")
+
+    op.drop_constraint('fk_user_usage_months_user_id', 'user_usage_months', type_='foreignkey')
+    op.drop_table('user_usage_months')
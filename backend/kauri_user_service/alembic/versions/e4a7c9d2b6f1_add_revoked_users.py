@@ -0,0 +1,43 @@
+"""add_revoked_users
+
+Revision ID: e4a7c9d2b6f1
+Revises: d8f4b2a6c1e3
+Create Date: 2026-10-18 14:21:08.413095
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7c9d2b6f1'
+down_revision: Union[str, None] = 'd8f4b2a6c1e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - Per-user 'not before' revocations (deactivated/deleted users)."""
+    if sa.inspect(op.get_bind()).has_table('revoked_users'):
+        # Table already created by init_db()
+        return
+
+    op.create_table(
+        'revoked_users',
+        sa.Column('user_id', sa.String(length=36), primary_key=True),
+        sa.Column('reason', sa.String(length=20), nullable=False),
+        sa.Column('not_before', sa.DateTime(), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False)
+    )
+    op.create_index('ix_revoked_users_revoked_at', 'revoked_users', ['revoked_at'])
+    op.create_index('ix_revoked_users_expires_at', 'revoked_users', ['expires_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema - Drop per-user revocations."""
+    op.drop_index('ix_revoked_users_expires_at', table_name='revoked_users')
+    op.drop_index('ix_revoked_users_revoked_at', table_name='revoked_users')
+    op.drop_table('revoked_users')
@@ -6,6 +6,7 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from starlette.middleware.sessions import SessionMiddleware
+import asyncio
 import structlog
 import time
 
@@ -143,6 +144,10 @@ async def startup_event():
     except Exception as e:
         logger.error("database_initialization_failed", error=str(e), exc_info=True)
 
+    # Purge périodique des tokens révoqués expirés
+    from ..services.revocation_service import revocation_service
+    app.state.revocation_purge_task = asyncio.create_task(revocation_service.run_purge_loop())
+
 
 # ====================
 # Shutdown Event
@@ -157,6 +162,14 @@ async def shutdown_event():
         service=settings.service_name,
     )
 
+    purge_task = getattr(app.state, "revocation_purge_task", None)
+    if purge_task is not None:
+        purge_task.cancel()
+        try:
+            await purge_task
+        except asyncio.CancelledError:
+            pass
+
 
 # ====================
 # Exception Handlers
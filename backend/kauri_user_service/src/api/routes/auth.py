@@ -2,20 +2,24 @@
 Routes d'authentification
 /api/v1/auth/*
 """
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional
+import secrets
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Query
 from sqlalchemy.orm import Session
 import structlog
 
-from ...models.user import User, RevokedToken
+from ...models.user import User, RevokedToken, RevokedUser
 from ...schemas.user import (
     UserRegister,
     UserLogin,
     TokenResponse,
     UserResponse,
     UserLoginResponse,
+    RevokedTokenEntry,
+    RevokedUserEntry,
+    RevocationFeedResponse,
     Message
 )
 from ...auth.password import hash_password, verify_password
@@ -24,6 +28,8 @@ from ...utils.database import get_db
 from ...services.verification_service import verification_service
 from ...services.email_service import email_service
 from ...services.subscription_service import SubscriptionService
+from ...services.revocation_service import revocation_service
+from ...config import settings
 
 logger = structlog.get_logger()
 
@@ -60,9 +66,8 @@ def get_current_user(
 
     token = authorization.split(" ")[1]
 
-    # Vérifier si token révoqué
-    revoked = db.query(RevokedToken).filter(RevokedToken.token == token).first()
-    if revoked:
+    # Vérifier si token révoqué (cache mémoire, puis clé primaire jti)
+    if revocation_service.is_revoked(db, token):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token révoqué",
@@ -100,6 +105,27 @@ def get_current_user(
     return user
 
 
+def require_service_token(
+    x_service_token: Optional[str] = Header(None)
+) -> None:
+    """
+    Dépendance pour les endpoints inter-services (header X-Service-Token)
+
+    Raises:
+        HTTPException: Si le token de service est absent, invalide ou non configuré
+    """
+    if not settings.internal_service_token:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Token de service non configuré",
+        )
+    if not x_service_token or not secrets.compare_digest(x_service_token, settings.internal_service_token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token de service invalide",
+        )
+
+
 # ============================================
 # Endpoints
 # ============================================
@@ -286,20 +312,58 @@ async def logout(
         )
 
     # Ajouter token à la liste des révoqués
-    revoked_token = RevokedToken(
-        token_id=str(uuid.uuid4()),
-        token=token,
-        expires_at=expires_at
-    )
+    token_id = revocation_service.revoke(db, token, expires_at)
 
-    db.add(revoked_token)
-    db.commit()
-
-    logger.info("user_logout_success", token_id=revoked_token.token_id)
+    logger.info("user_logout_success", token_id=token_id)
 
     return Message(message="Déconnexion réussie")
 
 
+@router.get("/revocations", response_model=RevocationFeedResponse)
+async def get_revocations(
+    since: Optional[datetime] = Query(None, description="Curseur `version` de la réponse précédente"),
+    db: Session = Depends(get_db),
+    _: None = Depends(require_service_token)
+):
+    """
+    Flux incrémental des tokens révoqués (non expirés) et des utilisateurs
+    désactivés ou supprimés
+
+    Permet aux autres services de valider les JWT localement : ils
+    conservent l'ensemble des jti révoqués et ne demandent que les
+    révocations postérieures à leur dernier curseur.
+    Réservé aux services internes (header X-Service-Token).
+    """
+    now = datetime.utcnow()
+    token_query = db.query(RevokedToken).filter(RevokedToken.expires_at > now)
+    user_query = db.query(RevokedUser).filter(RevokedUser.expires_at > now)
+    if since:
+        # revoked_at est fixé avant le commit : une révocation validée après une
+        # autre déjà servie peut avoir un horodatage antérieur au curseur. La
+        # fenêtre précédant le curseur est donc relue (dédoublonnage côté client)
+        window_start = since - timedelta(seconds=settings.revocation_feed_overlap)
+        token_query = token_query.filter(RevokedToken.revoked_at >= window_start)
+        user_query = user_query.filter(RevokedUser.revoked_at >= window_start)
+
+    version = since
+    revoked = []
+    for revoked_token in token_query.all():
+        version = max(version, revoked_token.revoked_at) if version else revoked_token.revoked_at
+        revoked.append(RevokedTokenEntry(jti=revoked_token.jti, expires_at=revoked_token.expires_at))
+
+    users = []
+    for revoked_user in user_query.all():
+        version = max(version, revoked_user.revoked_at) if version else revoked_user.revoked_at
+        users.append(RevokedUserEntry(
+            user_id=revoked_user.user_id,
+            reason=revoked_user.reason,
+            not_before=revoked_user.not_before,
+            expires_at=revoked_user.expires_at
+        ))
+
+    return RevocationFeedResponse(version=version, revoked=revoked, users=users)
+
+
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
     current_user: User = Depends(get_current_user)
@@ -9,8 +9,10 @@ import structlog
 from ...models.user import User
 from ...schemas.subscription import (
     UserQuotaInfo,
+    UserUsageSchema,
     SubscriptionTierSchema,
     QuotaExceededResponse,
+    UsageConsumeRequest,
     SubscriptionUpgradeRequest,
     SubscriptionUpgradeResponse
 )
@@ -43,6 +45,43 @@ async def get_my_quota(
         )
 
 
+@router.post("/usage/consume", response_model=UserQuotaInfo)
+async def consume_quota(
+    request: UsageConsumeRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Check the quota and consume it atomically (one database transaction)
+    Returns the quota status after consumption, 429 if the quota is exceeded
+    """
+    try:
+        allowed, quota_info = SubscriptionService.check_and_consume(
+            db,
+            current_user,
+            messages=request.messages,
+            tokens=request.tokens
+        )
+    except Exception as e:
+        logger.error("consume_quota_failed", user_id=current_user.user_id, error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to consume quota"
+        )
+
+    if not allowed:
+        logger.info("quota_exceeded", user_id=current_user.user_id, tier=current_user.subscription_tier)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=QuotaExceededResponse(
+                message="Quota de messages atteint",
+                quota_info=SubscriptionService.get_user_quota_info(db, current_user.user_id)
+            ).model_dump(mode="json")
+        )
+
+    return quota_info
+
+
 @router.get("/tiers", response_model=list[SubscriptionTierSchema])
 async def get_subscription_tiers(
     db: Session = Depends(get_db)
@@ -173,8 +212,11 @@ async def get_usage_stats(
         if quota_info.messages_per_month_limit:
             monthly_usage_pct = (quota_info.messages_this_month / quota_info.messages_per_month_limit) * 100
 
+        history = SubscriptionService.get_usage_history(db, current_user.user_id)
+
         return {
             "quota_info": quota_info,
+            "history": [UserUsageSchema.model_validate(usage) for usage in history],
             "usage_percentages": {
                 "daily": round(daily_usage_pct, 2) if daily_usage_pct else None,
                 "monthly": round(monthly_usage_pct, 2) if monthly_usage_pct else None
@@ -126,6 +126,27 @@ class JWTManager:
         except InvalidTokenError:
             return None
 
+    def get_token_id(self, token: str) -> Optional[str]:
+        """
+        Récupère l'identifiant (jti) d'un token, même expiré
+
+        Args:
+            token: Token JWT
+
+        Returns:
+            jti du token ou None si signature invalide
+        """
+        try:
+            payload = jwt.decode(
+                token,
+                self.secret_key,
+                algorithms=[self.algorithm],
+                options={"verify_exp": False}
+            )
+            return payload.get("jti")
+        except jwt.InvalidTokenError:
+            return None
+
     def get_token_expiry(self, token: str) -> Optional[datetime]:
         """
         Récupère la date d'expiration d'un token
@@ -34,6 +34,9 @@ class Settings(BaseSettings):
     jwt_secret_key: str = Field(alias="JWT_SECRET_KEY")
     jwt_algorithm: str = Field(default="HS256", alias="JWT_ALGORITHM")
     jwt_expire_hours: int = Field(default=1, alias="JWT_EXPIRE_HOURS")  # Changé de 24h à 1h pour sécurité
+    revocation_feed_overlap: int = Field(default=60, alias="REVOCATION_FEED_OVERLAP")  # Secondes relues avant le curseur du flux (commits tardifs)
+    internal_service_token: str = Field(default="", alias="INTERNAL_SERVICE_TOKEN")  # Authentifie les appels inter-services (flux de révocation)
+    revoked_token_purge_interval: int = Field(default=3600, alias="REVOKED_TOKEN_PURGE_INTERVAL")  # Secondes entre deux purges des tokens révoqués expirés
 
     # CORS
     cors_origins: str = Field(default="*", alias="CORS_ORIGINS")
@@ -51,6 +54,9 @@ class Settings(BaseSettings):
     # Password Policy
     password_min_length: int = Field(default=8, alias="PASSWORD_MIN_LENGTH")
 
+    # Subscriptions
+    tier_cache_ttl: int = Field(default=300, alias="TIER_CACHE_TTL")  # Secondes de cache des configurations de plans
+
     # Logging
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
 
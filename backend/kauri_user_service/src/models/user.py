@@ -2,7 +2,7 @@
 Modèles SQLAlchemy pour le User Service
 """
 from datetime import datetime, date
-from sqlalchemy import Column, String, Boolean, DateTime, Text, Integer, BigInteger, Date, JSON
+from sqlalchemy import Column, String, Boolean, DateTime, Text, Integer, BigInteger, Date, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -64,13 +64,30 @@ class RevokedToken(Base):
     """
     __tablename__ = "revoked_tokens"
 
-    token_id = Column(String(36), primary_key=True)
-    token = Column(Text, unique=True, nullable=False, index=True)
-    revoked_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    expires_at = Column(DateTime, nullable=False)
+    # jti du token (SHA-256 hex du token s'il n'en a pas) - clé compacte et unique
+    jti = Column(String(64), primary_key=True)
+    revoked_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)  # Curseur du flux de révocation
+    expires_at = Column(DateTime, nullable=False, index=True)  # Purge des tokens expirés
 
     def __repr__(self):
-        return f"<RevokedToken(token_id={self.token_id})>"
+        return f"<RevokedToken(jti={self.jti})>"
+
+
+class RevokedUser(Base):
+    """
+    Modèle pour les utilisateurs désactivés ou supprimés : tous leurs tokens
+    émis avant not_before sont refusés (publié dans le flux de révocation)
+    """
+    __tablename__ = "revoked_users"
+
+    user_id = Column(String(36), primary_key=True)
+    reason = Column(String(20), nullable=False)  # 'deactivated', 'deleted'
+    not_before = Column(DateTime, nullable=False)  # Tokens émis avant cette date refusés
+    revoked_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)  # Curseur du flux de révocation
+    expires_at = Column(DateTime, nullable=False, index=True)  # not_before + durée de vie d'un token (purge)
+
+    def __repr__(self):
+        return f"<RevokedUser(user_id={self.user_id}, reason={self.reason})>"
 
 
 class SubscriptionTier(Base):
@@ -116,17 +133,41 @@ class SubscriptionTier(Base):
 
 class UserUsage(Base):
     """
-    Modèle pour le suivi de l'utilisation des quotas par utilisateur
+    Modèle pour le suivi de l'utilisation quotidienne par utilisateur
+    (une ligne par jour d'activité)
     """
     __tablename__ = "user_usage"
+    __table_args__ = (
+        # Cible de l'upsert atomique des compteurs (ON CONFLICT)
+        Index("ix_user_usage_user_date", "user_id", "usage_date", unique=True),
+    )
 
     id = Column(String(36), primary_key=True)
     user_id = Column(String(36), nullable=False, index=True)
-    usage_date = Column(Date, nullable=False, index=True)
+    usage_date = Column(Date, nullable=False, index=True)  # Clé de période des compteurs journaliers
 
     # Daily counters
     messages_today = Column(Integer, nullable=False, default=0)
 
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<UserUsage(user_id={self.user_id}, usage_date={self.usage_date})>"
+
+
+class UserUsageMonth(Base):
+    """
+    Modèle pour le suivi de l'utilisation mensuelle par utilisateur
+    (une ligne par mois d'activité, incrémentée par son propre upsert)
+    """
+    __tablename__ = "user_usage_months"
+
+    # Clé primaire (user_id, usage_month) : cible de l'upsert (ON CONFLICT)
+    user_id = Column(String(36), primary_key=True)
+    usage_month = Column(Date, primary_key=True)  # Clé de période des compteurs mensuels (1er du mois)
+
     # Monthly counters
     messages_this_month = Column(Integer, nullable=False, default=0)
     tokens_this_month = Column(BigInteger, nullable=False, default=0)
@@ -136,7 +177,7 @@ class UserUsage(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     def __repr__(self):
-        return f"<UserUsage(user_id={self.user_id}, usage_date={self.usage_date})>"
+        return f"<UserUsageMonth(user_id={self.user_id}, usage_month={self.usage_month})>"
 
 
 class UsageLog(Base):
@@ -90,8 +90,6 @@ class UserUsageSchema(BaseModel):
     usage_date: date
 
     messages_today: int
-    messages_this_month: int
-    tokens_this_month: int
 
     created_at: datetime
     updated_at: datetime
@@ -132,6 +130,12 @@ class QuotaExceededResponse(BaseModel):
     reset_time: Optional[datetime] = None  # When quota will reset
 
 
+class UsageConsumeRequest(BaseModel):
+    """Request to check and consume quota in one step"""
+    messages: int = Field(default=1, ge=0, description="Messages to consume")
+    tokens: int = Field(default=0, ge=0, description="Tokens to consume")
+
+
 class SubscriptionUpgradeRequest(BaseModel):
     """Request to upgrade subscription"""
     target_tier: str = Field(..., description="Target subscription tier (pro, max, enterprise)")
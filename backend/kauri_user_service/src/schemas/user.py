@@ -2,7 +2,7 @@
 Schémas Pydantic pour validation des données User
 """
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, EmailStr, Field, validator
 
 
@@ -51,6 +51,27 @@ class TokenData(BaseModel):
     email: str
 
 
+class RevokedTokenEntry(BaseModel):
+    """Schéma pour un token révoqué dans le flux de révocation"""
+    jti: str
+    expires_at: datetime
+
+
+class RevokedUserEntry(BaseModel):
+    """Schéma pour un utilisateur désactivé ou supprimé dans le flux de révocation"""
+    user_id: str
+    reason: str  # 'deactivated', 'deleted'
+    not_before: datetime  # Tokens émis avant cette date refusés
+    expires_at: datetime
+
+
+class RevocationFeedResponse(BaseModel):
+    """Schéma pour le flux incrémental des tokens révoqués"""
+    version: Optional[datetime] = None  # Curseur à renvoyer en paramètre `since`
+    revoked: List[RevokedTokenEntry]
+    users: List[RevokedUserEntry] = []
+
+
 # ============================================
 # Schémas pour User
 # ============================================
@@ -0,0 +1,174 @@
+"""
+Service de révocation des tokens JWT
+Les tokens révoqués sont identifiés par leur jti (clé primaire indexée), les
+identifiants révoqués sont mis en cache en mémoire jusqu'à l'expiration du
+token, et les lignes expirées sont purgées périodiquement.
+"""
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+import structlog
+from sqlalchemy import event, inspect
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from ..models.user import User, RevokedToken, RevokedUser
+from ..auth.jwt_manager import jwt_manager
+from ..utils.database import SessionLocal
+from ..config import get_settings
+
+logger = structlog.get_logger(__name__)
+settings = get_settings()
+
+
+class RevocationService:
+    """Service pour révoquer les tokens et vérifier leur révocation"""
+
+    def __init__(self):
+        # jti révoqué -> expiration du token (une révocation est définitive,
+        # le cache n'a besoin d'être invalidé qu'à l'expiration)
+        self._revoked: Dict[str, datetime] = {}
+
+    @staticmethod
+    def token_key(token: str) -> str:
+        """
+        Identifiant compact d'un token
+
+        Args:
+            token: Token JWT
+
+        Returns:
+            jti du token, ou SHA-256 hex du token s'il n'a pas de jti
+        """
+        return jwt_manager.get_token_id(token) or hashlib.sha256(token.encode()).hexdigest()
+
+    def revoke(self, db: Session, token: str, expires_at: datetime) -> str:
+        """
+        Révoque un token (idempotent)
+
+        Args:
+            db: Session de base de données
+            token: Token JWT à révoquer
+            expires_at: Expiration du token
+
+        Returns:
+            Identifiant du token révoqué
+        """
+        key = self.token_key(token)
+        # Un seul INSERT : deux déconnexions concurrentes ne se heurtent pas à la clé primaire
+        db.execute(
+            pg_insert(RevokedToken).values(
+                jti=key,
+                revoked_at=datetime.utcnow(),
+                expires_at=expires_at
+            ).on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+        )
+        db.commit()
+        self._revoked[key] = expires_at
+        return key
+
+    def is_revoked(self, db: Session, token: str) -> bool:
+        """
+        Vérifie si un token est révoqué (cache mémoire puis clé primaire)
+
+        Args:
+            db: Session de base de données
+            token: Token JWT
+
+        Returns:
+            True si révoqué
+        """
+        key = self.token_key(token)
+        if key in self._revoked:
+            return True
+
+        revoked_token = db.get(RevokedToken, key)
+        if revoked_token is None:
+            return False
+
+        self._revoked[key] = revoked_token.expires_at
+        return True
+
+    def purge_expired(self, db: Session) -> int:
+        """
+        Supprime les tokens révoqués expirés (base et cache)
+
+        Args:
+            db: Session de base de données
+
+        Returns:
+            Nombre de lignes supprimées
+        """
+        now = datetime.utcnow()
+        deleted = db.query(RevokedToken).filter(RevokedToken.expires_at <= now).delete(synchronize_session=False)
+        deleted += db.query(RevokedUser).filter(RevokedUser.expires_at <= now).delete(synchronize_session=False)
+        db.commit()
+
+        # Snapshot: requests add entries concurrently from the threadpool
+        for key, expires_at in list(self._revoked.items()):
+            if expires_at <= now:
+                self._revoked.pop(key, None)
+
+        return deleted
+
+    async def run_purge_loop(self, interval: Optional[int] = None):
+        """
+        Purge périodique des tokens révoqués expirés (tâche de fond)
+
+        Args:
+            interval: Secondes entre deux purges (défaut: settings.revoked_token_purge_interval)
+        """
+        interval = interval or settings.revoked_token_purge_interval
+        while True:
+            db = SessionLocal()
+            try:
+                deleted = await asyncio.to_thread(self.purge_expired, db)
+                logger.info("revoked_tokens_purged", deleted=deleted)
+            except Exception as e:
+                db.rollback()
+                logger.error("revoked_tokens_purge_failed", error=str(e))
+            finally:
+                db.close()
+            await asyncio.sleep(interval)
+
+
+def revoke_user(connection, user_id: str, reason: str) -> None:
+    """
+    Refuse tous les tokens d'un utilisateur émis jusqu'à maintenant
+
+    Args:
+        connection: Connexion de la transaction en cours (appelé pendant le flush)
+        user_id: ID de l'utilisateur
+        reason: 'deactivated' ou 'deleted'
+    """
+    now = datetime.utcnow()
+    values = {
+        "reason": reason,
+        "not_before": now,
+        "revoked_at": now,
+        "expires_at": now + timedelta(hours=settings.jwt_expire_hours)
+    }
+    connection.execute(
+        pg_insert(RevokedUser).values(user_id=user_id, **values).on_conflict_do_update(
+            index_elements=[RevokedUser.user_id],
+            set_=values
+        )
+    )
+    logger.info("user_tokens_revoked", user_id=user_id, reason=reason)
+
+
+@event.listens_for(User, "after_update")
+def _on_user_update(mapper, connection, target) -> None:
+    # Désactivation : les tokens déjà émis ne doivent plus être acceptés ailleurs
+    if not target.is_active and inspect(target).attrs.is_active.history.has_changes():
+        revoke_user(connection, target.user_id, "deactivated")
+
+
+@event.listens_for(User, "after_delete")
+def _on_user_delete(mapper, connection, target) -> None:
+    revoke_user(connection, target.user_id, "deleted")
+
+
+# Singleton instance
+revocation_service = RevocationService()
@@ -1,14 +1,17 @@
 """
 Service pour la gestion des abonnements et quotas
 """
+import time
 import uuid
 from datetime import datetime, date, timedelta
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, event
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
-from src.models.user import User, SubscriptionTier, UserUsage, UsageLog
-from src.schemas.subscription import UserQuotaInfo
+from src.config import settings
+from src.models.user import User, SubscriptionTier, UserUsage, UserUsageMonth, UsageLog
+from src.schemas.subscription import UserQuotaInfo, SubscriptionTierSchema
 
 
 # Default tiers to seed when the reference table is empty/out-of-sync
@@ -96,6 +99,27 @@ DEFAULT_TIERS = [
 ]
 
 
+# In-process tier configs: tier_id -> (expires_at, snapshot)
+_tier_cache: Dict[str, Tuple[float, SubscriptionTierSchema]] = {}
+
+
+def invalidate_tier_cache() -> None:
+    """Drop cached tier configs (called on any tier insert/update/delete)"""
+    _tier_cache.clear()
+
+
+@event.listens_for(SubscriptionTier, "after_insert")
+@event.listens_for(SubscriptionTier, "after_update")
+@event.listens_for(SubscriptionTier, "after_delete")
+def _on_tier_change(mapper, connection, target) -> None:
+    invalidate_tier_cache()
+
+
+def _month_start(day: date) -> date:
+    """Period key of the monthly counters"""
+    return day.replace(day=1)
+
+
 class SubscriptionService:
     """Service for subscription and quota management"""
 
@@ -131,71 +155,84 @@ class SubscriptionService:
         return user
 
     @staticmethod
-    def get_tier_config(db: Session, tier_id: str) -> Optional[SubscriptionTier]:
-        """Get subscription tier configuration"""
-        tier = db.query(SubscriptionTier).filter(
-            SubscriptionTier.tier_id == tier_id
-        ).first()
-        if tier:
-            return tier
-
-        # Auto-reseed default tiers if the reference row is missing
-        SubscriptionService.ensure_default_tiers(db)
-        return db.query(SubscriptionTier).filter(
-            SubscriptionTier.tier_id == tier_id
-        ).first()
-
-    @staticmethod
-    def get_or_create_user_usage(db: Session, user_id: str, usage_date: date = None) -> UserUsage:
+    def get_tier_config(db: Session, tier_id: str) -> Optional[SubscriptionTierSchema]:
         """
-        Get or create UserUsage record for today
-        This ensures we always have a usage record to track against
+        Get subscription tier configuration
+        Served from the in-process cache; changes made through this process
+        invalidate it, changes made elsewhere are picked up after TIER_CACHE_TTL
         """
-        if usage_date is None:
-            usage_date = date.today()
+        cached = _tier_cache.get(tier_id)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
 
-        # Try to get existing record
-        usage = db.query(UserUsage).filter(
-            and_(
-                UserUsage.user_id == user_id,
-                UserUsage.usage_date == usage_date
-            )
+        tier = db.query(SubscriptionTier).filter(
+            SubscriptionTier.tier_id == tier_id
         ).first()
-
-        # Create if doesn't exist
-        if not usage:
-            usage = UserUsage(
-                id=str(uuid.uuid4()),
-                user_id=user_id,
-                usage_date=usage_date,
-                messages_today=0,
-                messages_this_month=0,
-                tokens_this_month=0
-            )
-            db.add(usage)
-            db.commit()
-            db.refresh(usage)
-
-        return usage
+        if not tier:
+            # Auto-reseed default tiers if the reference row is missing
+            SubscriptionService.ensure_default_tiers(db)
+            tier = db.query(SubscriptionTier).filter(
+                SubscriptionTier.tier_id == tier_id
+            ).first()
+            if not tier:
+                return None
+
+        snapshot = SubscriptionTierSchema.model_validate(tier)
+        _tier_cache[tier_id] = (time.monotonic() + settings.tier_cache_ttl, snapshot)
+        return snapshot
 
     @staticmethod
     def get_user_quota_info(db: Session, user_id: str) -> UserQuotaInfo:
         """
         Get complete quota information for a user
         This is the main method called by the dashboard and quota checks
+        One read (user + today's and this month's usage rows); no usage
+        row is created
         """
-        # Get user
-        user = db.query(User).filter(User.user_id == user_id).first()
-        if not user:
+        today = date.today()
+
+        # Get user and current usage (missing rows: nothing used yet this period)
+        row = db.query(User, UserUsage, UserUsageMonth).outerjoin(
+            UserUsage,
+            and_(
+                UserUsage.user_id == User.user_id,
+                UserUsage.usage_date == today
+            )
+        ).outerjoin(
+            UserUsageMonth,
+            and_(
+                UserUsageMonth.user_id == User.user_id,
+                UserUsageMonth.usage_month == _month_start(today)
+            )
+        ).filter(User.user_id == user_id).first()
+        if not row:
             raise ValueError(f"User {user_id} not found")
+        user, usage, month_usage = row
 
         # Get tier configuration
         tier = SubscriptionService.get_tier_config(db, user.subscription_tier)
         if not tier:
             raise ValueError(f"Tier {user.subscription_tier} not found")
 
-        # Get current usage
-        usage = SubscriptionService.get_or_create_user_usage(db, user_id)
+        return SubscriptionService._build_quota_info(user, tier, usage, month_usage)
+
+    @staticmethod
+    def _build_quota_info(
+        user: User,
+        tier: SubscriptionTierSchema,
+        usage: Optional[UserUsage],
+        month_usage: Optional[UserUsageMonth]
+    ) -> UserQuotaInfo:
+        """
+        Compute remaining quotas and status flags
+        usage / month_usage are today's and this month's rows (None = nothing
+        used in that period yet)
+        """
+        user_id = user.user_id
+        today = date.today()
+        messages_today = usage.messages_today if usage else 0
+        messages_this_month = month_usage.messages_this_month if month_usage else 0
+        tokens_this_month = month_usage.tokens_this_month if month_usage else 0
 
         # Calculate remaining quotas
         messages_remaining_today = None
@@ -203,25 +240,25 @@ class SubscriptionService:
         tokens_remaining_month = None
 
         if tier.messages_per_day is not None:
-            messages_remaining_today = max(0, tier.messages_per_day - usage.messages_today)
+            messages_remaining_today = max(0, tier.messages_per_day - messages_today)
 
         if tier.messages_per_month is not None:
-            messages_remaining_month = max(0, tier.messages_per_month - usage.messages_this_month)
+            messages_remaining_month = max(0, tier.messages_per_month - messages_this_month)
 
         if tier.tokens_per_month is not None:
-            tokens_remaining_month = max(0, tier.tokens_per_month - usage.tokens_this_month)
+            tokens_remaining_month = max(0, tier.tokens_per_month - tokens_this_month)
 
         # Check if can send message
         can_send_message = True
         is_quota_exceeded = False
 
         # Check daily limit
-        if tier.messages_per_day is not None and usage.messages_today >= tier.messages_per_day:
+        if tier.messages_per_day is not None and messages_today >= tier.messages_per_day:
             can_send_message = False
             is_quota_exceeded = True
 
         # Check monthly limit
-        if tier.messages_per_month is not None and usage.messages_this_month >= tier.messages_per_month:
+        if tier.messages_per_month is not None and messages_this_month >= tier.messages_per_month:
             can_send_message = False
             is_quota_exceeded = True
 
@@ -231,12 +268,12 @@ class SubscriptionService:
         # Check if at warning threshold (80% or more)
         warning_threshold_reached = False
         if tier.messages_per_day is not None:
-            daily_usage_percent = (usage.messages_today / tier.messages_per_day) * 100
+            daily_usage_percent = (messages_today / tier.messages_per_day) * 100
             if daily_usage_percent >= 80:
                 warning_threshold_reached = True
 
         if tier.messages_per_month is not None:
-            monthly_usage_percent = (usage.messages_this_month / tier.messages_per_month) * 100
+            monthly_usage_percent = (messages_this_month / tier.messages_per_month) * 100
             if monthly_usage_percent >= 80:
                 warning_threshold_reached = True
 
@@ -249,9 +286,9 @@ class SubscriptionService:
             messages_per_day_limit=tier.messages_per_day,
             messages_per_month_limit=tier.messages_per_month,
             tokens_per_month_limit=tier.tokens_per_month,
-            messages_today=usage.messages_today,
-            messages_this_month=usage.messages_this_month,
-            tokens_this_month=usage.tokens_this_month,
+            messages_today=messages_today,
+            messages_this_month=messages_this_month,
+            tokens_this_month=tokens_this_month,
             messages_remaining_today=messages_remaining_today,
             messages_remaining_month=messages_remaining_month,
             tokens_remaining_month=tokens_remaining_month,
@@ -259,52 +296,141 @@ class SubscriptionService:
             is_quota_exceeded=is_quota_exceeded,
             needs_upgrade=needs_upgrade,
             warning_threshold_reached=warning_threshold_reached,
-            usage_date=usage.usage_date,
+            usage_date=today,
             subscription_start_date=user.subscription_start_date,
             subscription_end_date=user.subscription_end_date
         )
 
+    @staticmethod
+    def _daily_usage_upsert(
+        user_id: str,
+        messages: int,
+        tier: Optional[SubscriptionTierSchema] = None
+    ):
+        """
+        INSERT ... ON CONFLICT (user_id, usage_date) DO UPDATE ... RETURNING
+        Increments today's counters atomically; the first write of a day
+        inserts a new row (daily rollover). With a tier, nothing is written
+        (no row returned) once the daily message limit would be exceeded.
+        """
+        now = datetime.utcnow()
+        stmt = pg_insert(UserUsage).values(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            usage_date=date.today(),
+            messages_today=messages,
+            created_at=now,
+            updated_at=now
+        )
+
+        limit = None
+        if tier is not None and tier.messages_per_day is not None:
+            limit = UserUsage.messages_today + messages <= tier.messages_per_day
+
+        return stmt.on_conflict_do_update(
+            index_elements=[UserUsage.user_id, UserUsage.usage_date],
+            set_={
+                "messages_today": UserUsage.messages_today + messages,
+                "updated_at": stmt.excluded.updated_at
+            },
+            where=limit
+        ).returning(UserUsage).execution_options(populate_existing=True)
+
+    @staticmethod
+    def _monthly_usage_upsert(
+        user_id: str,
+        messages: int,
+        tokens: int,
+        tier: Optional[SubscriptionTierSchema] = None
+    ):
+        """
+        INSERT ... ON CONFLICT (user_id, usage_month) DO UPDATE ... RETURNING
+        Increments this month's counters atomically; the first write of a
+        month inserts a new row (monthly rollover). With a tier, nothing is
+        written (no row returned) once the monthly message limit would be
+        exceeded.
+        """
+        now = datetime.utcnow()
+        stmt = pg_insert(UserUsageMonth).values(
+            user_id=user_id,
+            usage_month=_month_start(date.today()),
+            messages_this_month=messages,
+            tokens_this_month=tokens,
+            created_at=now,
+            updated_at=now
+        )
+
+        limit = None
+        if tier is not None and tier.messages_per_month is not None:
+            limit = UserUsageMonth.messages_this_month + messages <= tier.messages_per_month
+
+        return stmt.on_conflict_do_update(
+            index_elements=[UserUsageMonth.user_id, UserUsageMonth.usage_month],
+            set_={
+                "messages_this_month": UserUsageMonth.messages_this_month + messages,
+                "tokens_this_month": UserUsageMonth.tokens_this_month + tokens,
+                "updated_at": stmt.excluded.updated_at
+            },
+            where=limit
+        ).returning(UserUsageMonth).execution_options(populate_existing=True)
+
     @staticmethod
     def increment_usage(
         db: Session,
         user_id: str,
         messages: int = 1,
         tokens: int = 0
-    ) -> UserUsage:
+    ) -> Tuple[UserUsage, UserUsageMonth]:
         """
         Increment user usage counters
         Called after successful message processing
-        Uses row-level locking for ACID compliance
+        One atomic upsert per period row, no row lock held across requests
         """
-        # Get or create usage record with row lock
-        usage = db.query(UserUsage).filter(
-            and_(
-                UserUsage.user_id == user_id,
-                UserUsage.usage_date == date.today()
-            )
-        ).with_for_update().first()
-
-        if not usage:
-            usage = UserUsage(
-                id=str(uuid.uuid4()),
-                user_id=user_id,
-                usage_date=date.today(),
-                messages_today=0,
-                messages_this_month=0,
-                tokens_this_month=0
-            )
-            db.add(usage)
+        usage = db.scalars(SubscriptionService._daily_usage_upsert(user_id, messages)).one()
+        month_usage = db.scalars(SubscriptionService._monthly_usage_upsert(user_id, messages, tokens)).one()
+        db.commit()
+        return usage, month_usage
+
+    @staticmethod
+    def check_and_consume(
+        db: Session,
+        user: User,
+        messages: int = 1,
+        tokens: int = 0
+    ) -> Tuple[bool, Optional[UserQuotaInfo]]:
+        """
+        Check the quota and consume it in one transaction
+        The limit checks and the increments are the same conditional upserts
+        (daily row, then monthly row, always in that order), so concurrent
+        requests cannot overshoot the quota; a refusal rolls both back
+        Returns (allowed, quota info after consumption - None when refused)
+        """
+        tier = SubscriptionService.get_tier_config(db, user.subscription_tier)
+        if not tier:
+            raise ValueError(f"Tier {user.subscription_tier} not found")
 
-        # Increment counters
-        usage.messages_today += messages
-        usage.messages_this_month += messages
-        usage.tokens_this_month += tokens
-        usage.updated_at = datetime.utcnow()
+        # The first row of a period is inserted without the limit check:
+        # refuse up front what could not fit in an empty quota
+        if tier.messages_per_day is not None and messages > tier.messages_per_day:
+            return False, None
+        if tier.messages_per_month is not None and messages > tier.messages_per_month:
+            return False, None
 
-        db.commit()
-        db.refresh(usage)
+        usage = db.scalars(SubscriptionService._daily_usage_upsert(user.user_id, messages, tier)).first()
+        if usage is None:
+            db.rollback()
+            return False, None
 
-        return usage
+        month_usage = db.scalars(
+            SubscriptionService._monthly_usage_upsert(user.user_id, messages, tokens, tier)
+        ).first()
+        if month_usage is None:
+            # Undo today's increment
+            db.rollback()
+            return False, None
+
+        db.commit()
+        return True, SubscriptionService._build_quota_info(user, tier, usage, month_usage)
 
     @staticmethod
     def log_usage_event(
@@ -342,40 +468,19 @@ class SubscriptionService:
         return log
 
     @staticmethod
-    def reset_daily_quotas(db: Session) -> int:
-        """
-        Reset daily quotas for all users
-        Called by cron job at midnight UTC
-        Returns number of users reset
-        """
-        count = db.query(UserUsage).filter(
-            UserUsage.usage_date < date.today()
-        ).update({
-            "messages_today": 0
-        })
-        db.commit()
-        return count
-
-    @staticmethod
-    def reset_monthly_quotas(db: Session, target_month: date = None) -> int:
+    def get_usage_history(db: Session, user_id: str, days: int = 30) -> list[UserUsage]:
         """
-        Reset monthly quotas for all users
-        Called by cron job on the 1st of each month
-        Returns number of users reset
+        Get the per-day usage rows of the last days (most recent first)
+        Daily and monthly quotas roll over with the period keys of their
+        rows, past rows are kept as history
         """
-        if target_month is None:
-            # Get first day of current month
-            today = date.today()
-            target_month = date(today.year, today.month, 1)
-
-        count = db.query(UserUsage).filter(
-            UserUsage.usage_date < target_month
-        ).update({
-            "messages_this_month": 0,
-            "tokens_this_month": 0
-        })
-        db.commit()
-        return count
+        since = date.today() - timedelta(days=days - 1)
+        return db.query(UserUsage).filter(
+            and_(
+                UserUsage.user_id == user_id,
+                UserUsage.usage_date >= since
+            )
+        ).order_by(UserUsage.usage_date.desc()).all()
 
     @staticmethod
     def upgrade_subscription(